@@ -0,0 +1,190 @@
+##
+# BatchRender: command line tool which draws many text files without a display.
+# Every input is parsed and drawn in a pool of worker processes and written out as
+# an image, together with a summary of the whole run.
+#
+# Usage: python BatchRender.py [-o OUTPUT_DIR] [-j JOBS] [-f svg|eps] INPUT [INPUT ...]
+#	where each INPUT is a .txt file (or .txt.gz, .txt.bz2, .txt.xz), a directory or a glob pattern
+#	such as '../TestFiles/*.txt'
+#
+# Adam Carlson
+# 10/18/2026
+#
+##
+
+# library dependencies
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+# our custom classes
+import Parser as parser
+import Drawer as drawer
+import Exporter as exporter
+import Instrumentation as instrumentation
+import Simplify as simplify
+
+'''
+Finds all text files named by the command line inputs.
+
+@param inputs (list), file names, directories or glob patterns
+@return iterator of the text file names, in sorted order per input
+'''
+def findTextFiles(inputs):
+	for pattern in inputs:
+		if os.path.isdir(pattern):
+			for dirpath, dirnames, filenames in os.walk(pattern):
+				dirnames.sort()
+				for name in sorted(filenames):
+					if parser.isTextFile(name):
+						yield os.path.join(dirpath, name)
+		else:
+			for name in sorted(glob.glob(pattern)):
+				if parser.isTextFile(name) and os.path.isfile(name):
+					yield name
+
+'''
+Pairs every input file with the image it will be written to. Inputs with the same
+	base name get a numbered suffix so no image is overwritten.
+
+@param filenames (iterator), text files to render
+@param outputDir (string), directory where the images are written
+@param extension (string), image file extension, '.svg' or '.eps'
+@return iterator of (input file, output file) tuples
+'''
+def planJobs(filenames, outputDir, extension = '.svg'):
+	used = set()
+	for filename in filenames:
+		base = os.path.basename(filename)
+		# story.txt and story.txt.gz are both drawn to story.svg
+		base = base[:base.rindex('.txt')]
+		name = base
+		suffix = 2
+		while name in used:
+			name = '%s-%d' % (base, suffix)
+			suffix += 1
+		used.add(name)
+		yield (filename, os.path.join(outputDir, name + extension))
+
+'''
+Parses and draws one text file and writes the image. Runs in a worker process.
+
+@param job (tuple), (input file, output file, canvas width, canvas height, simplification tolerance)
+@return result (dict), statistics about the file, with an error message if it failed
+'''
+def renderFile(job):
+	inputFile, outputFile, width, height, tolerance = job
+	start = time.time()
+	result = {'input': inputFile, 'output': outputFile, 'characters': 0, 'sampled': 0}
+	try:
+		with instrumentation.stage('parse'):
+			if inputFile.endswith('.txt'):
+				fileParser = parser.MappedParser(inputFile)
+			else:
+				# compressed files are decompressed as they are read
+				fileParser = parser.StreamingParser(inputFile)
+		with instrumentation.stage('sample'):
+			characters = fileParser.get_characters_list()
+		result['segments'], result['written'] = exporter.exportDrawing(characters, outputFile, width, height, 
+			width - drawer.REDUCED_WIDTH, height - drawer.REDUCED_HEIGHT, tolerance)
+		result['characters'] = fileParser.file_length
+		result['sampled'] = len(characters)
+	except Exception as error:
+		result['output'] = None
+		result['error'] = '%s: %s' % (type(error).__name__, error)
+	result['seconds'] = time.time() - start
+	if instrumentation.enabled:
+		# hand this file's measurements to the main process
+		result['instrumentation'] = instrumentation.report()
+		instrumentation.reset()
+	return result
+
+'''
+Renders all jobs in a process pool.
+
+@param jobs (list), (input file, output file) tuples
+@param width (int), canvas width in pixels
+@param height (int), canvas height in pixels
+@param processes (int), number of worker processes, defaults to one per core
+@param instrument (bool), whether the workers measure their stages, see Instrumentation.py
+@param tolerance (float), largest distance in pixels lines may be simplified by, or None
+@return results (list), the result of renderFile for every job, in completion order
+'''
+def renderAll(jobs, width, height, processes = None, instrument = False, tolerance = None):
+	processes = processes or multiprocessing.cpu_count()
+	tasks = [(inputFile, outputFile, width, height, tolerance) for inputFile, outputFile in jobs]
+	# hand out work in batches so tens of thousands of small files don't cost one message each
+	chunksize = max(1, min(64, len(tasks) // (processes * 8)))
+	pool = multiprocessing.Pool(processes, instrumentation.enable if instrument else None)
+	try:
+		results = list(pool.imap_unordered(renderFile, tasks, chunksize))
+	finally:
+		pool.close()
+		pool.join()
+	return results
+
+'''
+Command line entry point.
+
+@param argv (list), command line arguments, defaults to sys.argv[1:]
+@return exit status (int), 1 if any file failed, else 0
+'''
+def main(argv = None):
+	argParser = argparse.ArgumentParser(description = 'Draw text files without a display.')
+	argParser.add_argument('inputs', nargs = '+', help = '.txt (.txt.gz, .txt.bz2, .txt.xz) files, directories or glob patterns')
+	argParser.add_argument('-o', '--output', default = 'drawings', help = 'directory for the images and summary.json')
+	argParser.add_argument('-j', '--jobs', type = int, default = None, help = 'number of worker processes (default: all cores)')
+	argParser.add_argument('-f', '--format', choices = ['svg', 'eps'], default = 'svg', help = 'image format')
+	argParser.add_argument('--width', type = int, default = drawer.CANVAS_WIDTH, help = 'image width in pixels')
+	argParser.add_argument('--height', type = int, default = drawer.CANVAS_HEIGHT, help = 'image height in pixels')
+	argParser.add_argument('--tolerance', type = float, default = None, metavar = 'PIXELS',
+		help = 'simplify lines by at most this many pixels, such as %g (default: write every line)' % simplify.DEFAULT_TOLERANCE)
+	argParser.add_argument('--instrument', metavar = 'FILE', default = None,
+		help = 'time every stage and count pen calls over all files, written to FILE as JSON')
+	args = argParser.parse_args(argv)
+
+	if not os.path.isdir(args.output):
+		os.makedirs(args.output)
+	jobs = list(planJobs(findTextFiles(args.inputs), args.output, '.' + args.format))
+	if not jobs:
+		print ("No text files found")
+		return 1
+
+	start = time.time()
+	results = renderAll(jobs, args.width, args.height, args.jobs, args.instrument is not None, args.tolerance)
+	elapsed = max(time.time() - start, 1e-9)
+	if args.instrument:
+		for result in results:
+			instrumentation.merge(result.pop('instrumentation'))
+		instrumentation.dump(args.instrument)
+
+	failed = [result for result in results if 'error' in result]
+	characters = sum(result['characters'] for result in results)
+	summary = {
+		'files': len(results),
+		'failed': len(failed),
+		'characters': characters,
+		'segments': sum(result.get('segments', 0) for result in results),
+		'written': sum(result.get('written', 0) for result in results),
+		'seconds': elapsed,
+		'filesPerSecond': len(results) / elapsed,
+		'charactersPerSecond': characters / elapsed,
+		'results': sorted(results, key = lambda result: result['input']),
+	}
+	with open(os.path.join(args.output, 'summary.json'), 'w') as file:
+		json.dump(summary, file, indent = 1)
+
+	for result in failed:
+		print ("Failed: %s (%s)" % (result['input'], result['error']))
+	print ("Rendered %d files (%d failed) in %.2f s: %.1f files/s, %.0f chars/s"
+		% (len(results), len(failed), elapsed, summary['filesPerSecond'], summary['charactersPerSecond']))
+	if args.tolerance is not None:
+		print ("Simplified %d lines to %d" % (summary['segments'], summary['written']))
+	return 1 if failed else 0
+
+if __name__ == '__main__':
+	sys.exit(main())
@@ -0,0 +1,266 @@
+##
+# Benchmark: repeatable speed and memory measurements of parsing, sampling, drawing
+# and storing, over the TestFiles and generated inputs of any size. Results are
+# written as JSON so runs of different versions can be compared.
+#
+# Usage: python Benchmark.py [-o benchmark.json] [--synthetic 10M 100M 1G] [--compare OLD.json]
+#
+# Every stage is timed on its own; the best of --repeat runs counts. Peak memory is
+# measured in one more run with tracemalloc on, since tracing slows everything down.
+# Calls are the units of work of a stage: characters read by a parser, characters
+# sampled, lines and circles drawn by the pen, and drawings saved or loaded.
+#
+# Adam Carlson
+# 10/18/2026
+#
+##
+
+# library dependencies
+import argparse
+import glob
+import json
+import os
+import platform
+import random
+import shutil
+import string
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# our custom classes
+import DataStorage as storage
+import Drawer as drawer
+import Parser as parser
+import PenTurtle as penturtle
+
+""" CONSTANTS """
+
+TEST_FILES = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'TestFiles')
+
+# the original Parser keeps every character in a list, too much memory for larger inputs
+PARSER_LIMIT = 100 << 20
+
+# number of drawings saved and loaded back by the store stage
+STORE_DRAWINGS = 20
+
+# a stage is a regression when it takes this much longer than in the compared run
+REGRESSION_FACTOR = 1.25
+
+SIZE_UNITS = {'K': 1 << 10, 'M': 1 << 20, 'G': 1 << 30}
+
+
+class CallCounter:
+	""" Pen sink which only counts what is drawn. """
+
+	def __init__(self):
+		self.calls = 0
+
+	def lineTo(self, start, end, color):
+		self.calls += 1
+
+	def circle(self, center, radius, points, color):
+		self.calls += 1
+
+
+'''
+Converts a size such as '10M' or '1G' to a number of bytes.
+
+@param size (string), a number with an optional K, M or G suffix
+@return bytes (int)
+'''
+def parseSize(size):
+	unit = size[-1:].upper()
+	if unit in SIZE_UNITS:
+		return int(float(size[:-1]) * SIZE_UNITS[unit])
+	return int(size)
+
+'''
+Writes a text file of random words, the same for every run.
+
+@param filename (string), file to write
+@param size (int), number of bytes written
+@return None
+'''
+def makeSyntheticFile(filename, size):
+	generator = random.Random(size)
+	letters = string.ascii_letters + string.digits + string.punctuation
+	words = [''.join(generator.choice(letters) for i in range(generator.randint(1, 12))) for j in range(5000)]
+	block = ' '.join(generator.choice(words) for i in range(200000)).encode('ascii')
+	with open(filename, 'wb') as file:
+		written = 0
+		while written < size:
+			piece = block[:size - written]
+			file.write(piece)
+			written += len(piece)
+
+'''
+Runs a stage and measures it.
+
+@param stage (function), runs the stage once and returns its number of calls
+@param repeat (int), number of timed runs
+@param memory (bool), whether to measure peak memory in one more run
+@return result (dict), best time, peak memory, calls and calls per second
+'''
+def measure(stage, repeat, memory):
+	seconds = None
+	for run in range(repeat):
+		start = time.perf_counter()
+		calls = stage()
+		elapsed = time.perf_counter() - start
+		seconds = elapsed if seconds is None else min(seconds, elapsed)
+	result = {'seconds': seconds, 'calls': calls, 'callsPerSecond': calls / max(seconds, 1e-9)}
+	if memory:
+		tracemalloc.start()
+		try:
+			stage()
+			result['peakBytes'] = tracemalloc.get_traced_memory()[1]
+		finally:
+			tracemalloc.stop()
+	return result
+
+'''
+Benchmarks every stage on one input file.
+
+@param filename (string), text file
+@param workDir (string), directory for the storage files
+@param repeat (int), number of timed runs per stage
+@param memory (bool), whether to measure peak memory
+@return results (list), one dict per stage
+'''
+def benchmarkFile(filename, workDir, repeat, memory):
+	size = os.path.getsize(filename)
+	results = []
+
+	def record(name, stage):
+		result = {'input': os.path.basename(filename), 'bytes': size, 'stage': name}
+		result.update(measure(stage, repeat, memory))
+		results.append(result)
+		print ("%-28s %-13s %9.4f s %12.0f calls/s" % (result['input'], name, result['seconds'], result['callsPerSecond']))
+
+	if size <= PARSER_LIMIT:
+		record('parse', lambda: parser.Parser(filename).file_length)
+	record('parse-mapped', lambda: parser.MappedParser(filename).file_length)
+
+	# the parsed file is let go once sampled, the later stages only need the sample
+	fileParser = parser.MappedParser(filename)
+	record('sample', lambda: len(fileParser.get_characters_list()))
+	characters = fileParser.get_characters_list()
+	fileParser = None
+
+	def draw():
+		counter = CallCounter()
+		drawer.Drawer(characters, penturtle.PenTurtle(counter), drawer.CANVAS_WIDTH - drawer.REDUCED_WIDTH,
+			drawer.CANVAS_HEIGHT - drawer.REDUCED_HEIGHT).draw()
+		return counter.calls
+	record('draw', draw)
+
+	storageName = os.path.join(workDir, 'drawings.txt')
+	def save():
+		clearStorage(workDir)
+		history = storage.DataStorage(storageName)
+		for number in range(STORE_DRAWINGS):
+			history.saveData(characters, os.path.basename(filename))
+		return STORE_DRAWINGS
+	record('save', save)
+	record('load', lambda: len(storage.DataStorage(storageName).getData()))
+	return results
+
+'''
+Deletes the storage files in a directory.
+
+@param directory (string), directory of the storage files
+@return None
+'''
+def clearStorage(directory):
+	for name in ('drawings.txt', 'drawings.idx', 'drawings.dat', 'drawings' + storage.COMPACTED_SUFFIX):
+		path = os.path.join(directory, name)
+		if os.path.exists(path):
+			os.remove(path)
+
+'''
+@return version (string), the git commit being measured, or None outside a git checkout
+'''
+def codeVersion():
+	try:
+		output = subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'],
+			cwd = os.path.dirname(os.path.abspath(__file__)), stderr = subprocess.STDOUT)
+		return output.decode().strip()
+	except (OSError, subprocess.CalledProcessError):
+		return None
+
+'''
+Compares results with an earlier run.
+
+@param results (list), stage results of this run
+@param baseline (dict), the JSON of an earlier run
+@return regressions (list), (input, stage, old seconds, new seconds) of the stages that got slower
+'''
+def findRegressions(results, baseline):
+	old = dict(((result['input'], result['stage']), result['seconds']) for result in baseline['results'])
+	regressions = []
+	for result in results:
+		key = (result['input'], result['stage'])
+		if key in old and result['seconds'] > old[key] * REGRESSION_FACTOR:
+			regressions.append(key + (old[key], result['seconds']))
+	return regressions
+
+'''
+Command line entry point.
+
+@param argv (list), command line arguments, defaults to sys.argv[1:]
+@return exit status (int), 1 if a stage regressed against --compare, else 0
+'''
+def main(argv = None):
+	argParser = argparse.ArgumentParser(description = 'Benchmark parsing, sampling, drawing and storing.')
+	argParser.add_argument('-o', '--output', default = 'benchmark.json', help = 'JSON file for the results')
+	argParser.add_argument('--files', nargs = '*', default = None, help = 'text files (default: the TestFiles)')
+	argParser.add_argument('--synthetic', nargs = '*', default = ['10M'], help = 'sizes of generated inputs, e.g. 10M 100M 1G')
+	argParser.add_argument('-r', '--repeat', type = int, default = 3, help = 'timed runs per stage')
+	argParser.add_argument('--no-memory', action = 'store_true', help = 'skip the peak memory runs')
+	argParser.add_argument('--compare', default = None, help = 'JSON of an earlier run to check for regressions')
+	args = argParser.parse_args(argv)
+
+	files = args.files
+	if files is None:
+		files = sorted(glob.glob(os.path.join(TEST_FILES, '*.txt')))
+	workDir = tempfile.mkdtemp()
+	results = []
+	try:
+		for filename in files:
+			results.extend(benchmarkFile(filename, workDir, args.repeat, not args.no_memory))
+		for size in args.synthetic:
+			filename = os.path.join(workDir, 'synthetic-%s.txt' % size)
+			makeSyntheticFile(filename, parseSize(size))
+			try:
+				results.extend(benchmarkFile(filename, workDir, args.repeat, not args.no_memory))
+			finally:
+				os.remove(filename)
+	finally:
+		shutil.rmtree(workDir)
+
+	report = {
+		'version': codeVersion(),
+		'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+		'python': platform.python_version(),
+		'platform': platform.platform(),
+		'repeat': args.repeat,
+		'results': results,
+	}
+	with open(args.output, 'w') as file:
+		json.dump(report, file, indent = 1)
+	print ("Results written to %s" % args.output)
+
+	if args.compare:
+		with open(args.compare) as file:
+			regressions = findRegressions(results, json.load(file))
+		for inputName, stage, oldSeconds, newSeconds in regressions:
+			print ("Regression: %s %s %.4f s -> %.4f s" % (inputName, stage, oldSeconds, newSeconds))
+		if regressions:
+			return 1
+	return 0
+
+if __name__ == '__main__':
+	sys.exit(main())
@@ -0,0 +1,309 @@
+##
+# CanvasRenderer class, a pen sink which puts a drawing straight onto a Tk canvas, and
+#	Viewport class, the zoom and pan of that canvas. Lines of one color become polyline
+#	items and circles become oval items, instead of the one item per move (and many per
+#	circle) that turtle creates. The drawing is also kept in normalized coordinates (see
+#	SpatialIndex.py), and only the parts of it in view are put on the canvas.
+#
+# Wallis Muraca
+# 10/18/2026
+#
+##
+
+# library dependencies
+import bisect
+import math
+
+# our custom classes
+import Simplify as simplify
+import SpatialIndex as spatialindex
+
+""" CONSTANTS """
+
+# smallest and largest zoom, relative to the drawing fitting the canvas
+MIN_ZOOM = 0.2
+MAX_ZOOM = 64.0
+
+# part of the view's size added around it when deciding what is in view, so small pans
+# do not put pieces on the canvas and take them off again
+VIEW_MARGIN = 0.25
+
+class Viewport:
+	""" Viewport class for Text-to-Art Interpreter.
+
+	The canvas origin is kept in the middle of the canvas, and a normalized point (x, y)
+	is at ((x - centerX) * scale, -(y - centerY) * scale) on it. When the view changes,
+	every canvas item, including those of hidden layers, is moved and scaled by the
+	canvas itself, so nothing is drawn again; only the pieces coming into view are
+	added (see CanvasRenderer.cull).
+	"""
+
+	"""
+	Attributes:
+		canvas: the Tk canvas
+		unit: drawing units in one normalized unit, see SpatialIndex.SegmentGrid
+		width: width of the canvas in pixels
+		height: height of the canvas in pixels
+		baseWidth: width of the canvas when the drawing units were pixels
+		baseHeight: height of the canvas when the drawing units were pixels
+		zoom: zoom relative to fitting the canvas
+		center: normalized point in the middle of the canvas
+		scale: pixels in one normalized unit
+		box: normalized rectangle (left, bottom, right, top) in view, with VIEW_MARGIN around it
+		tolerance: largest distance in pixels lines are simplified by, or None to draw every line
+	"""
+
+	'''
+	Initializes the Viewport object, centering the canvas origin like turtle's TurtleScreen
+		does and making the background white.
+
+	@param canvas (tk.Canvas), canvas the drawings are on
+	@param unit (float), drawing units in one normalized unit, such as the width given to the Drawer
+	@param tolerance (float), largest distance in pixels lines are simplified by, or None
+	@param baseSize (tuple), width and height of the canvas the drawings were made for,
+		such as the main window's canvas for a smaller one, or None for this canvas
+	'''
+	def __init__(self, canvas, unit, tolerance = simplify.DEFAULT_TOLERANCE, baseSize = None):
+		self.canvas = canvas
+		self.unit = float(unit)
+		self.tolerance = tolerance
+		# the size it is shown at, once it is on the screen
+		self.width = canvas.winfo_width() if canvas.winfo_width() > 1 else int(canvas.cget('width'))
+		self.height = canvas.winfo_height() if canvas.winfo_height() > 1 else int(canvas.cget('height'))
+		self.baseWidth, self.baseHeight = baseSize or (self.width, self.height)
+		self.zoom = 1.0
+		self.center = (0.0, 0.0)
+		self.scale = self.fitScale()
+		self.canvas.config(bg = 'white')
+		self.updateRegion()
+
+	'''
+	@return scale (float), pixels in one normalized unit when the zoom is 1, so the
+		drawing grows and shrinks with the canvas
+	'''
+	def fitScale(self):
+		return self.unit * min(float(self.width) / self.baseWidth, float(self.height) / self.baseHeight)
+
+	'''
+	Lines are simplified for levels of detail a power of two apart rather than for every
+		zoom, so simplified items only have to be made again after zooming in or out twice
+		as far (see detailTolerance).
+
+	@return level (int), level of detail of the view
+	'''
+	def detailLevel(self):
+		return int(math.floor(math.log(self.scale, 2)))
+
+	'''
+	Lines are only simplified while a pixel is larger than a drawing unit, since the
+		Drawer's pen does not make finer moves.
+
+	@return tolerance (float), normalized distance lines may be simplified by at the
+		view's level of detail, at most tolerance pixels, or None to draw every line
+	'''
+	def detailTolerance(self):
+		if not self.tolerance or self.scale >= self.unit:
+			return None
+		return self.tolerance / 2.0 ** (self.detailLevel() + 1)
+
+	'''
+	@param coordinates (tuple), normalized x, y pairs one after the other
+	@return coordinates (list), canvas coordinates of the same points
+	'''
+	def project(self, coordinates):
+		scale = self.scale
+		left = self.center[0] * scale
+		top = self.center[1] * scale
+		projected = []
+		for i in range(0, len(coordinates), 2):
+			projected.append(coordinates[i] * scale - left)
+			projected.append(top - coordinates[i + 1] * scale)
+		return projected
+
+	'''
+	@param x (float), canvas x coordinate
+	@param y (float), canvas y coordinate
+	@return point (tuple), the normalized point there
+	'''
+	def unproject(self, x, y):
+		return (self.center[0] + x / self.scale, self.center[1] - y / self.scale)
+
+	'''
+	Changes the view, moving and scaling every canvas item to match.
+
+	@param center (tuple), normalized point to put in the middle of the canvas
+	@param zoom (float), zoom relative to fitting the canvas
+	@return None
+	'''
+	def moveTo(self, center, zoom):
+		zoom = min(MAX_ZOOM, max(MIN_ZOOM, zoom))
+		scale = self.fitScale() * zoom
+		factor = scale / self.scale
+		if factor != 1.0:
+			self.canvas.scale('all', 0, 0, factor, factor)
+		dx = (self.center[0] - center[0]) * scale
+		dy = (center[1] - self.center[1]) * scale
+		if dx or dy:
+			self.canvas.move('all', dx, dy)
+		self.center = center
+		self.zoom = zoom
+		self.scale = scale
+		self.updateBox()
+
+	'''
+	zooms in or out keeping the point under the mouse where it is
+
+	@param factor (float), how much to zoom in, or less than 1 to zoom out
+	@param x (float), canvas x coordinate of the mouse
+	@param y (float), canvas y coordinate of the mouse
+	@return None
+	'''
+	def zoomAt(self, factor, x, y):
+		pointX, pointY = self.unproject(x, y)
+		zoom = min(MAX_ZOOM, max(MIN_ZOOM, self.zoom * factor))
+		scale = self.fitScale() * zoom
+		self.moveTo((pointX - x / scale, pointY + y / scale), zoom)
+
+	'''
+	@param dx (float), pixels to move the drawing right
+	@param dy (float), pixels to move the drawing down
+	@return None
+	'''
+	def pan(self, dx, dy):
+		self.moveTo((self.center[0] - dx / self.scale, self.center[1] + dy / self.scale), self.zoom)
+
+	'''
+	fits the drawing area to the canvas again
+
+	@return None
+	'''
+	def reset(self):
+		self.moveTo((0.0, 0.0), 1.0)
+
+	'''
+	Follows a change of the canvas size. The drawing is scaled to the new size, without
+		drawing it again.
+
+	@param width (int), new width of the canvas in pixels
+	@param height (int), new height of the canvas in pixels
+	@return None
+	'''
+	def resize(self, width, height):
+		if (width, height) == (self.width, self.height) or width < 2 or height < 2:
+			return
+		self.width = width
+		self.height = height
+		self.updateRegion()
+		self.moveTo(self.center, self.zoom)
+
+	def updateRegion(self):
+		width, height = self.width, self.height
+		self.canvas.config(scrollregion = (-width // 2, -height // 2, width - width // 2, height - height // 2))
+		self.updateBox()
+
+	def updateBox(self):
+		halfWidth = (0.5 + VIEW_MARGIN) * self.width / self.scale
+		halfHeight = (0.5 + VIEW_MARGIN) * self.height / self.scale
+		x, y = self.center
+		self.box = (x - halfWidth, y - halfHeight, x + halfWidth, y + halfHeight)
+
+
+class CanvasRenderer(spatialindex.SegmentGrid):
+	""" CanvasRenderer class for Text-to-Art Interpreter.
+
+	Used as the sink of a PenTurtle, one per drawing. Every piece is kept (see
+	SpatialIndex.SegmentGrid) and put on the canvas as it is drawn if it is in view,
+	its line simplified for the view's level of detail; cull brings the canvas up to
+	date after the view changed.
+	"""
+
+	"""
+	Attributes:
+		canvas: the Tk canvas drawn on
+		view: the canvas' Viewport
+		items: id of the canvas item of every piece on the canvas, by piece number
+		itemTolerance: detailTolerance of the view the items were made for
+	"""
+
+	'''
+	Initializes the CanvasRenderer object.
+
+	@param canvas (tk.Canvas), canvas to draw on
+	@param view (Viewport), the canvas' zoom and pan
+	@param maxPoints (int), longest polyline put in one canvas item
+	'''
+	def __init__(self, canvas, view, maxPoints = spatialindex.PIECE_POINTS):
+		spatialindex.SegmentGrid.__init__(self, view.unit, maxPoints)
+		self.canvas = canvas
+		self.view = view
+		self.items = {}
+		self.itemTolerance = view.detailTolerance()
+
+	'''
+	keeps a piece, and puts it on the canvas if it is in view
+
+	@return number (int), number of the piece
+	'''
+	def addPiece(self, kind, color, coordinates, box):
+		number = spatialindex.SegmentGrid.addPiece(self, kind, color, coordinates, box)
+		if spatialindex.intersects(box, self.view.box):
+			self.items[number] = self.createItem(number)
+		return number
+
+	'''
+	puts a piece on the canvas; the y-axis is flipped since the canvas' points down
+
+	@param number (int), number of the piece
+	@return item (int), id of the canvas item
+	'''
+	def createItem(self, number):
+		kind, color, coordinates = self.pieces[number]
+		if kind == spatialindex.CIRCLE:
+			x, y = self.view.project(coordinates[:2])
+			radius = coordinates[2] * self.view.scale
+			return self.canvas.create_oval(x - radius, y - radius, x + radius, y + radius,
+				outline = color, width = 1)
+		tolerance = self.view.detailTolerance()
+		if tolerance is not None and len(coordinates) > 4:
+			points = simplify.simplify(list(zip(coordinates[0::2], coordinates[1::2])), tolerance)
+			coordinates = [value for point in points for value in point]
+		return self.canvas.create_line(self.view.project(coordinates), fill = color, width = 1, capstyle = 'round')
+
+	'''
+	Puts the pieces which came into view on the canvas and deletes the items of those
+		which left it, or of all pieces once the lines are simplified by another tolerance.
+		Zooming within a level of detail, or anywhere while every line is drawn, keeps the
+		items. New items are stacked in drawing order with the items kept.
+
+	@return (added, removed) (tuple), ids of the canvas items added and number of items deleted
+	'''
+	def cull(self):
+		visible = self.query(self.view.box)
+		items = self.items
+		keep = set(visible)
+		tolerance = self.view.detailTolerance()
+		if tolerance != self.itemTolerance:
+			self.itemTolerance = tolerance
+			keep = set()
+		gone = [number for number in items if number not in keep]
+		if gone:
+			self.canvas.delete(*[items.pop(number) for number in gone])
+		shown = sorted(items)
+		added = []
+		for number in visible:
+			if number in items:
+				continue
+			item = self.items[number] = self.createItem(number)
+			added.append(item)
+			# new items go on top, so move it below the first item drawn after it
+			after = bisect.bisect(shown, number)
+			if after < len(shown):
+				self.canvas.tag_lower(item, items[shown[after]])
+		return added, len(gone)
+
+	'''
+	@param number (int), a piece number, such as pieceCount() before drawing more
+	@return items (list), ids of the canvas items of the pieces from that number on
+	'''
+	def itemsSince(self, number):
+		return [self.items[piece] for piece in range(number, len(self.pieces)) if piece in self.items]
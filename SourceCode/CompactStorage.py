@@ -0,0 +1,41 @@
+##
+# CompactStorage: command line tool which rewrites the Previous Drawings storage without
+#	the space no drawing uses any more, such as the old characters of followed files
+#	which have grown. Run it while the application is not running.
+#
+# Usage: python CompactStorage.py [--storage index|sqlite]
+#
+# Adam Carlson
+# 10/18/2026
+#
+##
+
+# library dependencies
+import argparse
+import sys
+import time
+
+# our custom classes
+import DataStorage as storage
+
+'''
+Command line entry point.
+
+@param argv (list), command line arguments, defaults to sys.argv[1:]
+@return exit status (int)
+'''
+def main(argv = None):
+	argParser = argparse.ArgumentParser(description = 'Compact the storage of the Previous Drawings.')
+	argParser.add_argument('--storage', choices = ['index', 'sqlite'], default = 'index',
+		help = 'where past drawings are kept')
+	args = argParser.parse_args(argv)
+
+	start = time.time()
+	history = storage.openStorage(args.storage)
+	before, after = history.compact()
+	drawings = len(history.listDrawings())
+	print ("Compacted %d drawings from %d to %d bytes in %.2f s" % (drawings, before, after, time.time() - start))
+	return 0
+
+if __name__ == '__main__':
+	sys.exit(main())
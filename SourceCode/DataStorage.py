@@ -1,71 +1,497 @@
 ##
 # DataStorage class to handle storing the application's past drawings for future use.
 # All drawings are stored as a list of representative characters of the original text file used.
+# Drawings are lists of single characters, as made by the Parser.
 # 
 # Adam Carlson
 # 11/24/2017
 #
 ##
 
-# library dependency
+# library dependencies
+import hashlib
+import io
 import os
+import time
+import zlib
+
+# first line of the index file, naming its format, followed by a tab and the name of
+# the data file
+INDEX_HEADER = u'TTAI-INDEX 1'
+
+# zlib level the drawings are compressed with
+COMPRESSION_LEVEL = 6
+
+# the data file is rewritten under the other of its two names, so the index always
+# names a complete data file (see rewrite)
+COMPACTED_SUFFIX = '-compacted.dat'
 
 class DataStorage:
 	""" DataStorage class for Text-to-Art Interpreter. """
 	
 	"""
+	Drawings are kept in two files: a data file holding the characters of the drawings
+	one after another, and a small index file with one line per drawing giving its
+	filename and where its characters are in the data file. Only the index is read to
+	list the drawings; the characters of a drawing are read when it is loaded.
+	
+	The characters are stored compressed with zlib, once per content: drawings with the
+	same characters, such as a file opened twice, share one blob named by its content
+	hash. Blobs no drawing uses any more stay in the data file until compact is run.
+	
 	Attributes:
-		fileStorageName: filename where we store past drawings
+		fileStorageName: filename where past drawings were stored before the index was introduced
+		indexFileName: filename of the index
+		dataFileName: filename of the characters of all drawings, named in the index
+		index: list of (offset, length, save time, filename, content hash) tuples, one per
+			drawing, read from the index file when first needed
+		blobs: (offset, length) in the data file of the blob of every content hash
 	"""
 	
 	'''
 	initializes the DataStorage object.
+	
+	@param fileStorageName (string), name of the old-style storage file; the index and data
+		files are named after it
+	'''
+	def __init__(self, fileStorageName = 'drawings.txt'):
+		self.fileStorageName = fileStorageName
+		base = os.path.splitext(fileStorageName)[0]
+		self.indexFileName = base + '.idx'
+		self.dataFileName = base + '.dat'
+		self.index = None
+		self.blobs = None
+	
+	
+	'''
+	Reads the index file, creating it from the old storage file the first time.
+	
+	@returns None
+	'''
+	def loadIndex(self):
+		if self.index is not None:
+			return
+		if not os.path.exists(self.indexFileName):
+			self.migrate()
+		
+		dataFileName, index = self.readIndex()
+		self.dataFileName = dataFileName
+		self.index = index
+		self.blobs = dict((entry[4], (entry[0], entry[1])) for entry in index)
+	
+	
+	'''
+	Reads the index file, without changing anything.
+	
+	@returns (dataFileName, entries) (tuple), the data file the index names and its
+		entries, see index
+	'''
+	def readIndex(self):
+		entries = []
+		with io.open(self.indexFileName, 'r', encoding = 'utf-8') as file:
+			header, separator, dataName = file.readline().rstrip('\n').partition('\t')
+			if header != INDEX_HEADER or not dataName:
+				raise ValueError("Unknown drawing index format in %s: %r" % (self.indexFileName, header))
+			for line in file:
+				offset, length, saved, digest, filename = line.rstrip('\n').split('\t', 4)
+				entries.append((int(offset), int(length), int(saved), filename, digest))
+		return os.path.join(os.path.dirname(self.indexFileName), dataName), entries
+	
+	
+	'''
+	Lists the filenames of past drawings, without loading their characters.
+	
+	@param offset (int), number of the first drawing listed
+	@param limit (int), maximum number of drawings listed, or None for all
+	@returns a list of filenames; the drawing numbers are offset, offset + 1, ...
+	'''
+	def listDrawings(self, offset = 0, limit = None):
+		self.loadIndex()
+		end = None if limit is None else offset + limit
+		return [entry[3] for entry in self.index[offset:end]]
+	
+	
+	'''
+	Loads the characters of one past drawing. Once the index is loaded it can be called
+		from any thread, such as the thumbnail worker's: drawings are added to the index
+		after their characters are written, and the data file is opened for each call.
+	
+	@param number (int), number of the drawing, its position in listDrawings()
+	@returns a list of representative chars for the drawing, e.g. ['a', 'e', 'q', ...]
+	'''
+	def loadDrawing(self, number):
+		self.loadIndex()
+		with open(self.dataFileName, 'rb') as file:
+			return self.readRecord(file, self.index[number])
+	
+	
+	'''
+	Reads the characters of one drawing from the open data file.
+	
+	@param file (file), data file opened in binary mode
+	@param entry (tuple), index entry of the drawing
+	@returns a list of representative chars for the drawing
+	'''
+	def readRecord(self, file, entry):
+		return list(self.readText(file, entry[0], entry[1]))
+	
+	
+	'''
+	@param file (file), data file opened in binary mode
+	@param offset (int), where the blob starts in the data file
+	@param length (int), size of the blob in bytes
+	@returns text (string), the characters of the blob
+	@raises IOError if the blob is missing or damaged, as after a power loss (see saveData)
 	'''
-	def __init__(self):
-		self.fileStorageName = 'drawings.txt'
+	def readText(self, file, offset, length):
+		file.seek(offset)
+		blob = file.read(length)
+		if len(blob) < length:
+			raise IOError("The characters at %d in %s are cut off by %d bytes" % (offset, file.name, length - len(blob)))
+		try:
+			return zlib.decompress(blob).decode('utf-8')
+		except (zlib.error, UnicodeDecodeError) as error:
+			raise IOError("The characters at %d in %s are damaged: %s" % (offset, file.name, error))
 	
 	
 	'''
-	Retrieves all past drawings.
+	Retrieves all past drawings. Every blob is read and decompressed once, however many
+		drawings share it.
 	
 	@returns an array of tuples, each with the form (filename, ['a', 'e', 'q', ...]) where
 		the second item in the tuple is a list of representative chars for the given file.
 		Each of these tuples gives us enough information to recreate past drawings.
 	'''	
 	def getData(self):
+		self.loadIndex()
+		return self.readEntries(self.dataFileName, self.index)
+	
+	
+	'''
+	@param dataFileName (string), data file of the entries
+	@param entries (list), index entries of the drawings
+	@returns an array of (filename, ['a', 'e', 'q', ...]) tuples, one per entry
+	'''
+	def readEntries(self, dataFileName, entries):
+		if not entries:
+			return []
+		texts = {}
+		drawings = []
+		with open(dataFileName, 'rb') as file:
+			for offset, length, saved, filename, digest in entries:
+				if digest not in texts:
+					texts[digest] = self.readText(file, offset, length)
+				drawings.append((filename, list(texts[digest])))
+		return drawings
+	
+	
+	'''
+	Retrieves all past drawings like getData, but only reads the storage files as they
+		are: nothing is migrated or deleted, so another storage can import them without
+		changing them (see SQLiteStorage.py).
+	
+	@returns an array of tuples, each with the form (filename, ['a', 'e', 'q', ...])
+	'''
+	def readData(self):
+		if not os.path.exists(self.indexFileName):
+			self.checkDataFiles()
+			if os.path.exists(self.fileStorageName):
+				return self.readOldData()
+			return []
+		dataFileName, entries = self.readIndex()
+		return self.readEntries(dataFileName, entries)
+	
+	
+	'''
+	Saves a drawing to our storage files. It is not synced to disk, so saving from the
+		GUI does not wait for the disk. A crash of the program loses nothing, but after a
+		power loss the drawing can be lost or damaged: the index may reach the disk before
+		the characters, and then loadDrawing raises an IOError for the drawing instead of
+		returning wrong characters.
+	
+	@param drawingData (list), list of representative characters for the text we are drawing
+	@param filename (string), name of the text file we were drawing
+	@returns number (int), number of the new drawing
+	'''		
+	def saveData(self, drawingData, filename):
+		return self.saveMany([(filename, drawingData)], sync = False)[0]
+	
+	
+	'''
+	Saves many drawings in one group commit: the data file and the index are each
+		opened, written and synced to disk once for all of them. The characters are
+		written first, so the index never points at characters which were not written.
+	
+	@param drawings (iterable), (filename, drawingData) tuples like the ones getData returns
+	@param sync (bool), whether to sync the files to disk before returning
+	@returns numbers (list), numbers of the new drawings
+	'''
+	def saveMany(self, drawings, sync = True):
+		self.loadIndex()
+		drawings = list(drawings)
+		if not drawings:
+			return []
+		saved = int(time.time())
+		entries = []
+		newBlobs = {}
+		with open(self.dataFileName, 'ab') as file:
+			file.seek(0, os.SEEK_END)
+			for filename, drawingData in drawings:
+				# the index is line based and tab separated
+				filename = filename.replace('\t', ' ').replace('\n', ' ').replace('\r', ' ')
+				# joined and encoded once for both the hash and the blob
+				data = ''.join(drawingData).encode('utf-8')
+				digest = hashlib.sha1(data).hexdigest()
+				if digest not in self.blobs and digest not in newBlobs:
+					blob = zlib.compress(data, COMPRESSION_LEVEL)
+					newBlobs[digest] = (file.tell(), len(blob))
+					file.write(blob)
+				offset, length = self.blobs.get(digest) or newBlobs[digest]
+				entries.append((offset, length, saved, filename, digest))
+			if newBlobs and sync:
+				file.flush()
+				os.fsync(file.fileno())
+		
+		with io.open(self.indexFileName, 'a', encoding = 'utf-8') as file:
+			file.write(u''.join(u'%d\t%d\t%d\t%s\t%s\n' % (offset, length, saved, digest, filename)
+				for offset, length, saved, filename, digest in entries))
+			if sync:
+				file.flush()
+				os.fsync(file.fileno())
+		
+		self.blobs.update(newBlobs)
+		first = len(self.index)
+		self.index.extend(entries)
+		return list(range(first, len(self.index)))
+	
+	
+	'''
+	Finds the blob of some characters, compressing them and appending them to the data
+		file if they are not stored yet.
+	
+	@param drawingData (list), representative characters
+	@param digest (string), their content hash
+	@returns (offset, length) (tuple), where the blob is in the data file
+	'''
+	def writeBlob(self, drawingData, digest):
+		if digest not in self.blobs:
+			blob = zlib.compress(''.join(drawingData).encode('utf-8'), COMPRESSION_LEVEL)
+			with open(self.dataFileName, 'ab') as file:
+				file.seek(0, os.SEEK_END)
+				self.blobs[digest] = (file.tell(), len(blob))
+				file.write(blob)
+		return self.blobs[digest]
+	
+	
+	'''
+	Adds characters to the end of a saved drawing, for a text file which has grown.
+		Compressed blobs cannot be added to, so the drawing gets a new blob and the
+		whole drawing is written again. The old blob stays in the data file until
+		compact is run: a followed file refreshed n times leaves n blobs behind. Each is
+		at most the blob of 2 * sampleSize characters, as Incremental.py resamples a
+		drawing which grows past that, so the data file grows at most linearly with the
+		refreshes.
+	
+	@param number (int), number of the drawing, its position in listDrawings()
+	@param newCharacters (list), representative characters to add
+	@returns None
+	'''
+	def extendDrawing(self, number, newCharacters):
+		self.replaceDrawing(number, self.loadDrawing(number) + list(newCharacters))
+	
+	
+	'''
+	Replaces the characters of a saved drawing. The new characters get their own blob
+		(or share one) and the index is pointed at it; the old blob is left until compact.
+	
+	@param number (int), number of the drawing, its position in listDrawings()
+	@param drawingData (list), the drawing's new representative characters
+	@returns None
+	'''
+	def replaceDrawing(self, number, drawingData):
+		self.loadIndex()
+		digest = contentHash(drawingData)
+		offset, length = self.writeBlob(drawingData, digest)
+		saved, filename = self.index[number][2:4]
+		self.index[number] = (offset, length, saved, filename, digest)
+		self.writeIndex()
+	
+	
+	'''
+	Writes the whole index file from self.index, under another name first so a crash
+		leaves the old index in place.
+	
+	@returns None
+	'''
+	def writeIndex(self):
+		temporaryIndex = self.indexFileName + '.tmp'
+		with io.open(temporaryIndex, 'w', encoding = 'utf-8') as file:
+			file.write(u'%s\t%s\n' % (INDEX_HEADER, os.path.basename(self.dataFileName)))
+			for offset, length, saved, filename, digest in self.index:
+				file.write(u'%d\t%d\t%d\t%s\t%s\n' % (offset, length, saved, digest, filename))
+			file.flush()
+			os.fsync(file.fileno())
+		# os.replace also replaces an existing file on Windows, where os.rename fails
+		getattr(os, 'replace', os.rename)(temporaryIndex, self.indexFileName)
+	
+	
+	'''
+	Writes a new data file and index holding the given drawings, each blob once. The
+		data file is written under the name the index does not use, and the old one is
+		only deleted once the new index names the new one, so a crash at any point 
+		leaves a complete store.
+	
+	@param records (iterator), (save time, filename, content hash, blob) tuples, where
+		blob is a function returning the compressed characters; it is only called for
+		the first drawing with each content hash
+	@returns oldDataFileName (string), the data file no longer used, for the caller to 
+		delete once it has closed it (Windows cannot delete an open file), or None
+	'''
+	def rewrite(self, records):
+		base = os.path.splitext(self.fileStorageName)[0]
+		oldDataFileName = self.dataFileName
+		newDataFileName = oldDataFileName
+		if os.path.exists(oldDataFileName):
+			newDataFileName = base + COMPACTED_SUFFIX if oldDataFileName == base + '.dat' else base + '.dat'
+		
+		index = []
+		blobs = {}
+		with open(newDataFileName, 'wb') as file:
+			for saved, filename, digest, blob in records:
+				if digest not in blobs:
+					data = blob()
+					blobs[digest] = (file.tell(), len(data))
+					file.write(data)
+				offset, length = blobs[digest]
+				index.append((offset, length, saved, filename, digest))
+			file.flush()
+			os.fsync(file.fileno())
+		
+		self.dataFileName = newDataFileName
+		self.index = index
+		self.blobs = blobs
+		self.writeIndex()
+		if oldDataFileName != newDataFileName and os.path.exists(oldDataFileName):
+			return oldDataFileName
+		return None
+	
+	
+	'''
+	Rewrites the storage files without the blobs no drawing uses any more, such as the
+		old characters of followed files which have grown (see Incremental.py). Run it
+		while the application is not running.
+	
+	@returns (before, after) (tuple), size of the data file in bytes before and after
+	'''
+	def compact(self):
+		self.loadIndex()
+		before = os.path.getsize(self.dataFileName) if os.path.exists(self.dataFileName) else 0
+		
+		def records(file):
+			for offset, length, saved, filename, digest in list(self.index):
+				yield saved, filename, digest, lambda offset = offset, length = length: self.readBlob(file, offset, length)
+		
+		with open(self.dataFileName, 'a+b') as file:
+			oldDataFileName = self.rewrite(records(file))
+		if oldDataFileName is not None:
+			os.remove(oldDataFileName)
+		return before, os.path.getsize(self.dataFileName)
+	
+	
+	'''
+	@param file (file), data file opened in binary mode
+	@param offset (int), where the blob starts in the data file
+	@param length (int), size of the blob in bytes
+	@returns blob (bytes), the compressed characters
+	'''
+	def readBlob(self, file, offset, length):
+		file.seek(offset)
+		return file.read(length)
+	
+	
+	'''
+	One-time migration from the old storage file, which holds two lines per drawing:
+		the filename, then its characters separated by spaces. The index file is
+		written last, so an interrupted migration is simply run again. The old file
+		is left as it is.
+	
+	@returns None
+	'''
+	def migrate(self):
+		self.checkDataFiles()
+		saved = 0
+		drawings = []
+		if os.path.exists(self.fileStorageName):
+			drawings = self.readOldData()
+			saved = int(os.path.getmtime(self.fileStorageName))
+		
+		records = ((saved, filename, contentHash(drawing),
+			lambda drawing = drawing: zlib.compress(''.join(drawing).encode('utf-8'), COMPRESSION_LEVEL))
+			for filename, drawing in drawings)
+		self.rewrite(records)
+	
+	
+	'''
+	Makes sure there is no data file without its index, before one is made from the old
+		storage file. The drawings saved since the index was introduced are only in the
+		data file, so it is never replaced; the index has to be restored instead.
+	
+	@returns None
+	@raises IOError if a data file is there without the index
+	'''
+	def checkDataFiles(self):
+		base = os.path.splitext(self.fileStorageName)[0]
+		for dataFileName in (base + '.dat', base + COMPACTED_SUFFIX):
+			if os.path.exists(dataFileName):
+				raise IOError("%s holds saved drawings but their index %s is missing; restore the index, "
+					"or move %s away to start again from %s" % (dataFileName, self.indexFileName, dataFileName,
+					self.fileStorageName))
+	
+	
+	'''
+	Retrieves all past drawings from the old storage file.
+	
+	@returns an array of tuples, each with the form (filename, ['a', 'e', 'q', ...])
+	'''
+	def readOldData(self):
 		
 		# list of tuples, each with the form (filename, ['a', 'e', 'q', ...])
 		drawings = []
 		
-		# read in the content from our storage file
+		# read in the content from our storage file, in the encoding it was written with
 		with open(self.fileStorageName) as file:
 			content = file.read().splitlines()
 		
 		# populate our drawings list
-		for i in range(0, len(content), 2):
+		for i in range(0, len(content) - 1, 2):
 			filename = content[i]
-			drawing = content[i + 1].split(' ')
+			drawing = content[i + 1].split()
 			drawings.append((filename, drawing))
+			
+		return drawings
+		
+	''' @OldVersion
+	def getData(self):
+		
+		# list of tuples, each with the form (filename, ['a', 'e', 'q', ...])
+		drawings = []
+		
+		# read in the content from our storage file
+		with open(self.fileStorageName) as file:
+			content = file.read().splitlines()
 		
-		'''@OldVersion	
 		# populate our drawings list
-		for i in range(len(content)):
-			drawing = content[i].split(' ')
+		for i in range(0, len(content), 2):
+			filename = content[i]
+			drawing = content[i + 1].split(' ')
 			drawings.append((filename, drawing))
-		'''
 			
 		file.close()
 		
 		return drawings
-	
-	
 	'''
-	Saves a drawing to our storage file.
 	
-	@param drawingData (list), list of representative characters for the text we are drawing
-	@param filename (string), name of the text file we were drawing
-	@returns None
-	'''		
+	''' @OldVersion
 	def saveData(self, drawingData, filename):
 		# final string we will write to our storage file
 		stringRepresentationOfData = ''
@@ -91,7 +517,8 @@ class DataStorage:
 		file = open(self.fileStorageName, "a")
 		file.write(stringRepresentationOfData)
 		file.close()
-		
+	'''
+	
 	''' @OldVersion
 	def saveData(self, drawingData):
 		# final string we will write to our storage file
@@ -111,4 +538,29 @@ class DataStorage:
 		file.write(stringRepresentationOfData)
 		file.close()
 	'''
-	
\ No newline at end of file
+	
+
+
+'''
+Opens the drawing storage.
+
+@param backend (string), 'index' for the DataStorage index and data files, or 'sqlite'
+	for an SQLite database (see SQLiteStorage.py)
+@returns the storage object, which has the DataStorage methods
+'''
+def openStorage(backend = 'index'):
+	if backend == 'sqlite':
+		import SQLiteStorage
+		return SQLiteStorage.SQLiteStorage()
+	if backend == 'index':
+		return DataStorage()
+	raise ValueError("Unknown storage backend: %s" % backend)
+
+'''
+Computes the content hash of a drawing, which names its thumbnail.
+
+@param drawingData (list), representative characters of a drawing
+@returns digest (string), SHA-1 of the characters in UTF-8, in hexadecimal
+'''
+def contentHash(drawingData):
+	return hashlib.sha1(''.join(drawingData).encode('utf-8')).hexdigest()
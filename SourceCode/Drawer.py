@@ -8,15 +8,52 @@
 ##
 
 # Dependencies
+import itertools
+import math
 import random
+import re
 import string
-import turtle
+import time
+
+# our custom classes
+import Instrumentation as instrumentation
 
 """ CONSTANTS """
 
 # tested colors which fit well together
 ACCEPTABLE_COLORS = ['#6465A5', '#6975A6' , '#F3E96B', '#F28A30', '#F05837']
 
+# opcodes of a compiled drawing, see Drawer.compile
+OP_FORWARD = 0	# move forward count steps of parameter pixels
+OP_TURN = 1		# turn right count times by parameter degrees
+OP_COLOR = 2	# set the pen color to parameter
+OP_GOTO = 3		# draw the circle excursion to position parameter
+OP_CALL = 4		# call the (method, argument) pair parameter
+OP_CHECK = 5	# only adjust the orientation
+OP_NARROW = 6	# let the turtle closer to the edges
+
+# runs of letter classes which compile together: forward steps, or turns and color changes
+RUN_PATTERN = re.compile('F+|[TC]+|.')
+
+# size of the drawing canvas in the GUI's default window
+CANVAS_WIDTH = 1200
+CANVAS_HEIGHT = 675
+# space the GUI keeps between the drawing and the canvas edges (see DisplayApp.createDrawing)
+REDUCED_WIDTH = 500
+REDUCED_HEIGHT = 200
+
+# longest letters list drawn unless the Drawer is given another limit
+MAX_LETTERS = 10000
+
+# number of opcodes drawn between time checks in drawSlice
+SLICE_OPCODES = 64
+
+# number of letter runs compiled between time checks in drawSlice
+COMPILE_RUNS = 2048
+
+# distance from the edge regions within which forward runs are split conservatively
+EDGE_MARGIN = 1e-6
+
 class Drawer:
 	""" Drawer class for Text-to-Art Interpreter. """
 		
@@ -29,23 +66,42 @@ class Drawer:
 		letters2action: mapping between chars and the function the turtle should do on the canvas
 		closenessFactor: a factor of how close to the canvas edges the turtle should travel
 		allowedLetters: letters which the turtle will respond to (all other chars ignored)
+		maxLetters: longest lettersList that will be drawn, or None for no limit
+		program: compiled lettersList, see compile
+		programCounter: index of the next opcode of program to draw
+		compiler: compileSteps generator still adding to program, or None once it is compiled
+		startColor: pen color when the program starts
+		allowedBefore: number of allowed letters drawn before lettersList, when it continues a drawing
 	"""
 	
 	''' 
 	Initializes the Drawer object. 
 	'''
-	def __init__(self, lettersList, turt, windowWidth, windowHeight, closenessFactor = 0.1, testClass = False):
+	def __init__(self, lettersList, turt, windowWidth, windowHeight, closenessFactor = 0.1, testClass = False, maxLetters = MAX_LETTERS):
 		self.lettersList = lettersList
 		# for testing purposes, just use regular non-canvas turtle
 		if testClass:
+			import turtle
 			self.turt = turtle
 		else:
 			self.turt = turt
+		if instrumentation.enabled:
+			# count turtle calls and time edge corrections and circle excursions
+			self.turt = instrumentation.countTurtle(self.turt)
+			self.adjustOrientation = instrumentation.timed('orient', self.adjustOrientation)
+			self.goto = instrumentation.timed('circle', self.goto)
 		self.windowHeight = windowHeight
 		self.windowWidth = windowWidth
 		self.letters2action = self.buildMapping()
 		self.closenessFactor = closenessFactor
 		self.allowedLetters = ['a', 'b', 'c', 'd', 'e', 'f', 'g', 'h', 'i', 'j', 'k', 'l', 'm', 'n', 'o', 'p', 'q', 'r', 's', 't', 'u', 'v', 'w', 'x', 'y', 'z']
+		self.maxLetters = maxLetters
+		self.program = []
+		self.programCounter = 0
+		self.compiler = None
+		self.startColor = ACCEPTABLE_COLORS[0]
+		self.allowedBefore = 0
+		self._color = self.startColor
 		
 		self.setupGraphics()
 	
@@ -166,13 +222,26 @@ class Drawer:
 	'''
 	Adjusts turtle's orientation if too close to the edges of the canvas
 	
-	@return None
+	@return corrected (bool), whether the heading was changed
 	'''
 	def adjustOrientation(self):
 		# gets turtle's current position
-		x = self.turt.pos()[0]
-		y = self.turt.pos()[1]
+		x, y = self.turt.pos()
 		
+		heading = self.edgeHeading(x, y)
+		if heading is None:
+			return False
+		self.turt.setheading(heading)
+		return True
+	
+	'''
+	Finds the heading that turns the turtle away from the edges of the canvas
+	
+	@param x (float), x coordinate of the turtle
+	@param y (float), y coordinate of the turtle
+	@return heading (int), new heading, or None if not too close to an edge
+	'''
+	def edgeHeading(self, x, y):
 		# determines how close to edges we will allow
 		closenessFactor = self.closenessFactor
 		
@@ -185,28 +254,259 @@ class Drawer:
 		
 		# region 3 correction
 		if x > self.windowWidth * (0.5 - closenessFactor) and y > self.windowWidth * (0.5 - closenessFactor):
-			self.turt.setheading(225)
+			return 225
 		# region 1 correction
 		elif x < -1 * self.windowWidth * (0.5 - closenessFactor) and y > self.windowWidth * (0.5 - closenessFactor):
-			self.turt.setheading(315)
+			return 315
 		# region 2 correction
 		elif y > self.windowWidth * (0.5 - closenessFactor):
-			self.turt.setheading(270)
+			return 270
 		# region 6 correction	
 		elif x < -1 * self.windowWidth * (0.5 - closenessFactor) and y < -1 * self.windowWidth * (0.5 - closenessFactor):
-			self.turt.setheading(45)
+			return 45
 		# region 4 correction
 		elif x < -1 * self.windowWidth * (0.5 - closenessFactor):
-			self.turt.setheading(0)
+			return 0
 		# region 8 correction	
 		elif x > self.windowWidth * (0.5 - closenessFactor) and y < -1 * self.windowWidth * (0.5 - closenessFactor):
-			self.turt.setheading(135)
+			return 135
 		# region 7 correction
 		elif y < -1 * self.windowWidth * (0.5 - closenessFactor):
-			self.turt.setheading(90)
+			return 90
 		# region 5 correction	
 		elif x > self.windowWidth * (0.5 - closenessFactor):
-			self.turt.setheading(180)
+			return 180
+		return None
+	
+	'''
+	Counts how many forward steps the turtle can take in one go. A run of forward steps
+		must be split where a step ends near an edge, because adjustOrientation may turn
+		the turtle there before the next step.
+	
+	@param steps (int), number of forward steps left in the run
+	@param distance (int), pixel distance of each step
+	@return clearSteps (int), number of steps (at least 1) that can be drawn as one forward call
+	'''
+	def countClearSteps(self, steps, distance):
+		if steps == 1:
+			return 1
+		x, y = self.turt.pos()
+		angle = math.radians(self.turt.heading())
+		dx = math.cos(angle) * distance
+		dy = math.sin(angle) * distance
+		# every edge region lies beyond this distance from the center; the margin
+		# leaves positions right on the border to adjustOrientation itself
+		limit = self.windowWidth * (0.5 - self.closenessFactor) - EDGE_MARGIN
+		clearSteps = 1
+		while clearSteps < steps:
+			x += dx
+			y += dy
+			if abs(x) > limit or abs(y) > limit:
+				break
+			clearSteps += 1
+		return clearSteps
+	
+	'''
+	Compiles lettersList into a short program of (opcode, count, parameter) tuples. Letters
+		are classified in bulk with str.translate, consecutive forward steps and turns are
+		merged, and color changes which do not change the color are dropped. Every opcode
+		except OP_NARROW runs adjustOrientation first, like every letter does in the 
+		uncompiled loop, so the drawing is unchanged.
+	
+	@param startColor (string), pen color when the program starts
+	@return program (list), the compiled drawing
+	'''
+	def compile(self, startColor = ACCEPTABLE_COLORS[0]):
+		program = []
+		for step in self.compileSteps(startColor, program):
+			pass
+		return program
+	
+	'''
+	Compiles lettersList like compile, yielding after every COMPILE_RUNS runs of letters
+		so a long lettersList can be compiled a part at a time between drawing slices.
+		The opcodes compiled so far are complete and can be run before the rest.
+	
+	@param startColor (string), pen color when the program starts
+	@param program (list), compiled program to append to
+	@return generator, which yields None after each part
+	'''
+	def compileSteps(self, startColor, program):
+		letters = self.allowedText()
+		classes = letters.translate(self.opcodeTable())
+		self._color = startColor
+		
+		# closenessFactor shrinks once, after the second letter, so the first two run alone;
+		# a continued drawing may already be past them
+		head = min(max(0, 2 - self.allowedBefore), len(letters))
+		for i in range(head):
+			self.compileRun(letters[i], classes[i], program)
+		if self.allowedBefore < 2 <= self.allowedBefore + len(letters):
+			program.append((OP_NARROW, 0, None))
+		for count, match in enumerate(RUN_PATTERN.finditer(classes, head), 1):
+			self.compileRun(letters[match.start():match.end()], match.group(), program)
+			if count % COMPILE_RUNS == 0:
+				yield
+		
+		# the uncompiled loop checks the orientation once more before any trailing 
+		# non-letters, or before a final color change that was dropped
+		lastOpcode = program[-1][0] if program else None
+		if (self.lettersList and self.lettersList[-1] not in self.allowedLetters) or (letters and classes[-1] == 'C' and lastOpcode != OP_COLOR):
+			program.append((OP_CHECK, 0, None))
+	
+	'''
+	Joins the allowed letters of lettersList into one string, dropping everything else
+	
+	@return letters (string), the letters the turtle responds to, in order
+	'''
+	def allowedText(self):
+		try:
+			text = ''.join(self.lettersList)
+		except TypeError:
+			text = None
+		# only a list of single characters can be handled in bulk
+		if text is None or len(text) != len(self.lettersList):
+			text = ''.join(letter for letter in self.lettersList if letter in self.allowedLetters)
+		return re.sub('[^%s]' % re.escape(''.join(self.allowedLetters)), '', text)
+	
+	'''
+	Builds the str.translate table which maps each allowed letter to the class of its
+		action in letters2action: 'F' forward, 'T' turn, 'C' color, 'G' goto, 'X' any other call
+	
+	@return table (dict), translation table from letter ordinals to class letters
+	'''
+	def opcodeTable(self):
+		table = {}
+		for letter in self.allowedLetters:
+			method = self.letters2action[letter][0]
+			if method == self.turt.forward:
+				table[ord(letter)] = 'F'
+			elif method == self.turt.right or method == self.turt.left:
+				table[ord(letter)] = 'T'
+			elif method == self.turt.color:
+				table[ord(letter)] = 'C'
+			elif method == self.goto:
+				table[ord(letter)] = 'G'
+			else:
+				table[ord(letter)] = 'X'
+		return table
+	
+	'''
+	Compiles one run of letters found by RUN_PATTERN and appends its opcodes to the program
+	
+	@param letters (string), the letters of the run
+	@param classes (string), the class letter of each letter in the run
+	@param program (list), compiled program to append to
+	@return None
+	'''
+	def compileRun(self, letters, classes, program):
+		if classes[0] == 'F':
+			# split where the step distance changes
+			for distance, group in itertools.groupby(self.letters2action[letter][1] for letter in letters):
+				program.append((OP_FORWARD, len(list(group)), distance))
+			return
+		if classes[0] == 'G':
+			program.append((OP_GOTO, 1, self.letters2action[letters][1]))
+			return
+		if classes[0] == 'X':
+			program.append((OP_CALL, 1, self.letters2action[letters]))
+			return
+		
+		# the turtle stands still during turns and color changes, so they can be reordered:
+		# all turns are merged and only the last color is kept
+		turns = []
+		color = None
+		for letter, letterClass in zip(letters, classes):
+			method, parameter = self.letters2action[letter]
+			if letterClass == 'C':
+				color = parameter
+				continue
+			angle = parameter if method == self.turt.right else -parameter
+			if turns and turns[-1][2] == angle:
+				turns[-1] = (OP_TURN, turns[-1][1] + 1, angle)
+			else:
+				turns.append((OP_TURN, 1, angle))
+		
+		colorOps = []
+		if color is not None and color != self._color:
+			colorOps.append((OP_COLOR, 1, color))
+			self._color = color
+		# keep whichever came last in the run last, so the final heading is unchanged
+		if classes[-1] == 'T':
+			program.extend(colorOps + turns)
+		else:
+			program.extend(turns + colorOps)
+	
+	'''
+	Runs a compiled program on the turtle
+	
+	@param program (list), program made by compile
+	@return None
+	'''
+	def run(self, program):
+		for opcode, count, parameter in program:
+			if opcode == OP_NARROW:
+				self.closenessFactor = max(0.01, self.closenessFactor - 0.01)
+				continue
+			
+			# reorient turtle if near edge
+			corrected = self.adjustOrientation()
+			
+			if opcode == OP_FORWARD:
+				while True:
+					steps = self.countClearSteps(count, parameter)
+					self.turt.forward(parameter * steps)
+					count -= steps
+					if count == 0:
+						break
+					self.adjustOrientation()
+			elif opcode == OP_TURN:
+				# near an edge every turn but the last is undone by adjustOrientation
+				self.turt.right(parameter if corrected else parameter * count)
+			elif opcode == OP_COLOR:
+				self.turt.color(parameter)
+			elif opcode == OP_GOTO:
+				self.goto(parameter)
+			elif opcode == OP_CALL:
+				parameter[0](parameter[1])
+	
+	'''
+	checks lettersList and starts compiling it, so it can be drawn with draw or drawSlice
+	
+	@return ready (bool), whether lettersList can be drawn
+	'''
+	def start(self):
+		
+		# lettersList was not a list!	
+		if not isinstance(self.lettersList, list):
+			print ("Letters list was not a list!")
+			return False
+			
+		# do not render drawing if list was too big, to prevent crashing
+		if self.maxLetters is not None and len(self.lettersList) > self.maxLetters:
+			print (len(self.lettersList))
+			print ("Letters list was too large")
+			return False
+		
+		self.program = []
+		self.compiler = self.compileSteps(self.startColor, self.program)
+		self.programCounter = 0
+		return True
+	
+	'''
+	compiles the next part of lettersList
+	
+	@return compiled (bool), whether all of lettersList is compiled
+	'''
+	def compileNext(self):
+		if self.compiler is None:
+			return True
+		with instrumentation.stage('compile'):
+			try:
+				next(self.compiler)
+			except StopIteration:
+				self.compiler = None
+		return self.compiler is None
 	
 	'''
 	draws the final image on the canvas
@@ -214,18 +514,72 @@ class Drawer:
 	@return None
 	'''			
 	def draw(self):
-		
-		# lettersList was not a list!	
+		if self.start():
+			while not self.compileNext():
+				pass
+			with instrumentation.stage('draw'):
+				self.run(self.program)
+			self.programCounter = len(self.program)
+	
+	'''
+	draws the next part of the image, for drawing without blocking the GUI. The 
+		letters are compiled a part at a time, each part drawn once it is compiled. The
+		time is checked every SLICE_OPCODES opcodes and after every part compiled, so a
+		slice may run a little over.
+	
+	@param seconds (float), time to spend drawing
+	@return finished (bool), whether the whole image has been drawn
+	'''
+	def drawSlice(self, seconds):
+		deadline = time.time() + seconds
+		while True:
+			compiled = self.compileNext()
+			with instrumentation.stage('draw'):
+				while self.programCounter < len(self.program):
+					end = self.programCounter + SLICE_OPCODES
+					self.run(self.program[self.programCounter:end])
+					self.programCounter = min(end, len(self.program))
+					if time.time() >= deadline:
+						break
+			if time.time() >= deadline or (compiled and self.programCounter >= len(self.program)):
+				break
+		return compiled and self.programCounter >= len(self.program)
+	
+	'''
+	makes lettersList continue an earlier drawing instead of starting a new one. The
+		turtle must already be where the earlier drawing left it (see PenTurtle.getState).
+	
+	@param state (dict), the earlier drawing's drawingState
+	@return None
+	'''
+	def resume(self, state):
+		self.closenessFactor = state['closenessFactor']
+		self.allowedBefore = state['allowedCount']
+		self.startColor = state['color']
+		self.turt.color(self.startColor)
+	
+	'''
+	@return state (dict), what resume needs to continue this drawing once it is drawn
+	'''
+	def drawingState(self):
+		return {'closenessFactor': self.closenessFactor,
+			'allowedCount': self.allowedBefore + len(self.allowedText()),
+			'color': self._color}
+	
+	''' @OldVersion
+	def draw(self):
+
+		# lettersList was not a list!
 		if not isinstance(self.lettersList, list):
 			print ("Letters list was not a list!")
 			return
-			
+
 		# do not render drawing if list was too big, to prevent crashing
 		if len(self.lettersList) > 10000:
 			print (len(self.lettersList))
 			print ("Letters list was too large")
 			return
-		
+
 		counter = 0
 		
 		# loop through list of file's representative chars
@@ -249,93 +603,103 @@ class Drawer:
 			if counter % len(self.lettersList) // 2 == 0 and counter != 0:
 				self.closenessFactor = max(0.01, self.closenessFactor - 0.01)
 			counter += 1
+	'''
+
+
+'''
+The Drawer test cases, TC12 to TC21 of the test plan.
+
+@param newDrawer (function), makes a test Drawer from a letters list; the object input
+	is one of its Drawers
+@return cases (list), (name, description, lettersList) tuples
+'''
+def testCases(newDrawer):
+	return [
+		#TC12 empty letters array input
+		('TC12', "Empty character list input", []),
+		#TC13 array of non-alphabetic chars < 10,000
+		('TC13', "array of non-alphabetic chars < 10,000:", [2] * 8000),
+		#TC14 array of non-alphabetic chars > 10,000
+		('TC14', "array of non-alphabetic chars > 10,000:", [2] * 13000),
+		#TC15 array of alphabetic chars < 10,000
+		('TC15', "array of alphabetic chars < 10,000:", ['t', 'a', 'p', 'e'] * 50),
+		#TC16 array of alphabetic chars > 10,000
+		('TC16', "array of alphabetic chars > 10,000:", ['t', 'a', 'p', 'e'] * 6000),
+		#TC17 accidentally receives boolean instead of lettersList
+		('TC17', "boolean input:", True),
+		#TC18 accidentally receives integer instead of lettersList
+		('TC18', "integer input:", 50),
+		#TC19 accidentally receives String instead of lettersList
+		('TC19', "string input:", 'test'),
+		#TC20 accidentally receives object instead of lettersList
+		('TC20', "object input:", newDrawer([])),
+		#TC21 accidentally receives Float instead of lettersList
+		('TC21', "float input:", 3.14159),
+	]
+
+
+'''
+Makes a Drawer for the test cases.
+
+@param lettersList (list), the test case's input
+@param turt (RecordingTurtle), turtle to draw on, or None for a turtle window
+@return drawer (Drawer)
+'''
+def testDrawer(lettersList, turt = None):
+	return Drawer(lettersList = lettersList, turt = turt, windowWidth = 100, windowHeight = 100, closenessFactor = 0.1, testClass = turt is None)
+
+
+'''
+@param name (string), name of a test case, e.g. 'TC12'
+@return filename (string), the golden recording of the test case, in the golden directory
+'''
+def goldenFile(name):
+	import os
+	return os.path.join(os.path.dirname(os.path.abspath(__file__)), 'golden', name + '.json')
 
 
 '''
-Test Drawer functionality
+Test Drawer functionality. With --headless the tests draw on a RecordingTurtle instead
+	of a window and are compared with their golden recordings instead of waiting for
+	a key; --record writes the golden recordings again.
+
+@param argv (list), command line arguments, defaults to sys.argv[1:]
+@return status (int), 1 if a headless drawing differs from its golden recording, else 0
 '''
-def main():
-	
-	#TC12 empty letters array input
-	print ("Empty character list input")
-	d = Drawer(lettersList = [], turt = None, windowWidth = 100, windowHeight = 100, closenessFactor = 0.1, testClass = True)
-	d.draw()
-	input('Wait for keyboard response to move on:\n')
-	turtle.clear()
-	
-	#TC13 array of non-alphabetic chars < 10,000
-	print ("array of non-alphabetic chars < 10,000:")
-	lettersList = [2] * 8000
-	d = Drawer(lettersList = lettersList, turt = None, windowWidth = 100, windowHeight = 100, closenessFactor = 0.1, testClass = True)
-	d.draw()
-	input('Wait for keyboard response to move on:\n')
-	turtle.clear()
-	
-	#TC14 array of non-alphabetic chars > 10,000
-	print ("array of non-alphabetic chars > 10,000:")
-	lettersList = [2] * 13000
-	d = Drawer(lettersList = lettersList, turt = None, windowWidth = 100, windowHeight = 100, closenessFactor = 0.1, testClass = True)
-	d.draw()
-	input('Wait for keyboard response to move on:\n')
-	turtle.clear()
-	
-	#TC15 array of alphabetic chars < 10,000
-	print ("array of alphabetic chars < 10,000:")
-	lettersList = ['t', 'a', 'p', 'e'] * 50
-	d = Drawer(lettersList = lettersList, turt = None, windowWidth = 100, windowHeight = 100, closenessFactor = 0.1, testClass = True)
-	d.draw()
-	input('Wait for keyboard response to move on:\n')
-	turtle.clear()
-	
-	#TC16 array of alphabetic chars > 10,000
-	print ("array of alphabetic chars > 10,000:")
-	lettersList = ['t', 'a', 'p', 'e'] * 6000
-	d = Drawer(lettersList = lettersList, turt = None, windowWidth = 100, windowHeight = 100, closenessFactor = 0.1, testClass = True)
-	d.draw()
-	input('Wait for keyboard response to move on:\n')
-	turtle.clear()
-	
-	#TC17 accidentally receives boolean instead of lettersList
-	print ("boolean input:")
-	lettersList = True
-	d = Drawer(lettersList = lettersList, turt = None, windowWidth = 100, windowHeight = 100, closenessFactor = 0.1, testClass = True)
-	d.draw()
-	input('Wait for keyboard response to move on:\n')
-	turtle.clear()
-	
-	#TC18 accidentally receives integer instead of lettersList
-	print ("integer input:")
-	lettersList = 50
-	d = Drawer(lettersList = lettersList, turt = None, windowWidth = 100, windowHeight = 100, closenessFactor = 0.1, testClass = True)
-	d.draw()
-	input('Wait for keyboard response to move on:\n')
-	turtle.clear()
-	
-	#TC19 accidentally receives String instead of lettersList
-	print ("string input:")
-	lettersList = 'test'
-	d = Drawer(lettersList = lettersList, turt = None, windowWidth = 100, windowHeight = 100, closenessFactor = 0.1, testClass = True)
-	d.draw()
-	input('Wait for keyboard response to move on:\n')
-	turtle.clear()
-	
-	#TC20 accidentally receives object instead of lettersList
-	print ("object input:")
-	lettersList = Drawer(lettersList = [], turt = None, windowWidth = 100, windowHeight = 100, closenessFactor = 0.1, testClass = True)
-	d = Drawer(lettersList = lettersList, turt = None, windowWidth = 100, windowHeight = 100, closenessFactor = 0.1, testClass = True)
-	d.draw()
-	input('Wait for keyboard response to move on:\n')
-	turtle.clear()
-	
-	#TC21 accidentally receives Float instead of lettersList
-	print ("float input:")
-	lettersList = 3.14159
-	d = Drawer(lettersList = lettersList, turt = None, windowWidth = 100, windowHeight = 100, closenessFactor = 0.1, testClass = True)
-	d.draw()
-	input('Wait for keyboard response to move on:\n')  
-	turtle.clear()         
+def main(argv = None):
+	import sys
+	argv = sys.argv[1:] if argv is None else argv
+	headless = '--headless' in argv or '--record' in argv
+	if headless:
+		import RecordingTurtle as recordingturtle
+	else:
+		import turtle
+	
+	def newDrawer(lettersList):
+		return testDrawer(lettersList, recordingturtle.RecordingTurtle() if headless else None)
+	
+	status = 0
+	for name, description, lettersList in testCases(newDrawer):
+		print (description)
+		d = newDrawer(lettersList)
+		d.draw()
+		if not headless:
+			input('Wait for keyboard response to move on:\n')
+			turtle.clear()
+			continue
+		
+		print ("%d turtle calls, digest %s" % (len(d.turt), d.turt.digest()))
+		if '--record' in argv:
+			d.turt.save(goldenFile(name))
+			continue
+		mismatch = d.turt.compare(goldenFile(name))
+		if mismatch is not None:
+			print ("%s differs from its golden recording at call %d" % (name, mismatch))
+			status = 1
+	return status
 
 if __name__ == '__main__':
-	main()
+	import sys
+	sys.exit(main())
 
 
@@ -0,0 +1,261 @@
+##
+# Exporter classes which stream a drawing straight to an image file. A PenTurtle passes
+#	every line it draws to an exporter, which joins lines of the same color into
+#	polylines and writes each polyline out as soon as it ends.
+#
+# Adam Carlson
+# 10/18/2026
+#
+##
+
+# our custom classes
+import Drawer as drawer
+import PenTurtle as penturtle
+import Simplify as simplify
+
+""" CONSTANTS """
+
+# colors that are not given as '#RRGGBB'
+NAMED_COLORS = {'black': (0, 0, 0), 'white': (255, 255, 255)}
+
+class PolylineSink:
+	""" PolylineSink base class for Text-to-Art Interpreter.
+
+	Pen sink which collects consecutive lines of one color into a polyline and hands
+	finished polylines to writePolyline, which subclasses implement. Only the current
+	polyline is held in memory. With a tolerance, every polyline is simplified first
+	(see Simplify.py).
+	"""
+
+	"""
+	Attributes:
+		maxPoints: longest polyline written in one piece
+		tolerance: largest distance a written polyline may stray from the pen's path,
+			or None to write every line
+		segments: number of lines drawn so far
+		written: number of lines written so far
+	"""
+
+	'''
+	Initializes the PolylineSink object.
+
+	@param maxPoints (int), longest polyline written in one piece, or None for no limit
+	@param tolerance (float), largest distance a written polyline may stray from the pen's
+		path, such as simplify.DEFAULT_TOLERANCE, or None to write every line
+	'''
+	def __init__(self, maxPoints = None, tolerance = None):
+		self.maxPoints = maxPoints
+		self.tolerance = tolerance
+		self.segments = 0
+		self.written = 0
+		self._color = None
+		self._points = []
+
+	'''
+	adds one line drawn by the pen
+
+	@param start (tuple), x and y coordinates where the line starts
+	@param end (tuple), x and y coordinates where the line ends
+	@param color (string), pen color
+	@return None
+	'''
+	def lineTo(self, start, end, color):
+		self.segments += 1
+		if color != self._color or not self._points or self._points[-1] != start:
+			self.flush()
+			self._color = color
+			self._points = [start]
+		self._points.append(end)
+		if self.maxPoints and len(self._points) >= self.maxPoints:
+			# keep the last point so the next piece joins up
+			self.flush()
+			self._points = [end]
+
+	'''
+	adds a circle drawn by the pen, as the same polygon turtle draws
+
+	@param center (tuple), x and y coordinates of the center
+	@param radius (float), circle radius
+	@param points (list), corners of the polygon, from the pen's start position around back to it
+	@param color (string), pen color
+	@return None
+	'''
+	def circle(self, center, radius, points, color):
+		for i in range(1, len(points)):
+			self.lineTo(points[i - 1], points[i], color)
+
+	'''
+	writes out the current polyline, if any
+
+	@return None
+	'''
+	def flush(self):
+		if len(self._points) > 1:
+			points = self._points
+			if self.tolerance is not None:
+				points = simplify.simplify(points, self.tolerance)
+			self.written += len(points) - 1
+			self.writePolyline(self._color, points)
+		self._points = []
+
+	def writePolyline(self, color, points):
+		raise NotImplementedError
+
+
+class Exporter(PolylineSink):
+	""" Exporter base class for Text-to-Art Interpreter.
+
+	Writes the polylines of a drawing to an image file as they are finished.
+	"""
+
+	"""
+	Attributes:
+		file: the open output file
+		ownsFile: whether the Exporter opened the file, and closes it
+		width: image width in pixels
+		height: image height in pixels
+	"""
+
+	'''
+	Initializes the Exporter object and writes the file header.
+
+	@param filename (string), name of the image file to write, or an open text file
+		which is written to and left open
+	@param width (int), image width in pixels
+	@param height (int), image height in pixels
+	@param maxPoints (int), longest polyline written in one piece, or None for no limit
+	@param tolerance (float), largest distance in pixels a polyline may be simplified by, or None
+	'''
+	def __init__(self, filename, width, height, maxPoints = None, tolerance = None):
+		PolylineSink.__init__(self, maxPoints, tolerance)
+		self.ownsFile = not hasattr(filename, 'write')
+		self.file = open(filename, 'w') if self.ownsFile else filename
+		self.width = width
+		self.height = height
+		self.writeHeader()
+
+	'''
+	finishes the image and closes the file, if the Exporter opened it
+
+	@return None
+	'''
+	def close(self):
+		self.flush()
+		self.writeFooter()
+		if self.ownsFile:
+			self.file.close()
+
+	def writeHeader(self):
+		raise NotImplementedError
+
+	def writeFooter(self):
+		raise NotImplementedError
+
+
+class SVGExporter(Exporter):
+	""" Writes a drawing as an SVG image. The turtle's origin is the middle of the image. """
+
+	'''
+	Initializes the SVGExporter object.
+
+	@param position (tuple), x and y of the image's top left corner when it is placed
+		inside another SVG image, such as a Mosaic panel, or None for a standalone image
+	'''
+	def __init__(self, filename, width, height, maxPoints = None, position = None, tolerance = None):
+		self.position = position
+		Exporter.__init__(self, filename, width, height, maxPoints, tolerance)
+
+	def writeHeader(self):
+		width, height = self.width, self.height
+		placement = ''
+		if self.position is not None:
+			placement = ' x="%g" y="%g"' % self.position
+		self.file.write('<svg xmlns="http://www.w3.org/2000/svg"%s width="%d" height="%d" viewBox="%g %g %d %d">\n'
+			% (placement, width, height, -width / 2.0, -height / 2.0, width, height))
+		self.file.write('<rect x="%g" y="%g" width="%d" height="%d" fill="white"/>\n' % (-width / 2.0, -height / 2.0, width, height))
+		# turtle's y-axis points up, SVG's points down
+		self.file.write('<g fill="none" stroke-width="1" stroke-linecap="round" stroke-linejoin="round" transform="scale(1,-1)">\n')
+
+	def writePolyline(self, color, points):
+		self.file.write('<polyline stroke="%s" points="%s"/>\n' % (color, ' '.join('%.2f,%.2f' % point for point in points)))
+
+	def writeFooter(self):
+		self.file.write('</g>\n</svg>\n')
+
+
+class EPSExporter(Exporter):
+	""" Writes a drawing as an Encapsulated PostScript image. The turtle's origin is the middle of the image. """
+
+	'''
+	Initializes the EPSExporter object. PostScript interpreters limit the length of a path,
+		so long polylines are written in pieces.
+	'''
+	def __init__(self, filename, width, height, maxPoints = 1000, tolerance = None):
+		Exporter.__init__(self, filename, width, height, maxPoints, tolerance)
+
+	def writeHeader(self):
+		self.file.write('%!PS-Adobe-3.0 EPSF-3.0\n')
+		self.file.write('%%%%BoundingBox: 0 0 %d %d\n' % (self.width, self.height))
+		self.file.write('%%Creator: Text-to-Art Interpreter\n%%EndComments\n')
+		self.file.write('/m {moveto} bind def /l {lineto} bind def\n')
+		self.file.write('1 1 1 setrgbcolor 0 0 %d %d rectfill\n' % (self.width, self.height))
+		# PostScript's y-axis points up like turtle's
+		self.file.write('%g %g translate 1 setlinewidth 1 setlinecap 1 setlinejoin\n' % (self.width / 2.0, self.height / 2.0))
+
+	def writePolyline(self, color, points):
+		red, green, blue = colorToRGB(color)
+		self.file.write('%.4g %.4g %.4g setrgbcolor newpath %.2f %.2f m\n' % ((red / 255.0, green / 255.0, blue / 255.0) + points[0]))
+		self.file.write(' '.join('%.2f %.2f l' % point for point in points[1:]))
+		self.file.write(' stroke\n')
+
+	def writeFooter(self):
+		self.file.write('showpage\n%%EOF\n')
+
+
+'''
+Converts a turtle color to red, green and blue values.
+
+@param color (string), '#RRGGBB' or a name in NAMED_COLORS
+@return (red, green, blue) (tuple), values between 0 and 255
+'''
+def colorToRGB(color):
+	if color.startswith('#') and len(color) == 7:
+		return (int(color[1:3], 16), int(color[3:5], 16), int(color[5:7], 16))
+	return NAMED_COLORS.get(color, (0, 0, 0))
+
+'''
+Creates the exporter for a file name, chosen by its extension.
+
+@param filename (string), name ending in .svg or .eps
+@param width (int), image width in pixels
+@param height (int), image height in pixels
+@param tolerance (float), largest distance in pixels a polyline may be simplified by, or None
+@return exporter (Exporter), the SVGExporter or EPSExporter writing to filename
+'''
+def createExporter(filename, width, height, tolerance = None):
+	if filename.lower().endswith('.eps'):
+		return EPSExporter(filename, width, height, tolerance = tolerance)
+	if filename.lower().endswith('.svg'):
+		return SVGExporter(filename, width, height, tolerance = tolerance)
+	raise ValueError("Unsupported image format: %s" % filename)
+
+'''
+Draws a list of characters straight to an image file, with the same pen path the GUI draws.
+
+@param lettersList (list), file's representative letters
+@param filename (string), name of the .svg or .eps file to write
+@param width (int), image width in pixels
+@param height (int), image height in pixels
+@param drawWidth (int), width given to the Drawer, like DisplayApp.createDrawing
+@param drawHeight (int), height given to the Drawer, like DisplayApp.createDrawing
+@param tolerance (float), largest distance in pixels a polyline may be simplified by, or None
+@return (segments, written) (tuple), number of lines drawn and number of lines written
+'''
+def exportDrawing(lettersList, filename, width, height, drawWidth, drawHeight, tolerance = None):
+	exporter = createExporter(filename, width, height, tolerance)
+	try:
+		pen = penturtle.PenTurtle(exporter)
+		drawer.Drawer(lettersList, pen, drawWidth, drawHeight).draw()
+	finally:
+		exporter.close()
+	return exporter.segments, exporter.written
@@ -0,0 +1,218 @@
+##
+# IncrementalTracker class which follows text files that keep growing, such as logs.
+#	For every followed file it remembers how far the file has been parsed and where the
+#	pen stopped, so a refresh parses only the bytes added since, adds their sample to
+#	the stored drawing and draws just the new part, without redrawing the rest.
+#
+# Lawrence Dickey
+# 10/18/2026
+#
+##
+
+# library dependencies
+import hashlib
+import io
+import json
+import os
+
+# our custom classes
+import Drawer as drawer
+import Parser as parser
+import PenTurtle as penturtle
+
+""" CONSTANTS """
+
+# file the state of the followed files is kept in
+INCREMENTAL_FILE = 'incremental.json'
+
+# number of bytes at the start of a followed file used to tell whether it was replaced
+HEAD_BYTES = 4096
+
+class IncrementalTracker:
+	""" IncrementalTracker class for Text-to-Art Interpreter.
+
+	A followed file is sampled with the stride chosen when it was first opened (see
+	Parser.IncrementalParser), so its sample keeps growing with the file instead of
+	being chosen again from the whole file; the work of a refresh depends only on the
+	number of bytes added. A file which shrank or whose first bytes changed has been
+	replaced, and is opened again as a new drawing.
+
+	Parsing (parse) only reads the state, so it can run on a ParseWorker thread;
+	apply updates the storage, the pen and the state file, on the GUI thread.
+	"""
+
+	"""
+	Attributes:
+		storage: drawing storage the followed files' drawings are kept in
+		stateFileName: JSON file the state of the followed files is kept in
+		width: width the drawings are drawn in, like the GUI's
+		height: height the drawings are drawn in
+		sampleSize: sample size the stride of a newly followed file is chosen for
+		files: state of every followed file by absolute path: its drawing number, byte
+			offset, number of characters, stride, first bytes, pen state and drawer state
+	"""
+
+	'''
+	Initializes the IncrementalTracker object, reading the state file if there is one.
+
+	@param storage (DataStorage), storage the drawings are kept in, see DataStorage.openStorage
+	@param stateFileName (string), JSON file the state of the followed files is kept in
+	@param width (int), width the drawings are drawn in
+	@param height (int), height the drawings are drawn in
+	@param sampleSize (int), sample size the stride of a newly followed file is chosen for
+	'''
+	def __init__(self, storage, stateFileName = INCREMENTAL_FILE, width = drawer.CANVAS_WIDTH - drawer.REDUCED_WIDTH,
+			height = drawer.CANVAS_HEIGHT - drawer.REDUCED_HEIGHT, sampleSize = parser.SAMPLE_THRESHOLD):
+		self.storage = storage
+		self.stateFileName = stateFileName
+		self.width = width
+		self.height = height
+		self.sampleSize = sampleSize
+		self.files = {}
+		if os.path.exists(stateFileName):
+			with io.open(stateFileName, 'r', encoding = 'utf-8') as file:
+				self.files = json.load(file)
+
+	'''
+	@param filename (string), a text file
+	@return followed (bool), whether the file is followed
+	'''
+	def isFollowed(self, filename):
+		return os.path.abspath(filename) in self.files
+
+	'''
+	@param filename (string), a text file
+	@return number (int), number of the followed file's drawing, or None if it is not followed
+	'''
+	def findDrawing(self, filename):
+		entry = self.files.get(os.path.abspath(filename))
+		return None if entry is None else entry['number']
+
+	'''
+	@param number (int), number of a drawing
+	@return filename (string), the followed file drawn as that drawing, or None
+	'''
+	def findFile(self, number):
+		for filename, entry in self.files.items():
+			if entry['number'] == number:
+				return filename
+		return None
+
+	'''
+	Parses the part of a file added since it was last parsed, or all of it if it is not
+		followed yet or was replaced. Does not change any state.
+
+	@param filename (string), a text file
+	@param progress (function), called as progress(bytes read, bytes to read) after every chunk
+	@return fileParser (IncrementalParser), the parser, with the new characters
+	'''
+	def parse(self, filename, progress = None):
+		entry = self.files.get(os.path.abspath(filename))
+		if entry is None or self.wasReplaced(filename, entry):
+			return parser.IncrementalParser(filename, sampleSize = self.sampleSize, progress = progress)
+		return parser.IncrementalParser(filename, entry['offset'], entry['position'], entry['stride'],
+			sampleSize = self.sampleSize, progress = progress)
+
+	'''
+	@param filename (string), a followed text file
+	@param entry (dict), its state
+	@return replaced (bool), whether the file shrank or its first bytes changed
+	'''
+	def wasReplaced(self, filename, entry):
+		if os.path.getsize(filename) < entry['offset']:
+			return True
+		return self.headHash(filename, entry['headLength']) != entry['headHash']
+
+	'''
+	@param filename (string), a text file
+	@param length (int), number of bytes hashed
+	@return digest (string), SHA-1 of the first length bytes of the file, in hexadecimal
+	'''
+	def headHash(self, filename, length):
+		with open(filename, 'rb') as file:
+			return hashlib.sha1(file.read(length)).hexdigest()
+
+	'''
+	Stores what parse found and draws it. A new or replaced file is saved as a new
+		drawing, drawn without a turtle just to find where the pen stops; the new characters
+		of a followed file are added to its drawing and drawn from where the pen stopped.
+		Once a drawing has more than twice sampleSize characters, every second one is
+		dropped and the stride doubled, so the sample of a file which started small stays
+		small; the drawing then has to be drawn again.
+
+	@param filename (string), the text file parsed
+	@param fileParser (IncrementalParser), parser returned by parse
+	@param turt (PenTurtle), pen to draw the new characters of a followed file with,
+		such as the GUI's, or None to only find where the pen stops
+	@return (number, characters, change) (tuple), the drawing number, the characters drawn,
+		and what happened to the drawing: 'new', 'extended' or 'resampled'
+	'''
+	def apply(self, filename, fileParser, turt = None):
+		path = os.path.abspath(filename)
+		characters = fileParser.get_characters_list()
+		stride = fileParser.stride
+		entry = self.files.get(path)
+		if entry is None or fileParser.startOffset == 0:
+			change = 'new'
+			number = self.storage.saveData(characters, os.path.basename(filename))
+			headLength = min(HEAD_BYTES, fileParser.offset)
+			entry = {'number': number, 'headLength': headLength, 'headHash': self.headHash(filename, headLength),
+				'pen': None, 'drawer': None}
+		elif (fileParser.file_length + stride - 1) // stride > 2 * self.sampleSize:
+			change = 'resampled'
+			# the sample holds the characters at multiples of stride, so every second
+			# one is the sample with twice the stride
+			characters = self.storage.loadDrawing(entry['number']) + characters
+			while len(characters) > 2 * self.sampleSize:
+				characters = characters[::2]
+				stride *= 2
+			self.storage.replaceDrawing(entry['number'], characters)
+			entry['pen'] = None
+		else:
+			change = 'extended'
+			if characters:
+				self.storage.extendDrawing(entry['number'], characters)
+
+		if characters or change != 'extended':
+			if change != 'extended' or turt is None:
+				turt = penturtle.PenTurtle()
+			drawing = drawer.Drawer(characters, turt, self.width, self.height, maxLetters = None)
+			if entry['pen'] is not None:
+				turt.setState(entry['pen'])
+				drawing.resume(entry['drawer'])
+			drawing.draw()
+			entry['pen'] = turt.getState()
+			entry['drawer'] = drawing.drawingState()
+
+		# a file first followed while shorter than HEAD_BYTES has its head hashed again as
+		# it grows, so a rewritten file keeping its first few bytes is still noticed
+		if entry['headLength'] < HEAD_BYTES and fileParser.offset > entry['headLength']:
+			entry['headLength'] = min(HEAD_BYTES, fileParser.offset)
+			entry['headHash'] = self.headHash(filename, entry['headLength'])
+		entry['offset'] = fileParser.offset
+		entry['position'] = fileParser.file_length
+		entry['stride'] = stride
+		self.files[path] = entry
+		self.save()
+		return entry['number'], characters, change
+
+	'''
+	stops following a file; its drawing is kept
+
+	@param filename (string), a followed text file
+	@return None
+	'''
+	def forget(self, filename):
+		self.files.pop(os.path.abspath(filename), None)
+		self.save()
+
+	'''
+	writes the state file, under another name first so a crash leaves the old one in place
+
+	@return None
+	'''
+	def save(self):
+		temporary = self.stateFileName + '.tmp'
+		with io.open(temporary, 'w', encoding = 'utf-8') as file:
+			file.write(u'%s' % json.dumps(self.files, indent = 1, sort_keys = True))
+		getattr(os, 'replace', os.rename)(temporary, self.stateFileName)
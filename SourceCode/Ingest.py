@@ -0,0 +1,118 @@
+##
+# Ingest: command line tool which adds many text files to the Previous Drawings at once.
+#	The files are parsed in a pool of worker processes while the main process saves their
+#	samples in batches, each a single group commit (see DataStorage.saveMany), so the
+#	storage is synced to disk once per batch instead of once per file.
+#
+# Usage: python Ingest.py [--storage index|sqlite] [-j JOBS] [--batch N] INPUT [INPUT ...]
+#	where each INPUT is a .txt file (or .txt.gz, .txt.bz2, .txt.xz), a directory or a glob pattern
+#
+# Adam Carlson
+# 10/18/2026
+#
+##
+
+# library dependencies
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+
+# our custom classes
+import BatchRender as batch
+import DataStorage as storage
+import Parser as parser
+
+""" CONSTANTS """
+
+# number of drawings saved in one group commit
+BATCH_SIZE = 1000
+
+'''
+Parses one text file. Runs in a worker process.
+
+@param filename (string), the text file
+@return (filename, characters, error) (tuple), the file's sample, or None and an error
+	message if it could not be parsed
+'''
+def parseFile(filename):
+	try:
+		if filename.endswith('.txt'):
+			fileParser = parser.MappedParser(filename)
+		else:
+			# compressed files are decompressed as they are read
+			fileParser = parser.StreamingParser(filename)
+		return filename, fileParser.get_characters_list(), None
+	except Exception as error:
+		return filename, None, '%s: %s' % (type(error).__name__, error)
+
+'''
+Parses text files in a process pool and saves them to a storage in batches. The pool
+	keeps parsing while a batch is written, so the storage only slows ingesting down
+	when it cannot keep up with the parsing.
+
+@param history (DataStorage), storage the drawings are saved to, see DataStorage.openStorage
+@param filenames (list), text files to add, in the order they are saved
+@param processes (int), number of worker processes, defaults to one per core
+@param batchSize (int), number of drawings saved in one group commit
+@return (saved, failed) (tuple), number of drawings saved and (filename, error) tuples
+	of the files which could not be parsed
+'''
+def ingest(history, filenames, processes = None, batchSize = BATCH_SIZE):
+	processes = processes or multiprocessing.cpu_count()
+	# hand out work in batches so tens of thousands of small files don't cost one message each
+	chunksize = max(1, min(64, len(filenames) // (processes * 8)))
+	saved = 0
+	failed = []
+	drawings = []
+	pool = multiprocessing.Pool(processes)
+	try:
+		for filename, characters, error in pool.imap(parseFile, filenames, chunksize):
+			if error is not None:
+				failed.append((filename, error))
+				continue
+			drawings.append((os.path.basename(filename), characters))
+			if len(drawings) >= batchSize:
+				saved += len(history.saveMany(drawings))
+				drawings = []
+		if drawings:
+			saved += len(history.saveMany(drawings))
+	finally:
+		pool.close()
+		pool.join()
+	return saved, failed
+
+'''
+Command line entry point.
+
+@param argv (list), command line arguments, defaults to sys.argv[1:]
+@return exit status (int), 1 if any file failed, else 0
+'''
+def main(argv = None):
+	argParser = argparse.ArgumentParser(description = 'Add many text files to the Previous Drawings.')
+	argParser.add_argument('inputs', nargs = '+', help = '.txt (.txt.gz, .txt.bz2, .txt.xz) files, directories or glob patterns')
+	argParser.add_argument('--storage', choices = ['index', 'sqlite'], default = 'index',
+		help = 'where past drawings are kept')
+	argParser.add_argument('-j', '--jobs', type = int, default = None, help = 'number of worker processes (default: all cores)')
+	argParser.add_argument('--batch', type = int, default = BATCH_SIZE, help = 'drawings saved in one group commit')
+	args = argParser.parse_args(argv)
+
+	filenames = list(batch.findTextFiles(args.inputs))
+	if not filenames:
+		print ("No text files found")
+		return 1
+
+	start = time.time()
+	history = storage.openStorage(args.storage)
+	saved, failed = ingest(history, filenames, args.jobs, max(1, args.batch))
+	elapsed = max(time.time() - start, 1e-9)
+
+	for filename, error in failed:
+		print ("Failed: %s (%s)" % (filename, error))
+	print ("Saved %d drawings (%d failed) in %.2f s: %.1f files/s"
+		% (saved, len(failed), elapsed, len(filenames) / elapsed))
+	return 1 if failed else 0
+
+if __name__ == '__main__':
+	sys.exit(main())
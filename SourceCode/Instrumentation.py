@@ -0,0 +1,331 @@
+##
+# Instrumentation: optional timers and counters which show where the time of a
+# drawing goes. Stages such as parsing, sampling, drawing, saving and screen updates
+# are timed, the turtle operations of a drawing are counted by type, and memory can
+# be traced with tracemalloc.
+#
+# Everything is off until enable() is called. While disabled, stage() returns a
+# shared context manager which does nothing and no turtle calls are counted, so the
+# instrumented code runs as before.
+#
+# Usage:
+#	import Instrumentation as instrumentation
+#	instrumentation.enable(memory = True)
+#	with instrumentation.stage('parse'):
+#		...
+#	instrumentation.dump('instrumentation.json')
+#
+# Adam Carlson
+# 10/18/2026
+#
+##
+
+# library dependencies
+import json
+import threading
+import time
+
+""" CONSTANTS """
+
+# number of allocation sites kept per tracemalloc snapshot
+SNAPSHOT_LINES = 10
+
+# whether instrumentation is on; read by the instrumented code before doing any work
+enabled = False
+
+# whether stage peaks and snapshots of memory are taken
+tracingMemory = False
+
+# name: [calls, seconds, peak bytes] of every stage
+stages = {}
+
+# name: count of every counter
+counters = {}
+
+# tracemalloc snapshots, see snapshot
+snapshots = []
+
+# stages being timed by each thread, innermost last, in openStages.stages; stages
+# opened on the parse thread (see ParseWorker.py) are not nested in the GUI's
+openStages = threading.local()
+
+# guards the totals in stages, which stages ending on any thread add to
+stagesLock = threading.Lock()
+
+# functions called as hook(kind, name, value) when a stage ends or a snapshot is taken
+hooks = []
+
+
+class NullStage:
+	""" Context manager used for stages while instrumentation is off. """
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, excType, excValue, traceback):
+		return False
+
+NULL_STAGE = NullStage()
+
+
+class Stage:
+	""" Context manager which times one run of a stage and adds it to the stage's totals.
+
+	Memory peaks are only taken for stages of the main thread: tracemalloc has a single
+	peak for the whole process, and resetting it for a stage of another thread would
+	lose the peak of a main thread stage still running.
+
+	Attributes:
+		name: name of the stage
+		start: time the stage was entered
+		peak: highest memory use of the stage so far, while memory is traced
+		tracing: whether the stage takes memory peaks
+	"""
+
+	def __init__(self, name):
+		self.name = name
+		self.start = None
+		self.peak = 0
+		self.tracing = False
+
+	def __enter__(self):
+		opened = threadStages()
+		self.tracing = tracingMemory and threading.current_thread() is threading.main_thread()
+		if self.tracing:
+			# tracemalloc has a single peak; the enclosing stage keeps what it had seen
+			import tracemalloc
+			if opened:
+				opened[-1].peak = max(opened[-1].peak, tracemalloc.get_traced_memory()[1])
+			tracemalloc.reset_peak()
+		opened.append(self)
+		self.start = time.perf_counter()
+		return self
+
+	def __exit__(self, excType, excValue, traceback):
+		seconds = time.perf_counter() - self.start
+		opened = threadStages()
+		opened.remove(self)
+		if self.tracing:
+			import tracemalloc
+			self.peak = max(self.peak, tracemalloc.get_traced_memory()[1])
+			if opened:
+				opened[-1].peak = max(opened[-1].peak, self.peak)
+		with stagesLock:
+			totals = stages.setdefault(self.name, [0, 0.0, 0])
+			totals[0] += 1
+			totals[1] += seconds
+			totals[2] = max(totals[2], self.peak)
+		for hook in hooks:
+			hook('stage', self.name, seconds)
+		return False
+
+
+class CountingTurtle:
+	""" Turtle stand-in which counts the calls made to a turtle by type and passes them on.
+
+	Other methods, such as pos and heading, go straight to the turtle.
+
+	Attributes:
+		turtle: the turtle which draws
+	"""
+
+	def __init__(self, turtle):
+		self.turtle = turtle
+
+	def __getattr__(self, name):
+		return getattr(self.turtle, name)
+
+	def forward(self, distance):
+		count('forward')
+		self.turtle.forward(distance)
+
+	def right(self, angle):
+		count('turn')
+		self.turtle.right(angle)
+
+	def left(self, angle):
+		count('turn')
+		self.turtle.left(angle)
+
+	def color(self, *args):
+		count('color')
+		return self.turtle.color(*args)
+
+	def circle(self, radius):
+		count('circle')
+		self.turtle.circle(radius)
+
+	def goto(self, x, y = None):
+		count('goto')
+		self.turtle.goto(x, y)
+
+	def setheading(self, toAngle):
+		count('setheading')
+		self.turtle.setheading(toAngle)
+
+
+'''
+@return stages (list), the stages being timed by the current thread, innermost last
+'''
+def threadStages():
+	opened = getattr(openStages, 'stages', None)
+	if opened is None:
+		opened = openStages.stages = []
+	return opened
+
+'''
+Turns instrumentation on.
+
+@param memory (bool), whether to trace memory with tracemalloc, which slows the program down
+@return None
+'''
+def enable(memory = False):
+	global enabled, tracingMemory
+	enabled = True
+	if memory and not tracingMemory:
+		import tracemalloc
+		tracemalloc.start()
+		tracingMemory = True
+
+'''
+Turns instrumentation off. What was recorded is kept until reset.
+
+@return None
+'''
+def disable():
+	global enabled, tracingMemory
+	enabled = False
+	if tracingMemory:
+		import tracemalloc
+		tracemalloc.stop()
+		tracingMemory = False
+
+'''
+forgets everything recorded so far
+
+@return None
+'''
+def reset():
+	stages.clear()
+	counters.clear()
+	del snapshots[:]
+
+'''
+Times a stage.
+
+@param name (string), name of the stage, such as 'parse' or 'draw'
+@return a context manager timing the code run inside it
+'''
+def stage(name):
+	if not enabled:
+		return NULL_STAGE
+	return Stage(name)
+
+'''
+Wraps a function so every call is timed as a stage. Only wrap while enabled, since
+	the wrapper is not free.
+
+@param name (string), name of the stage
+@param function (function), function to time
+@return the wrapped function
+'''
+def timed(name, function):
+	def timedFunction(*args):
+		with Stage(name):
+			return function(*args)
+	return timedFunction
+
+'''
+Adds to a counter, if instrumentation is on.
+
+@param name (string), name of the counter
+@param amount (int), amount added
+@return None
+'''
+def count(name, amount = 1):
+	if enabled:
+		counters[name] = counters.get(name, 0) + amount
+
+'''
+Wraps a turtle so its calls are counted, if instrumentation is on.
+
+@param turtle (object), a turtle or PenTurtle
+@return the turtle, or a CountingTurtle passing calls on to it
+'''
+def countTurtle(turtle):
+	if enabled:
+		return CountingTurtle(turtle)
+	return turtle
+
+'''
+Records the places which hold the most memory, if memory is traced.
+
+@param label (string), name of the snapshot, such as 'after parse'
+@return None
+'''
+def snapshot(label):
+	if not tracingMemory:
+		return
+	import tracemalloc
+	statistics = tracemalloc.take_snapshot().statistics('lineno')[:SNAPSHOT_LINES]
+	lines = [{'line': str(statistic.traceback), 'bytes': statistic.size, 'blocks': statistic.count}
+		for statistic in statistics]
+	current, peak = tracemalloc.get_traced_memory()
+	snapshots.append({'label': label, 'currentBytes': current, 'peakBytes': peak, 'top': lines})
+	for hook in hooks:
+		hook('snapshot', label, current)
+
+'''
+Adds a function called as hook(kind, name, value) when a stage ends (kind 'stage',
+	value the seconds it took) or a snapshot is taken (kind 'snapshot', value the
+	bytes in use).
+
+@param hook (function), function to call
+@return None
+'''
+def addHook(hook):
+	hooks.append(hook)
+
+'''
+@param hook (function), function added with addHook
+@return None
+'''
+def removeHook(hook):
+	hooks.remove(hook)
+
+'''
+@return report (dict), everything recorded, in the form written by dump
+'''
+def report():
+	return {
+		'stages': dict((name, {'calls': calls, 'seconds': seconds, 'peakBytes': peak})
+			for name, (calls, seconds, peak) in stages.items()),
+		'counters': dict(counters),
+		'snapshots': list(snapshots),
+	}
+
+'''
+Adds reports made elsewhere, such as in worker processes, to what is recorded here.
+
+@param otherReport (dict), a report made by report()
+@return None
+'''
+def merge(otherReport):
+	for name, other in otherReport['stages'].items():
+		totals = stages.setdefault(name, [0, 0.0, 0])
+		totals[0] += other['calls']
+		totals[1] += other['seconds']
+		totals[2] = max(totals[2], other['peakBytes'])
+	for name, amount in otherReport['counters'].items():
+		counters[name] = counters.get(name, 0) + amount
+	snapshots.extend(otherReport['snapshots'])
+
+'''
+Writes everything recorded to a JSON file.
+
+@param filename (string), name of the file
+@return None
+'''
+def dump(filename):
+	with open(filename, 'w') as file:
+		json.dump(report(), file, indent = 1)
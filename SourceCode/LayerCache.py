@@ -0,0 +1,161 @@
+##
+# LayerCache class which keeps finished drawings on the canvas as hidden layers, so
+#	switching back to a recent drawing does not redraw it.
+#
+# Wallis Muraca
+# 10/18/2026
+#
+##
+
+# library dependency
+from collections import OrderedDict
+
+""" CONSTANTS """
+
+# default budget: number of drawings kept, and canvas items kept over all drawings
+MAX_LAYERS = 8
+MAX_ITEMS = 200000
+
+class LayerCache:
+	""" LayerCache class for Text-to-Art Interpreter.
+
+	Every cached drawing is a layer: a tag shared by all of the drawing's canvas items.
+	At most one layer is shown at a time. When the budget is exceeded the least recently
+	shown layers are deleted from the canvas.
+	"""
+
+	"""
+	Attributes:
+		canvas: the Tk canvas the drawings are on
+		maxLayers: maximum number of layers kept
+		maxItems: maximum number of canvas items kept over all layers
+		layers: layer tag, item count and kept data of each cached drawing, least recently used first
+		itemCount: number of canvas items over all layers
+		visibleKey: key of the layer being shown, or None
+	"""
+
+	'''
+	Initializes the LayerCache object.
+
+	@param canvas (tk.Canvas), canvas the drawings are on
+	@param maxLayers (int), maximum number of layers kept
+	@param maxItems (int), maximum number of canvas items kept over all layers
+	'''
+	def __init__(self, canvas, maxLayers = MAX_LAYERS, maxItems = MAX_ITEMS):
+		self.canvas = canvas
+		self.maxLayers = maxLayers
+		self.maxItems = maxItems
+		self.layers = OrderedDict()
+		self.itemCount = 0
+		self.visibleKey = None
+		self._nextTag = 0
+
+	'''
+	@param key (object), key of a drawing
+	@return cached (bool), whether the drawing is cached
+	'''
+	def __contains__(self, key):
+		return key in self.layers
+
+	'''
+	turns canvas items into the layer of a drawing, which becomes the visible layer
+
+	@param key (object), key of the drawing, such as its index in the Previous Drawings list
+	@param items (list), ids of the drawing's canvas items
+	@param data (object), kept with the layer, such as the CanvasRenderer which drew it
+	@return None
+	'''
+	def add(self, key, items, data = None):
+		if key in self.layers:
+			self.remove(key)
+		tag = 'layer%d' % self._nextTag
+		self._nextTag += 1
+		for item in items:
+			self.canvas.addtag_withtag(tag, item)
+		self.layers[key] = (tag, len(items), data)
+		self.itemCount += len(items)
+		self.visibleKey = key
+		self.evict()
+
+	'''
+	@param key (object), key of a cached drawing
+	@return data (object), what was kept with its layer
+	'''
+	def data(self, key):
+		return self.layers[key][2]
+
+	'''
+	adds canvas items to the layer of a drawing, such as the new part of a drawing
+		which has grown or the parts which came into view, and counts the items deleted
+		from it
+
+	@param key (object), key of the drawing, which must be cached
+	@param added (list), ids of the canvas items added
+	@param removed (int), number of the layer's items deleted from the canvas
+	@return None
+	'''
+	def update(self, key, added, removed = 0):
+		tag, itemCount, data = self.layers[key]
+		for item in added:
+			self.canvas.addtag_withtag(tag, item)
+		self.layers[key] = (tag, itemCount + len(added) - removed, data)
+		self.itemCount += len(added) - removed
+		self.evict()
+
+	'''
+	shows the layer of a drawing, hiding the visible one
+
+	@param key (object), key of the drawing
+	@return shown (bool), False if the drawing is not cached
+	'''
+	def show(self, key):
+		if key not in self.layers:
+			return False
+		self.hide()
+		# mark as most recently used
+		layer = self.layers.pop(key)
+		self.layers[key] = layer
+		self.canvas.itemconfigure(layer[0], state = 'normal')
+		self.visibleKey = key
+		return True
+
+	'''
+	hides the visible layer, if any
+
+	@return None
+	'''
+	def hide(self):
+		if self.visibleKey is not None:
+			self.canvas.itemconfigure(self.layers[self.visibleKey][0], state = 'hidden')
+			self.visibleKey = None
+
+	'''
+	deletes the layer of a drawing from the canvas
+
+	@param key (object), key of the drawing
+	@return None
+	'''
+	def remove(self, key):
+		tag, itemCount, data = self.layers.pop(key)
+		self.canvas.delete(tag)
+		self.itemCount -= itemCount
+		if self.visibleKey == key:
+			self.visibleKey = None
+
+	'''
+	deletes least recently used layers until the cache is within budget. The visible
+		layer is never deleted.
+
+	@return None
+	'''
+	def evict(self):
+		while len(self.layers) > self.maxLayers or self.itemCount > self.maxItems:
+			oldest = next(iter(self.layers))
+			if oldest == self.visibleKey:
+				if len(self.layers) == 1:
+					return
+				# skip past the visible layer
+				layer = self.layers.pop(oldest)
+				self.layers[oldest] = layer
+				continue
+			self.remove(oldest)
@@ -0,0 +1,222 @@
+##
+# LoadTest: command line tool which sends many render requests at once to a RenderService
+#	on this computer and reports throughput, latency percentiles, the service's own timing
+#	of each stage (from its Server-Timing headers) and how many requests were turned away.
+#
+# Usage: python LoadTest.py [-c CONCURRENCY] [-n REQUESTS] [--format svg|png] [--chunked]
+#	[--start-server] [-o RESULTS.json] INPUT.txt
+#	Needs Python 3.
+#
+# Adam Carlson
+# 10/18/2026
+#
+##
+
+# library dependencies
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+
+# our custom classes
+import RenderService as service
+
+""" CONSTANTS """
+
+# bytes sent at a time
+SEND_CHUNK = 1 << 16
+
+# seconds to wait for a started service to accept connections
+STARTUP_SECONDS = 30.0
+
+'''
+Sends one render request and reads the whole response.
+
+@param host (string), address of the service
+@param port (int), port of the service
+@param path (string), path and query of the request
+@param content (bytes), text uploaded
+@param chunked (bool), whether to upload with chunked transfer encoding instead of Content-Length
+@param charset (string), charset named in the Content-Type header
+@return (status, headers, size) (tuple), status code, response headers with lower case names
+	and number of bytes in the response body
+'''
+async def sendRequest(host, port, path, content, chunked = False, charset = 'utf-8'):
+	reader, writer = await asyncio.open_connection(host, port)
+	try:
+		lines = ['POST %s HTTP/1.1' % path, 'Host: %s:%d' % (host, port), 'Content-Type: text/plain; charset=%s' % charset]
+		lines.append('Transfer-Encoding: chunked' if chunked else 'Content-Length: %d' % len(content))
+		writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+		try:
+			for start in range(0, len(content), SEND_CHUNK):
+				part = content[start:start + SEND_CHUNK]
+				writer.write(b'%x\r\n%s\r\n' % (len(part), part) if chunked else part)
+				await writer.drain()
+			if chunked:
+				writer.write(b'0\r\n\r\n')
+				await writer.drain()
+		except ConnectionError:
+			# turned away before the upload was sent; the response is still there to read
+			pass
+
+		statusLine = await reader.readline()
+		status = int(statusLine.split()[1])
+		headers = {}
+		while True:
+			line = (await reader.readline()).decode('latin-1')
+			if not line.strip():
+				break
+			name, separator, value = line.partition(':')
+			headers[name.strip().lower()] = value.strip()
+		body = await reader.readexactly(int(headers.get('content-length', '0')))
+		return status, headers, len(body)
+	finally:
+		writer.close()
+
+'''
+@param header (string), a Server-Timing header such as 'queue;dur=1.0, parse;dur=20.5'
+@return timings (dict), milliseconds by stage name
+'''
+def parseServerTiming(header):
+	timings = {}
+	for metric in header.split(','):
+		parts = [part.strip() for part in metric.split(';')]
+		for parameter in parts[1:]:
+			if parameter.startswith('dur='):
+				timings[parts[0]] = float(parameter[4:])
+	return timings
+
+'''
+@param values (list), sorted numbers
+@param fraction (float), fraction of the values at or below the percentile
+@return value (float), the percentile, or 0 without values
+'''
+def percentile(values, fraction):
+	if not values:
+		return 0.0
+	return values[min(len(values) - 1, int(fraction * len(values)))]
+
+'''
+Sends requests from several connections at once until all are sent.
+
+@param host (string), address of the service
+@param port (int), port of the service
+@param path (string), path and query of every request
+@param content (bytes), text uploaded with every request
+@param requests (int), number of requests in total
+@param concurrency (int), number of requests in flight at a time
+@param chunked (bool), whether to upload with chunked transfer encoding
+@return results (dict), summary of the run
+'''
+async def runLoad(host, port, path, content, requests, concurrency, chunked = False):
+	latencies = []
+	statuses = {}
+	stageTotals = {}
+	errors = []
+	received = [0]
+	remaining = [requests]
+
+	async def client():
+		while remaining[0] > 0:
+			remaining[0] -= 1
+			start = time.time()
+			try:
+				status, headers, size = await sendRequest(host, port, path, content, chunked)
+			except (ConnectionError, asyncio.IncompleteReadError, ValueError, IndexError) as error:
+				errors.append('%s: %s' % (type(error).__name__, error))
+				continue
+			statuses[status] = statuses.get(status, 0) + 1
+			if status == 200:
+				latencies.append(time.time() - start)
+				received[0] += size
+				for stage, milliseconds in parseServerTiming(headers.get('server-timing', '')).items():
+					stageTotals[stage] = stageTotals.get(stage, 0.0) + milliseconds
+
+	start = time.time()
+	await asyncio.gather(*[client() for i in range(concurrency)])
+	elapsed = max(time.time() - start, 1e-9)
+
+	latencies.sort()
+	served = len(latencies)
+	return {'requests': requests, 'concurrency': concurrency, 'uploadBytes': len(content),
+		'seconds': elapsed, 'served': served, 'requestsPerSecond': served / elapsed,
+		'uploadMegabytesPerSecond': served * len(content) / elapsed / 1e6, 'responseBytes': received[0],
+		'statuses': dict((str(status), count) for status, count in sorted(statuses.items())),
+		'rejected': statuses.get(503, 0), 'errors': len(errors), 'firstErrors': errors[:5],
+		'latency': dict(('p%d' % (fraction * 100), percentile(latencies, fraction))
+			for fraction in (0.5, 0.9, 0.99)),
+		'maxLatency': latencies[-1] if latencies else 0.0,
+		'serverTimingMeanMs': dict((stage, total / served) for stage, total in sorted(stageTotals.items()))}
+
+'''
+starts a RenderService in another process and waits until it accepts connections
+
+@param port (int), port it listens on
+@param workers (int), number of worker processes, or None for all cores
+@return process (Popen), the service's process
+'''
+def startService(port, workers = None):
+	command = [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'RenderService.py'), '--port', str(port)]
+	if workers:
+		command += ['-j', str(workers)]
+	process = subprocess.Popen(command)
+	deadline = time.time() + STARTUP_SECONDS
+	while time.time() < deadline:
+		if process.poll() is not None:
+			raise RuntimeError('RenderService.py exited with status %d' % process.returncode)
+		try:
+			socket.create_connection(('127.0.0.1', port), 1.0).close()
+			return process
+		except OSError:
+			time.sleep(0.1)
+	process.terminate()
+	raise RuntimeError('RenderService.py did not start within %d s' % STARTUP_SECONDS)
+
+'''
+Command line entry point.
+
+@param argv (list), command line arguments, defaults to sys.argv[1:]
+@return exit status (int)
+'''
+def main(argv = None):
+	argParser = argparse.ArgumentParser(description = 'Load test a RenderService on this computer.')
+	argParser.add_argument('input', help = '.txt file uploaded with every request')
+	argParser.add_argument('-n', '--requests', type = int, default = 100, help = 'number of requests')
+	argParser.add_argument('-c', '--concurrency', type = int, default = 8, help = 'requests in flight at a time')
+	argParser.add_argument('--port', type = int, default = service.DEFAULT_PORT, help = 'port of the service')
+	argParser.add_argument('--format', choices = sorted(service.IMAGE_TYPES), default = 'svg', help = 'image format requested')
+	argParser.add_argument('--chunked', action = 'store_true', help = 'upload with chunked transfer encoding')
+	argParser.add_argument('--start-server', action = 'store_true', help = 'start RenderService.py for the test and stop it after')
+	argParser.add_argument('-j', '--workers', type = int, default = None, help = 'with --start-server, its number of worker processes')
+	argParser.add_argument('-o', '--output', default = None, help = 'also write the results to this JSON file')
+	args = argParser.parse_args(argv)
+
+	with open(args.input, 'rb') as file:
+		content = file.read()
+
+	process = startService(args.port, args.workers) if args.start_server else None
+	try:
+		results = asyncio.run(runLoad('127.0.0.1', args.port, '/render?format=%s' % args.format, content,
+			args.requests, args.concurrency, args.chunked))
+	finally:
+		if process is not None:
+			process.terminate()
+			process.wait()
+
+	print ("%d requests, %d at a time: %d served, %d rejected (503), %d errors in %.2f s"
+		% (args.requests, args.concurrency, results['served'], results['rejected'], results['errors'], results['seconds']))
+	print ("%.1f requests/s, %.1f MB/s uploaded" % (results['requestsPerSecond'], results['uploadMegabytesPerSecond']))
+	print ("latency p50 %.3f s, p90 %.3f s, p99 %.3f s, max %.3f s" % (results['latency']['p50'],
+		results['latency']['p90'], results['latency']['p99'], results['maxLatency']))
+	print ("service time per request: " + ', '.join('%s %.1f ms' % item for item in sorted(results['serverTimingMeanMs'].items())))
+	if args.output:
+		with open(args.output, 'w') as file:
+			json.dump(results, file, indent = 1, sort_keys = True)
+	return 0 if results['errors'] == 0 else 1
+
+if __name__ == '__main__':
+	sys.exit(main())
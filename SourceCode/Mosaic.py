@@ -0,0 +1,155 @@
+##
+# Mosaic: command line tool which draws a long text as a grid of panels. The text is
+#	split into contiguous chunks, and each chunk is sampled and drawn on its own panel
+#	in a pool of worker processes, so all of the text is used and the panels are drawn
+#	at the same time. The panels are put together in one SVG image.
+#
+# Usage: python Mosaic.py [-n PANELS] [-c COLUMNS] [-j JOBS] [-o OUTPUT.svg] INPUT.txt
+#
+# Adam Carlson
+# 10/18/2026
+#
+##
+
+# library dependencies
+import argparse
+import io
+import math
+import multiprocessing
+import os
+import sys
+import time
+
+# our custom classes
+import Drawer as drawer
+import Exporter as exporter
+import Parser as parser
+import PenTurtle as penturtle
+
+""" CONSTANTS """
+
+# default number of panels
+PANELS = 16
+
+# space between panels, in pixels
+PANEL_GAP = 10
+
+'''
+Splits a file into contiguous byte ranges of about the same size. Every range starts
+	at the start of a UTF-8 character, so no character is split between panels.
+
+@param filename (string), text file
+@param panels (int), number of ranges
+@return ranges (list), (start, end) byte offsets, in order
+'''
+def splitFile(filename, panels):
+	size = os.path.getsize(filename)
+	starts = [0]
+	with open(filename, 'rb') as file:
+		for panel in range(1, panels):
+			start = max(size * panel // panels, starts[-1])
+			file.seek(start)
+			# skip continuation bytes (10xxxxxx) of a character started before the boundary
+			for byte in bytearray(file.read(4)):
+				if byte & 0xC0 != 0x80:
+					break
+				start += 1
+			starts.append(min(start, size))
+	return list(zip(starts, starts[1:] + [size]))
+
+'''
+Samples and draws one chunk of a text as an SVG panel. Runs in a worker process.
+
+@param job (tuple), (file, (start, end) byte range, panel x, panel y, panel width, panel height, sample size)
+@return (panel, characters) (tuple), the panel's SVG and the number of characters in the chunk
+'''
+def renderPanel(job):
+	filename, byteRange, x, y, width, height, sampleSize = job
+	chunkParser = parser.MappedParser(filename, sampleSize = sampleSize, byteRange = byteRange)
+	panel = io.StringIO()
+	sink = exporter.SVGExporter(panel, width, height, position = (x, y))
+	try:
+		pen = penturtle.PenTurtle(sink)
+		# the same space around the drawing as the GUI keeps
+		drawer.Drawer(chunkParser.get_characters_list(), pen, width - drawer.REDUCED_WIDTH,
+			height - drawer.REDUCED_HEIGHT, maxLetters = None).draw()
+	finally:
+		sink.close()
+	return panel.getvalue(), chunkParser.file_length
+
+'''
+Draws a text file as a mosaic of panels.
+
+@param filename (string), text file
+@param outputFile (string), name of the SVG image written
+@param panels (int), number of panels
+@param columns (int), number of panels per row, defaults to a near-square grid
+@param processes (int), number of worker processes, defaults to one per core
+@param panelWidth (int), width of a panel in pixels
+@param panelHeight (int), height of a panel in pixels
+@param sampleSize (int), characters sampled from each chunk
+@return characters (int), number of characters drawn from, over all panels
+'''
+def renderMosaic(filename, outputFile, panels = PANELS, columns = None, processes = None,
+		panelWidth = drawer.CANVAS_WIDTH, panelHeight = drawer.CANVAS_HEIGHT, sampleSize = parser.SAMPLE_THRESHOLD):
+	columns = columns or int(math.ceil(math.sqrt(panels)))
+	rows = int(math.ceil(panels / float(columns)))
+	width = columns * panelWidth + (columns - 1) * PANEL_GAP
+	height = rows * panelHeight + (rows - 1) * PANEL_GAP
+
+	jobs = []
+	for panel, byteRange in enumerate(splitFile(filename, panels)):
+		row, column = divmod(panel, columns)
+		jobs.append((filename, byteRange, column * (panelWidth + PANEL_GAP), row * (panelHeight + PANEL_GAP),
+			panelWidth, panelHeight, sampleSize))
+
+	characters = 0
+	pool = multiprocessing.Pool(processes or multiprocessing.cpu_count())
+	try:
+		with io.open(outputFile, 'w', encoding = 'utf-8') as file:
+			file.write(u'<svg xmlns="http://www.w3.org/2000/svg" width="%d" height="%d" viewBox="0 0 %d %d">\n'
+				% (width, height, width, height))
+			file.write(u'<rect width="%d" height="%d" fill="#DDDDDD"/>\n' % (width, height))
+			# panels come back in order and are written as soon as they arrive
+			for panel, panelCharacters in pool.imap(renderPanel, jobs):
+				file.write(panel)
+				characters += panelCharacters
+			file.write(u'</svg>\n')
+	finally:
+		pool.close()
+		pool.join()
+	return characters
+
+'''
+Command line entry point.
+
+@param argv (list), command line arguments, defaults to sys.argv[1:]
+@return exit status (int)
+'''
+def main(argv = None):
+	argParser = argparse.ArgumentParser(description = 'Draw a long text as a grid of panels.')
+	argParser.add_argument('input', help = '.txt file')
+	argParser.add_argument('-o', '--output', default = None, help = 'SVG file written (default: INPUT-mosaic.svg)')
+	argParser.add_argument('-n', '--panels', type = int, default = PANELS, help = 'number of panels')
+	argParser.add_argument('-c', '--columns', type = int, default = None, help = 'panels per row')
+	argParser.add_argument('-j', '--jobs', type = int, default = None, help = 'number of worker processes (default: all cores)')
+	argParser.add_argument('--panel-width', type = int, default = drawer.CANVAS_WIDTH, help = 'panel width in pixels')
+	argParser.add_argument('--panel-height', type = int, default = drawer.CANVAS_HEIGHT, help = 'panel height in pixels')
+	argParser.add_argument('--sample-size', type = int, default = parser.SAMPLE_THRESHOLD, help = 'characters sampled per panel')
+	args = argParser.parse_args(argv)
+
+	if not args.input.endswith('.txt') or not os.path.isfile(args.input):
+		print ("Please use a text file.")
+		return 1
+	outputFile = args.output or os.path.splitext(args.input)[0] + '-mosaic.svg'
+
+	start = time.time()
+	characters = renderMosaic(args.input, outputFile, args.panels, args.columns, args.jobs,
+		args.panel_width, args.panel_height, args.sample_size)
+	elapsed = max(time.time() - start, 1e-9)
+	print ("Drew %d panels from %d characters in %.2f s (%.1f panels/s) to %s"
+		% (args.panels, characters, elapsed, args.panels / elapsed, outputFile))
+	return 0
+
+if __name__ == '__main__':
+	sys.exit(main())
@@ -0,0 +1,108 @@
+##
+# ParseWorker class which parses a text file on a background thread, so the GUI keeps
+#	responding while a large file is read.
+#
+# Lawrence Dickey
+# 10/18/2026
+#
+##
+
+# library dependencies
+import threading
+try:
+	import queue
+except ImportError:
+	import Queue as queue
+
+# our custom classes
+import Parser as parser
+import Instrumentation as instrumentation
+
+
+class ParseCancelled(Exception):
+	""" Raised inside the worker thread to stop parsing once cancel has been called. """
+
+
+class ParseWorker(threading.Thread):
+	""" ParseWorker class for Text-to-Art Interpreter.
+
+	Runs a MappedParser, or a StreamingParser for compressed files, on its own thread. Everything the worker has to report is put
+	in the messages queue as a (kind, value) tuple, for the GUI to take from its main
+	loop; the worker never touches Tk or the storage itself. The kinds are:
+		'progress': (bytes read, file size)
+		'done': (parser, representative characters)
+		'cancelled': None
+		'error': a message
+	Exactly one of 'done', 'cancelled' and 'error' is sent, last.
+	"""
+
+	"""
+	Attributes:
+		filename: name of the text file being parsed
+		sampleSize: files with more characters than this are sampled
+		incremental: IncrementalTracker to parse only the new part of a followed file with, or None
+		messages: queue of (kind, value) tuples sent by the worker
+		cancelled: set by cancel to stop the worker
+	"""
+
+	'''
+	Initializes the ParseWorker object; call start() to begin parsing.
+
+	@param filename (string), name of the text file
+	@param sampleSize (int), files with more characters than this are sampled
+	@param incremental (IncrementalTracker), tracker to parse the file with, so only what was
+		added since it was last parsed is read (see Incremental.py), or None to parse all of it
+	'''
+	def __init__(self, filename, sampleSize = parser.SAMPLE_THRESHOLD, incremental = None):
+		threading.Thread.__init__(self)
+		# do not keep the program running for an abandoned parse
+		self.daemon = True
+		self.filename = filename
+		self.sampleSize = sampleSize
+		self.incremental = incremental
+		self.messages = queue.Queue()
+		self.cancelled = threading.Event()
+
+	'''
+	parses the file, runs on the worker thread
+
+	@return None
+	'''
+	def run(self):
+		try:
+			with instrumentation.stage('parse'):
+				if self.incremental is not None:
+					fileParser = self.incremental.parse(self.filename, progress = self.reportProgress)
+				elif parser.isCompressedTextFile(self.filename):
+					# compressed files are decompressed as they are read
+					fileParser = parser.StreamingParser(self.filename, sampleSize = self.sampleSize, progress = self.reportProgress)
+				else:
+					fileParser = parser.MappedParser(self.filename, sampleSize = self.sampleSize, progress = self.reportProgress)
+			with instrumentation.stage('sample'):
+				characters = fileParser.get_characters_list()
+		except ParseCancelled:
+			self.messages.put(('cancelled', None))
+		except Exception as error:
+			self.messages.put(('error', '%s: %s' % (type(error).__name__, error)))
+		else:
+			self.messages.put(('done', (fileParser, characters)))
+
+	'''
+	passes the parser's progress on to the messages queue, stopping the parser if cancelled
+
+	@param done (int), number of bytes read
+	@param total (int), size of the file in bytes
+	@return None
+	'''
+	def reportProgress(self, done, total):
+		if self.cancelled.is_set():
+			raise ParseCancelled()
+		self.messages.put(('progress', (done, total)))
+
+	'''
+	asks the worker to stop; it sends 'cancelled' once it has, unless it had already finished
+
+	@return None
+	'''
+	def cancel(self):
+		self.cancelled.set()
@@ -6,6 +6,26 @@
 #
 ##
 
+# library dependencies
+import codecs
+import io
+import locale
+import mmap
+import os
+import sys
+
+# default sample size: files with more characters than this are sampled down to
+# at most SAMPLE_THRESHOLD - 1 characters
+SAMPLE_THRESHOLD = 10000
+# number of characters read at a time when streaming
+CHUNK_SIZE = 1 << 20
+# bytes that str.split() treats as whitespace in ASCII text
+ASCII_WHITESPACE = b' \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f'
+# every ASCII byte, used to detect non-ASCII text
+ASCII_CHARACTERS = bytes(bytearray(range(128)))
+# compressed text files StreamingParser reads, such as story.txt.gz
+COMPRESSED_EXTENSIONS = ['.gz', '.bz2', '.xz']
+
 class Parser:
 	""" Parser class for Text-to-Art Interpreter. 
 
@@ -13,14 +33,19 @@ class Parser:
 		filename: name of the file to be parsed. 
 		characters: list of characters
 		file_length: the length of the file. 
+		sampleSize: files with more characters than this are sampled
 	"""
 
 	''' 
 	Initializes the parser object for a file. Asks user for the name of a file. 
+
+	@param fn (string), name of the text file
+	@param sampleSize (int), files with more characters than this are sampled
 	'''
-	def __init__(self, fn):
+	def __init__(self, fn, sampleSize = SAMPLE_THRESHOLD):
 		# Store filename in class variable. 
 		self.filename = fn
+		self.sampleSize = sampleSize
 			
 
 		# Initialize empty list for characters.
@@ -46,27 +71,28 @@ class Parser:
 
 
 	'''  
-	The method tests to see if there are more than 10,000 characters in the file parsed 
-		in the init method. If there are > 10,000, it divides the number of characters 
-		by 10,000, rounding down to the nearest integer. It then creates a new list, chars,
-		to which it adds every n'th character where n * 10,000 ~= the number of characters in the file.
+	The method tests to see if there are more than sampleSize (10,000 by default) characters 
+		in the file parsed in the init method. If there are more, it divides the number of characters 
+		by sampleSize, rounding down to the nearest integer. It then creates a new list, chars,
+		to which it adds every n'th character where n * sampleSize ~= the number of characters in the file.
 		
-	@return chars (list), a list with up to 10,000 characters in it that are representative of the file. 
+	@return chars (list), a list with fewer than sampleSize characters in it that are representative of the file,
+		or all of them if there are at most sampleSize
 	'''
 	def get_characters_list(self):
 		chars = []
-		# File has > 10,000 characters:
-		if (self.file_length > 10000):
-			iterator_range = float(self.file_length) / 10000.0 # Computer distance between characters to analize within the self.characters list. 
+		# File has > sampleSize characters:
+		if (self.file_length > self.sampleSize):
+			iterator_range = float(self.file_length) / float(self.sampleSize) # Computer distance between characters to analize within the self.characters list. 
 			iterator_range = int(iterator_range) # Round down to nearest integer. 
 			chars = [] # List to return
 			i = 0
 			for char in range(int(self.file_length / iterator_range)):
 				chars.append(self.characters[iterator_range * i]) 
 				i += 1 # Increment iteration variable.
-			chars = chars[:9999]
+			chars = chars[:self.sampleSize - 1]
 			return chars
-		# File has < 10,000 characters
+		# File has <= sampleSize characters
 		else:
 			chars = [] # List to return
 			i = 0
@@ -86,6 +112,482 @@ class Parser:
 	'''
 		
 
+class StreamingParser(Parser):
+	""" Streaming parser for Text-to-Art Interpreter. 
+
+	Reads its input in fixed-size chunks and keeps only the representative sample,
+	so memory use does not depend on the size of the input. Regular files produce
+	exactly the same sample as Parser.get_characters_list; pipes and stdin, whose
+	length is unknown up front, are sampled in a single pass.
+
+	Files compressed with gzip, bzip2 or xz (.txt.gz, .txt.bz2, .txt.xz) are
+	decompressed while they are read, also in a single pass, so they are only
+	decompressed once. Files are decoded chunk by chunk: a byte order mark selects
+	UTF-8, UTF-16 or UTF-32, and bytes which are not valid in the encoding are read
+	as Latin-1, so files mixing encodings can be read.
+
+	Attributes:
+		filename: name of the file to be parsed ('-' for stdin).
+		characters: the representative sample (not the whole file)
+		file_length: the number of non-whitespace characters in the file.
+		chunkSize: number of characters (bytes for files) read from the input at a time
+		sampleSize: files with more characters than this are sampled
+		encoding: encoding of the file, None for the platform encoding like Parser
+		progress: function called with the bytes of the file read, or None
+	"""
+
+	'''
+	Initializes the streaming parser and samples the input.
+
+	@param fn (string), name of the text file, or '-' to read from stdin
+	@param stream (file), optional already opened stream to read instead of fn; binary
+		streams are decoded like files
+	@param chunkSize (int), number of characters read at a time
+	@param sampleSize (int), files with more characters than this are sampled
+	@param encoding (string), encoding of the file, defaults to the platform encoding
+		unless the file starts with a byte order mark
+	@param progress (function), called as progress(bytes read, bytes to read) after every chunk
+		of a file, counting the bytes on disk; a .txt file is read twice
+	'''
+	def __init__(self, fn, stream = None, chunkSize = CHUNK_SIZE, sampleSize = SAMPLE_THRESHOLD, encoding = None, progress = None):
+		self.filename = fn
+		self.sampleSize = sampleSize
+		self.characters = []
+		self.file_length = 0
+		self.chunkSize = chunkSize
+		self.encoding = encoding
+		self.progress = progress
+
+		if stream is None and fn == '-':
+			stream = sys.stdin
+
+		# ignore non-text files
+		if stream is None and not isTextFile(fn):
+			print ("Please use a text file.")
+			return
+
+		if isinstance(stream, (io.RawIOBase, io.BufferedIOBase)):
+			# unknown length: one pass with a shrinking sample
+			self.characters = self.sampleUnknownLength(self.decodeChunks(stream))
+		elif stream is not None:
+			self.characters = self.sampleUnknownLength(self.readChunks(stream))
+		elif fn.endswith('.txt'):
+			# known file: count the characters first so the stride matches Parser
+			size = os.path.getsize(self.filename)
+			with open(self.filename, 'rb') as file:
+				length = sum(len(chunk) for chunk in self.reportChunks(self.decodeChunks(file), file, 0, 2 * size))
+				file.seek(0)
+				self.characters = self.sampleKnownLength(self.reportChunks(self.decodeChunks(file), file, size, 2 * size), length)
+			self.file_length = length
+		else:
+			# compressed file: decompressing twice would double the time, so one pass
+			with open(self.filename, 'rb') as raw:
+				file = openCompressed(self.filename, raw)
+				try:
+					self.characters = self.sampleUnknownLength(self.reportChunks(self.decodeChunks(file), raw, 0,
+						os.path.getsize(self.filename)))
+				finally:
+					file.close()
+
+	'''
+	Passes chunks on, reporting the progress of reading the file after each.
+
+	@param chunks (iterator), chunks read from file
+	@param file (file), the file on disk, whose position is the bytes read so far
+	@param before (int), bytes read before this pass over the file
+	@param total (int), bytes to read
+	@return iterator of the chunks
+	'''
+	def reportChunks(self, chunks, file, before, total):
+		for chunk in chunks:
+			if self.progress is not None:
+				self.progress(before + file.tell(), total)
+			yield chunk
+
+	'''
+	The sample is already taken while reading, so it is simply returned.
+
+	@return chars (list), a list with up to sampleSize characters in it that are representative of the file.
+	'''
+	def get_characters_list(self):
+		return list(self.characters)
+
+	'''
+	Generator of the non-whitespace text of a stream, one chunk at a time.
+
+	@param file (file), text stream to read from
+	@return iterator of strings with all whitespace removed
+	'''
+	def readChunks(self, file):
+		while True:
+			chunk = file.read(self.chunkSize)
+			if not chunk:
+				return
+			# whitespace never spans chunks, so each chunk can be stripped on its own
+			yield ''.join(chunk.split())
+
+	'''
+	Generator of the non-whitespace text of a binary stream, decoded one chunk at a time.
+		Characters split between chunks are kept by the decoder until the next chunk.
+
+	@param file (file), binary stream to read from
+	@return iterator of strings with all whitespace removed
+	'''
+	def decodeChunks(self, file):
+		decoder = None
+		while True:
+			chunk = file.read(self.chunkSize)
+			final = not chunk
+			if decoder is None:
+				encoding = chooseEncoding(self.encoding, chunk)
+				decoder = codecs.getincrementaldecoder(encoding)(errors = 'latin1fallback')
+				asciiCompatible = isASCIICompatible(encoding)
+			if asciiCompatible:
+				# drop ASCII whitespace before decoding, like MappedParser; only text with
+				# other characters can hold other whitespace
+				chunk = chunk.translate(None, ASCII_WHITESPACE)
+				text = decoder.decode(chunk, final = final)
+				if chunk.translate(None, ASCII_CHARACTERS):
+					text = ''.join(text.split())
+			else:
+				text = ''.join(decoder.decode(chunk, final = final).split())
+			yield text
+			if final:
+				return
+
+	'''
+	Samples a stream whose number of characters is already known, picking every
+	n'th character exactly like Parser.get_characters_list. Stops reading once the
+	sample is full.
+
+	@param chunks (iterator), the non-whitespace text of the stream, in chunks
+	@param length (int), number of non-whitespace characters in the stream
+	@return chars (list), the representative characters of the stream
+	'''
+	def sampleKnownLength(self, chunks, length):
+		stride, count = sampleShape(length, self.sampleSize)
+		chars = []
+		position = 0 # index of the first character of the current chunk
+		for chunk in chunks:
+			first = (-position) % stride
+			chars.extend(chunk[first::stride])
+			position += len(chunk)
+			if len(chars) >= count:
+				break
+		return chars[:count]
+
+	'''
+	Samples a stream of unknown length in a single pass. Every n'th character is kept,
+	and whenever the kept list reaches twice the sample size every other entry is
+	dropped and n is doubled, so at most 2 * sampleSize characters are held.
+	Once the length is known the kept characters are thinned to the final sample.
+
+	@param chunks (iterator), the non-whitespace text of the stream, in chunks
+	@return chars (list), the representative characters of the stream
+	'''
+	def sampleUnknownLength(self, chunks):
+		kept = []
+		keptStride = 1
+		position = 0
+		for chunk in chunks:
+			first = (-position) % keptStride
+			kept.extend(chunk[first::keptStride])
+			position += len(chunk)
+			while len(kept) >= 2 * self.sampleSize:
+				kept = kept[::2]
+				keptStride *= 2
+		self.file_length = position
+
+		stride, count = sampleShape(position, self.sampleSize)
+		if stride % keptStride == 0:
+			# every wanted character was kept: same result as Parser
+			return kept[::stride // keptStride][:count]
+		# otherwise take the kept character closest to each wanted position
+		step = float(stride) / keptStride
+		return [kept[min(int(i * step + 0.5), len(kept) - 1)] for i in range(count)]
+
+
+class MappedParser(Parser):
+	""" Memory-mapped parser for Text-to-Art Interpreter. 
+
+	Maps the file into memory and removes whitespace with bulk byte operations instead
+	of building a list of one-character strings. ASCII text is held as a bytearray 
+	(one byte per character); other text is held as a single compact string.
+
+	Attributes:
+		filename: name of the file to be parsed. 
+		characters: all non-whitespace characters of the file, as a bytearray or string
+		file_length: the length of the file. 
+		sampleSize: files with more characters than this are sampled
+	"""
+
+	''' 
+	Initializes the parser object for a file by mapping it into memory.
+
+	@param fn (string), name of the text file
+	@param encoding (string), encoding of the file, defaults to the platform encoding like Parser
+	@param sampleSize (int), files with more characters than this are sampled
+	@param progress (function), called as progress(bytes read, bytes to read) after every chunk;
+		an exception raised by it stops parsing
+	@param byteRange (tuple), (start, end) byte offsets of the part of the file to parse,
+		or None for the whole file. Both should be at the start of a character.
+	'''
+	def __init__(self, fn, encoding = None, sampleSize = SAMPLE_THRESHOLD, progress = None, byteRange = None):
+		self.filename = fn
+		self.sampleSize = sampleSize
+		self.characters = bytearray()
+		self.file_length = 0
+
+		# ignore non-text files
+		if not fn.endswith('.txt'):
+			print ("Please use a text file.")
+			return
+
+		with open(self.filename, 'rb') as file:
+			size = os.fstat(file.fileno()).st_size
+			first, last = byteRange or (0, size)
+			last = min(last, size)
+			# empty files cannot be mapped
+			if size == 0 or first >= last:
+				return
+			view = mmap.mmap(file.fileno(), 0, access = mmap.ACCESS_READ)
+			try:
+				for start in range(first, last, CHUNK_SIZE):
+					end = min(start + CHUNK_SIZE, last)
+					self.characters += view[start:end].translate(None, ASCII_WHITESPACE)
+					if progress is not None:
+						progress(end - first, last - first)
+			finally:
+				view.close()
+
+		# non-ASCII text has to be decoded, and may contain more (Unicode) whitespace
+		if self.characters.translate(None, ASCII_CHARACTERS):
+			text = bytes(self.characters).decode(encoding or locale.getpreferredencoding(False))
+			self.characters = ''.join(text.split())
+
+		self.file_length = len(self.characters)
+
+	'''
+	Picks every n'th character of the file by slicing the buffer, giving the same sample
+		as Parser.get_characters_list.
+		
+	@return chars (list), a list with up to sampleSize characters in it that are representative of the file. 
+	'''
+	def get_characters_list(self):
+		stride, count = sampleShape(self.file_length, self.sampleSize)
+		sample = self.characters[0:stride * count:stride]
+		if isinstance(sample, bytearray):
+			sample = sample.decode('ascii')
+		return list(sample)
+
+
+class IncrementalParser(Parser):
+	""" Incremental parser for Text-to-Art Interpreter.
+
+	Parses only the part of a growing file added since it was last parsed. The stride
+	is fixed when the file is first parsed, so every refresh continues the same sample:
+	the sample is every stride'th character of the file, and grows with it.
+
+	Attributes:
+		filename: name of the file to be parsed.
+		characters: the sample of the newly parsed part of the file
+		file_length: the number of non-whitespace characters parsed so far, in all parts
+		sampleSize: sample size the stride is chosen for on the first parse
+		stride: every stride'th character of the file is sampled
+		offset: number of bytes of the file parsed so far
+		startOffset: byte offset this parse started at, 0 if the whole file was parsed
+	"""
+
+	'''
+	Initializes the incremental parser and parses the file from offset to its end.
+
+	@param fn (string), name of the text file
+	@param offset (int), number of bytes parsed before, 0 the first time
+	@param position (int), number of non-whitespace characters parsed before
+	@param stride (int), stride of the sample, or None the first time to choose it like Parser
+	@param encoding (string), encoding of the file, defaults to the platform encoding like Parser
+	@param sampleSize (int), files with more characters than this are sampled
+	@param progress (function), called as progress(bytes read, bytes to read) after every chunk
+	'''
+	def __init__(self, fn, offset = 0, position = 0, stride = None, encoding = None, sampleSize = SAMPLE_THRESHOLD, progress = None):
+		self.filename = fn
+		self.sampleSize = sampleSize
+		self.characters = []
+		self.file_length = position
+		self.stride = stride
+		self.offset = offset
+		self.startOffset = offset
+
+		# ignore non-text files
+		if not fn.endswith('.txt'):
+			print ("Please use a text file.")
+			return
+
+		# a character still being written is left for the next refresh
+		end = os.path.getsize(fn)
+		if codecs.lookup(encoding or locale.getpreferredencoding(False)).name == 'utf-8':
+			with open(fn, 'rb') as file:
+				file.seek(max(offset, end - 4))
+				tail = file.read()
+			end -= len(tail) - completeUTF8Length(tail)
+
+		part = MappedParser(fn, encoding, sampleSize, progress, byteRange = (offset, end))
+		# the first parse takes the same sample as Parser, so it is drawn the same
+		count = None
+		if self.stride is None:
+			self.stride, count = sampleShape(part.file_length, sampleSize)
+		sample = part.characters[(-position) % self.stride::self.stride][:count]
+		if isinstance(sample, bytearray):
+			sample = sample.decode('ascii')
+		self.characters = list(sample)
+		self.file_length = position + part.file_length
+		self.offset = max(offset, end)
+
+	'''
+	@return chars (list), the sample of the newly parsed part of the file
+	'''
+	def get_characters_list(self):
+		return list(self.characters)
+
+
+'''
+Computes the stride and the number of characters of the representative sample 
+	of a text, matching Parser.get_characters_list.
+
+@param length (int), number of non-whitespace characters in the text
+@param sampleSize (int), texts with more characters than this are sampled
+@return (stride, count) (tuple), every stride'th character is used, count in total
+'''
+def sampleShape(length, sampleSize = SAMPLE_THRESHOLD):
+	if length > sampleSize:
+		stride = length // sampleSize
+		return stride, min(length // stride, sampleSize - 1)
+	return 1, length
+
+
+'''
+Tells whether a file name is one the parsers read: a .txt file, possibly compressed.
+
+@param fn (string), name of the file
+@return isText (bool)
+'''
+def isTextFile(fn):
+	return fn.endswith('.txt') or any(fn.endswith('.txt' + extension) for extension in COMPRESSED_EXTENSIONS)
+
+'''
+Tells whether a file name is one of a compressed text file.
+
+@param fn (string), name of the file
+@return isCompressed (bool)
+'''
+def isCompressedTextFile(fn):
+	return isTextFile(fn) and not fn.endswith('.txt')
+
+'''
+Opens a compressed text file for reading, decompressing it as it is read.
+
+@param fn (string), name of a .txt.gz, .txt.bz2 or .txt.xz file
+@param file (file), the file already opened in binary mode, to read it from, or None
+@return file (file), binary stream of the decompressed bytes
+'''
+def openCompressed(fn, file = None):
+	if fn.endswith('.gz'):
+		import gzip
+		return gzip.GzipFile(fn, 'rb', fileobj = file)
+	if fn.endswith('.bz2'):
+		import bz2
+		return bz2.BZ2File(file or fn, 'rb')
+	if fn.endswith('.xz'):
+		# lzma is not part of Python 2
+		import lzma
+		return lzma.open(file or fn, 'rb')
+	raise ValueError("Not a compressed text file: %s" % fn)
+
+'''
+Finds the encoding named by the byte order mark at the start of a file, if any.
+
+@param start (bytes), the first bytes of the file
+@return encoding (string), the codec which skips the mark, or None
+'''
+def encodingFromBOM(start):
+	# UTF-32 first: its little endian mark starts with the UTF-16 one
+	for bom, encoding in ((codecs.BOM_UTF32_LE, 'utf-32'), (codecs.BOM_UTF32_BE, 'utf-32'),
+			(codecs.BOM_UTF8, 'utf-8-sig'), (codecs.BOM_UTF16_LE, 'utf-16'), (codecs.BOM_UTF16_BE, 'utf-16')):
+		if start.startswith(bom):
+			return encoding
+	return None
+
+'''
+Picks the codec a file is decoded with. The utf-16 and utf-32 codecs need a byte order
+	mark to start incremental decoding, so without one these files are read as big
+	endian, as RFC 2781 says.
+
+@param encoding (string), encoding of the file, or None for the one named by its byte
+	order mark, else the platform encoding
+@param start (bytes), the first bytes of the file
+@return encoding (string), the codec to decode the file with
+'''
+def chooseEncoding(encoding, start):
+	bomEncoding = encodingFromBOM(start)
+	if encoding is None:
+		return bomEncoding or locale.getpreferredencoding(False)
+	name = codecs.lookup(encoding).name
+	if name in ('utf-16', 'utf-32') and bomEncoding != name:
+		return name + '-be'
+	return encoding
+
+'''
+Finds how much of a piece of UTF-8 text ends in complete characters.
+
+@param data (bytes), the end of a UTF-8 file
+@return length (int), number of bytes before a character cut off at the end, if any
+'''
+def completeUTF8Length(data):
+	data = bytearray(data)
+	for back in range(1, min(4, len(data)) + 1):
+		byte = data[-back]
+		if byte & 0xC0 == 0x80:
+			# continuation byte, keep looking for the first byte of the character
+			continue
+		if byte >= 0xF0:
+			needed = 4
+		elif byte >= 0xE0:
+			needed = 3
+		elif byte >= 0xC0:
+			needed = 2
+		else:
+			needed = 1
+		return len(data) - back if needed > back else len(data)
+	return len(data)
+
+'''
+Tells whether an encoding writes ASCII characters as the same single bytes, so ASCII
+	whitespace can be removed from the bytes before they are decoded.
+
+@param encoding (string), name of the encoding
+@return compatible (bool)
+'''
+def isASCIICompatible(encoding):
+	try:
+		return ASCII_CHARACTERS.decode(encoding) == ASCII_CHARACTERS.decode('ascii')
+	except UnicodeDecodeError:
+		return False
+
+'''
+Decoding error handler which reads the bytes that are not valid in the file's encoding 
+	as Latin-1, registered as 'latin1fallback'.
+
+@param error (UnicodeDecodeError), the decoding error
+@return (replacement, position) (tuple), the bytes as Latin-1 text, and where decoding continues
+'''
+def decodeAsLatin1(error):
+	if not isinstance(error, UnicodeDecodeError):
+		raise error
+	return (error.object[error.start:error.end].decode('latin-1'), error.end)
+
+codecs.register_error('latin1fallback', decodeAsLatin1)
+
+
 ''' 
 Test Parser functionality
 '''
@@ -157,6 +659,55 @@ def main():
 	print (parser.get_characters_list())
 	print ('\n')
 	
+	# TC22: streaming parser gives the same sample as the default parser
+	print ("Test streaming parser matches default parser (greatgatsby.txt):")
+	parser = Parser('../TestFiles/greatgatsby.txt')
+	streamingParser = StreamingParser('../TestFiles/greatgatsby.txt', chunkSize = 4096)
+	print (streamingParser.get_characters_list() == parser.get_characters_list())
+	print ('\n')
+	
+	# TC23: streaming parser reading an already opened stream of unknown length
+	print ("Test streaming parser on a stream of unknown length:")
+	with open('../TestFiles/LargeMixed.txt', 'r') as stream:
+		streamingParser = StreamingParser('-', stream = stream, chunkSize = 4096)
+	print (streamingParser.file_length, len(streamingParser.get_characters_list()))
+	print ('\n')
+	
+	# TC24: memory-mapped parser gives the same sample as the default parser
+	print ("Test memory-mapped parser matches default parser (greatgatsby.txt):")
+	parser = Parser('../TestFiles/greatgatsby.txt')
+	mappedParser = MappedParser('../TestFiles/greatgatsby.txt')
+	print (mappedParser.file_length == parser.file_length and mappedParser.get_characters_list() == parser.get_characters_list())
+	print ('\n')
+	
+	# TC25: streaming parser reading a gzip-compressed copy of a file
+	print ("Test streaming parser on a compressed file (greatgatsby.txt.gz):")
+	import gzip, shutil, tempfile
+	compressedName = os.path.join(tempfile.mkdtemp(), 'greatgatsby.txt.gz')
+	with open('../TestFiles/greatgatsby.txt', 'rb') as source:
+		with gzip.open(compressedName, 'wb') as target:
+			shutil.copyfileobj(source, target)
+	streamingParser = StreamingParser(compressedName)
+	print (streamingParser.file_length == parser.file_length, len(streamingParser.get_characters_list()))
+	shutil.rmtree(os.path.dirname(compressedName))
+	print ('\n')
+	
+	# TC26: incremental parser reading a file in two parts, cut inside a word
+	print ("Test incremental parser on a growing file (greatgatsby.txt):")
+	growingName = os.path.join(tempfile.mkdtemp(), 'growing.txt')
+	with open('../TestFiles/greatgatsby.txt', 'rb') as source:
+		content = source.read()
+	with open(growingName, 'wb') as target:
+		target.write(content[:len(content) // 2])
+	firstPart = IncrementalParser(growingName)
+	with open(growingName, 'ab') as target:
+		target.write(content[len(content) // 2:])
+	secondPart = IncrementalParser(growingName, firstPart.offset, firstPart.file_length, firstPart.stride)
+	sample = firstPart.get_characters_list() + secondPart.get_characters_list()
+	print (secondPart.file_length == parser.file_length and sample == MappedParser(growingName, sampleSize = len(content)).get_characters_list()[::firstPart.stride])
+	shutil.rmtree(os.path.dirname(growingName))
+	print ('\n')
+	
 
 if __name__ == '__main__':
 	main()
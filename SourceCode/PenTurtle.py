@@ -0,0 +1,196 @@
+##
+# PenTurtle class, a turtle stand-in which computes the pen path without a canvas so
+#	drawings can be made without a display
+#
+# Adam Carlson
+# 10/18/2026
+#
+##
+
+# library dependency
+import math
+
+class PenTurtle:
+	""" PenTurtle class for Text-to-Art Interpreter.
+
+	Implements the part of the turtle API the Drawer uses. Position and heading are
+	computed with the same arithmetic as turtle.TNavigator, so the path is identical
+	to the one a RawTurtle would draw on the canvas. Everything drawn is passed on to
+	a sink (see Exporter.py) as it happens instead of being kept.
+	"""
+
+	"""
+	Attributes:
+		sink: receives the drawn lines and circles, or None to only track the pen
+		isDown: whether the pen draws when moving
+		penColor: current pen color
+	"""
+
+	'''
+	Initializes the PenTurtle object.
+
+	@param sink (object), object with lineTo(start, end, color) and 
+		circle(center, radius, points, color) methods, such as an Exporter
+	'''
+	def __init__(self, sink = None):
+		self.sink = sink
+		self.reset()
+
+	'''
+	puts the pen back at the origin facing east
+
+	@return None
+	'''
+	def reset(self):
+		self._position = (0.0, 0.0)
+		self._orient = (1.0, 0.0)
+		self.isDown = True
+		self.penColor = 'black'
+
+	'''
+	@return state (dict), position, heading, color and pen of the pen, which can be
+		saved as JSON and given to setState to continue drawing where the pen stopped
+	'''
+	def getState(self):
+		return {'position': list(self._position), 'orient': list(self._orient),
+			'color': self.penColor, 'isDown': self.isDown}
+
+	'''
+	puts the pen back where getState found it
+
+	@param state (dict), state returned by getState
+	@return None
+	'''
+	def setState(self, state):
+		self._position = tuple(state['position'])
+		self._orient = tuple(state['orient'])
+		self.penColor = state['color']
+		self.isDown = state['isDown']
+
+	'''
+	no-op, the pen has no icon or animation
+
+	@return None
+	'''
+	def hideturtle(self):
+		pass
+
+	def speed(self, speed = None):
+		pass
+
+	'''
+	sets the pen color
+
+	@param args (tuple), a color string, or a pen and a fill color like turtle.color
+	@return None
+	'''
+	def color(self, *args):
+		if args:
+			self.penColor = args[0]
+
+	def up(self):
+		self.isDown = False
+
+	def down(self):
+		self.isDown = True
+
+	def position(self):
+		return self._position
+
+	def pos(self):
+		return self._position
+
+	'''
+	@return heading (float), heading in degrees computed like turtle.heading
+	'''
+	def heading(self):
+		x, y = self._orient
+		return round(math.degrees(math.atan2(y, x)), 10) % 360.0
+
+	def setheading(self, toAngle):
+		angle = toAngle - self.heading()
+		angle = (angle + 180.0) % 360.0 - 180.0
+		self._rotate(angle)
+
+	def forward(self, distance):
+		self._go(distance)
+
+	def right(self, angle):
+		self._rotate(-angle)
+
+	def left(self, angle):
+		self._rotate(angle)
+
+	'''
+	moves to a position, drawing a line if the pen is down
+
+	@param x (float or tuple), x coordinate, or a pair of coordinates
+	@param y (float), y coordinate if x is not a pair
+	@return None
+	'''
+	def goto(self, x, y = None):
+		if y is None:
+			x, y = x
+		self._moveTo((float(x), float(y)))
+
+	'''
+	draws a full circle the way turtle.circle does, as an inscribed regular polygon
+	whose center is radius units left of the pen
+
+	@param radius (int), radius of the circle
+	@return None
+	'''
+	def circle(self, radius):
+		steps = 1 + int(min(11 + abs(radius) / 6.0, 59.0))
+		w = 360.0 / steps
+		w2 = 0.5 * w
+		l = 2.0 * radius * math.sin(math.radians(w2))
+		if radius < 0:
+			l, w, w2 = -l, -w, -w2
+		x, y = self._position
+		ox, oy = self._orient
+		center = (x - oy * radius, y + ox * radius)
+		points = [self._position]
+		self._rotate(w2)
+		for i in range(steps):
+			self._position = self._step(l)
+			points.append(self._position)
+			self._rotate(w)
+		self._rotate(-w2)
+		if self.isDown and self.sink is not None:
+			self.sink.circle(center, abs(radius), points, self.penColor)
+
+	'''
+	rotates the pen counterclockwise, like Vec2D.rotate
+
+	@param angle (float), angle in degrees
+	@return None
+	'''
+	def _rotate(self, angle):
+		ox, oy = self._orient
+		angle = math.radians(angle)
+		c, s = math.cos(angle), math.sin(angle)
+		self._orient = (ox * c + -oy * s, oy * c + ox * s)
+
+	'''
+	@param distance (float), distance to travel along the current heading
+	@return end (tuple), position reached
+	'''
+	def _step(self, distance):
+		x, y = self._position
+		ox, oy = self._orient
+		return (x + ox * distance, y + oy * distance)
+
+	def _go(self, distance):
+		self._moveTo(self._step(distance))
+
+	'''
+	moves the pen, passing the line drawn on to the sink if the pen is down
+
+	@param end (tuple), position to move to
+	@return None
+	'''
+	def _moveTo(self, end):
+		if self.isDown and self.sink is not None:
+			self.sink.lineTo(self._position, end, self.penColor)
+		self._position = end
@@ -0,0 +1,196 @@
+##
+# RecordingTurtle class, a PenTurtle which also logs every turtle call the Drawer makes
+#	in a compact array, so the drawing engine can run at full speed without a display
+#	and its output can be compared with a golden recording
+#
+# Adam Carlson
+# 10/18/2026
+#
+##
+
+# library dependencies
+import array
+import hashlib
+import io
+import json
+import sys
+
+# our custom classes
+import PenTurtle as penturtle
+
+""" CONSTANTS """
+
+# opcodes of the recorded turtle calls
+OP_FORWARD = 0		# forward(a)
+OP_TURN = 1		# right(a), left is recorded as a right turn by -a
+OP_SETHEADING = 2	# setheading(a)
+OP_COLOR = 3		# color(colors[a])
+OP_UP = 4			# up()
+OP_DOWN = 5		# down()
+OP_GOTO = 6		# goto(a, b)
+OP_CIRCLE = 7		# circle(a)
+
+OP_NAMES = ['forward', 'turn', 'setheading', 'color', 'up', 'down', 'goto', 'circle']
+
+# numbers kept per call: the opcode and two parameters
+FIELDS = 3
+
+class RecordingTurtle(penturtle.PenTurtle):
+	""" RecordingTurtle class for Text-to-Art Interpreter.
+
+	Tracks the pen exactly like PenTurtle, and so can also pass the drawing on to a
+	sink, but appends every call which changes the pen to an array of doubles, three
+	per call, instead of keeping objects. Colors are stored once each and referred to
+	by their index.
+	"""
+
+	"""
+	Attributes:
+		operations: array of (opcode, a, b) triples of the calls made, see OP_NAMES
+		colors: the colors set, in the order they were first used
+		colorIndex: index of every color in colors
+	"""
+
+	'''
+	Initializes the RecordingTurtle object.
+
+	@param sink (object), object with lineTo(start, end, color) and
+		circle(center, radius, points, color) methods, such as an Exporter, or None
+	'''
+	def __init__(self, sink = None):
+		self.operations = array.array('d')
+		self.colors = []
+		self.colorIndex = {}
+		penturtle.PenTurtle.__init__(self, sink)
+
+	'''
+	forgets the calls recorded so far; the pen stays where it is
+
+	@return None
+	'''
+	def clear(self):
+		self.operations = array.array('d')
+		self.colors = []
+		self.colorIndex = {}
+
+	'''
+	@return count (int), number of calls recorded
+	'''
+	def __len__(self):
+		return len(self.operations) // FIELDS
+
+	def record(self, opcode, a = 0.0, b = 0.0):
+		self.operations.extend((opcode, a, b))
+
+	def color(self, *args):
+		if args:
+			index = self.colorIndex.get(args[0])
+			if index is None:
+				index = self.colorIndex[args[0]] = len(self.colors)
+				self.colors.append(args[0])
+			self.record(OP_COLOR, index)
+		penturtle.PenTurtle.color(self, *args)
+
+	def up(self):
+		self.record(OP_UP)
+		penturtle.PenTurtle.up(self)
+
+	def down(self):
+		self.record(OP_DOWN)
+		penturtle.PenTurtle.down(self)
+
+	def setheading(self, toAngle):
+		self.record(OP_SETHEADING, toAngle)
+		penturtle.PenTurtle.setheading(self, toAngle)
+
+	def forward(self, distance):
+		self.record(OP_FORWARD, distance)
+		penturtle.PenTurtle.forward(self, distance)
+
+	def right(self, angle):
+		self.record(OP_TURN, angle)
+		penturtle.PenTurtle.right(self, angle)
+
+	def left(self, angle):
+		self.record(OP_TURN, -angle)
+		penturtle.PenTurtle.left(self, angle)
+
+	def goto(self, x, y = None):
+		if y is None:
+			x, y = x
+		self.record(OP_GOTO, x, y)
+		penturtle.PenTurtle.goto(self, x, y)
+
+	def circle(self, radius):
+		self.record(OP_CIRCLE, radius)
+		penturtle.PenTurtle.circle(self, radius)
+
+	'''
+	@return iterator of (name, a, b) tuples of the calls recorded, with the color of
+		color calls in place of its index
+	'''
+	def calls(self):
+		operations = self.operations
+		for start in range(0, len(operations), FIELDS):
+			opcode = int(operations[start])
+			a = self.colors[int(operations[start + 1])] if opcode == OP_COLOR else operations[start + 1]
+			yield OP_NAMES[opcode], a, operations[start + 2]
+
+	'''
+	@return counts (dict), number of calls recorded by name
+	'''
+	def counts(self):
+		counts = dict((name, 0) for name in OP_NAMES)
+		for opcode in self.operations[::FIELDS]:
+			counts[OP_NAMES[int(opcode)]] += 1
+		return counts
+
+	'''
+	@return digest (string), SHA-1 of the calls recorded and the colors, in hexadecimal;
+		two recordings have the same digest only if every call and parameter is the same
+	'''
+	def digest(self):
+		operations = self.operations
+		if sys.byteorder != 'little':
+			operations = array.array('d', operations)
+			operations.byteswap()
+		digest = hashlib.sha1(operations.tobytes())
+		digest.update(u'\n'.join(self.colors).encode('utf-8'))
+		return digest.hexdigest()
+
+	'''
+	writes the recording to a JSON file, to compare later drawings with
+
+	@param filename (string), file written
+	@return None
+	'''
+	def save(self, filename):
+		with io.open(filename, 'w', encoding = 'utf-8') as file:
+			file.write(u'%s' % json.dumps({'colors': self.colors, 'operations': self.operations.tolist()}))
+
+	'''
+	Compares the recording with a golden one written by save.
+
+	@param filename (string), the golden recording
+	@param tolerance (float), largest difference allowed between two parameters
+	@return mismatch (int), index of the first call which differs, or None if they are the same
+	'''
+	def compare(self, filename, tolerance = 1e-9):
+		with io.open(filename, 'r', encoding = 'utf-8') as file:
+			golden = json.load(file)
+		goldenColors = golden['colors']
+		goldenOperations = golden['operations']
+		operations = self.operations
+		for start in range(0, min(len(operations), len(goldenOperations)), FIELDS):
+			opcode = operations[start]
+			if opcode != goldenOperations[start]:
+				return start // FIELDS
+			if opcode == OP_COLOR:
+				if self.colors[int(operations[start + 1])] != goldenColors[int(goldenOperations[start + 1])]:
+					return start // FIELDS
+			elif abs(operations[start + 1] - goldenOperations[start + 1]) > tolerance or \
+					abs(operations[start + 2] - goldenOperations[start + 2]) > tolerance:
+				return start // FIELDS
+		if len(operations) != len(goldenOperations):
+			return min(len(operations), len(goldenOperations)) // FIELDS
+		return None
@@ -0,0 +1,568 @@
+##
+# RenderService: local HTTP service which draws text sent to it, for other tools to call.
+#	Text is POSTed to /render and the drawing comes back as an SVG or PNG image. The
+#	upload is sampled while it arrives, on a thread, and drawn in a pool of worker
+#	processes. A limited number of requests is worked on at once; later ones wait
+#	without their upload being read, and once too many are waiting new ones are turned
+#	away with 503, so a busy service slows its clients down instead of running out of memory.
+#
+# Usage: python RenderService.py [--host HOST] [--port PORT] [-j WORKERS] [--max-requests N] [--max-queue N]
+#	then e.g. curl --data-binary @../TestFiles/greatgatsby.txt 'http://127.0.0.1:8397/render?format=png' > out.png
+#	Needs Python 3. GET /health gives the service's counters as JSON.
+#
+# Adam Carlson
+# 10/18/2026
+#
+##
+
+# library dependencies
+import argparse
+import asyncio
+import codecs
+import concurrent.futures
+import io
+import json
+import multiprocessing
+import re
+import signal
+import sys
+import time
+from urllib.parse import parse_qs, urlsplit
+
+# our custom classes
+import Drawer as drawer
+import Exporter as exporter
+import Parser as parser
+import PenTurtle as penturtle
+import Thumbnail as thumbnail
+
+""" CONSTANTS """
+
+DEFAULT_PORT = 8397
+
+# requests waiting for a worker before new requests are turned away
+MAX_QUEUE = 32
+
+# largest upload accepted, in bytes
+MAX_BODY = 256 << 20
+
+# seconds to wait for the next line or part of an upload before giving up on it
+READ_TIMEOUT = 30.0
+
+# seconds an unread upload is still read (and thrown away) after an error response, so
+# the client gets to read the response instead of seeing the connection reset
+LINGER_SECONDS = 2.0
+
+# bytes of an upload read at a time
+BODY_CHUNK = 1 << 16
+
+# most header lines accepted in a request
+MAX_HEADER_LINES = 100
+
+# largest image drawn, in pixels
+MAX_IMAGE_SIZE = 8000
+
+# a Content-Length, and the size at the start of a chunk: digits only, so no sign
+CONTENT_LENGTH_PATTERN = re.compile(r'[0-9]+\Z')
+CHUNK_SIZE_PATTERN = re.compile(r'[0-9A-Fa-f]+\Z')
+
+IMAGE_TYPES = {'svg': 'image/svg+xml', 'png': 'image/png'}
+
+STATUS_TEXT = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+	411: 'Length Required', 413: 'Payload Too Large', 500: 'Internal Server Error', 503: 'Service Unavailable'}
+
+
+class HTTPError(Exception):
+	""" Ends a request with an error status. """
+
+	'''
+	@param status (int), HTTP status code
+	@param message (string), explanation sent to the client
+	@param headers (dict), extra response headers
+	'''
+	def __init__(self, status, message, headers = None):
+		Exception.__init__(self, message)
+		self.status = status
+		self.message = message
+		self.headers = headers or {}
+
+
+class RequestBody:
+	""" RequestBody class for Text-to-Art Interpreter.
+
+	Reads the body of a request from its connection as it arrives, undoing chunked
+	transfer encoding. Used on the event loop.
+	"""
+
+	"""
+	Attributes:
+		reader: the connection's asyncio StreamReader
+		chunked: whether the body is sent in chunks of their own length
+		remaining: bytes left of the body, or of the current chunk if chunked
+		received: bytes read so far
+		finished: whether the whole body has been read
+		maxBytes: largest body accepted
+		timeout: seconds to wait for more of the body
+	"""
+
+	'''
+	Initializes the RequestBody object.
+
+	@param reader (StreamReader), the connection, just after the request headers
+	@param headers (dict), request headers with lower case names
+	@param maxBytes (int), largest body accepted
+	@param timeout (float), seconds to wait for more of the body
+	'''
+	def __init__(self, reader, headers, maxBytes = MAX_BODY, timeout = READ_TIMEOUT):
+		self.reader = reader
+		self.chunked = 'chunked' in headers.get('transfer-encoding', '').lower()
+		self.remaining = 0
+		if not self.chunked:
+			length = headers.get('content-length', '0').strip()
+			if not CONTENT_LENGTH_PATTERN.match(length):
+				raise HTTPError(400, 'Bad Content-Length')
+			self.remaining = int(length)
+		self.received = 0
+		self.finished = not self.chunked and self.remaining == 0
+		self.maxBytes = maxBytes
+		self.timeout = timeout
+		if self.remaining > maxBytes:
+			raise HTTPError(413, 'Uploads are limited to %d bytes' % maxBytes)
+
+	'''
+	reads the next part of the body
+
+	@param size (int), most bytes returned
+	@return data (bytes), the next bytes of the body, or b'' at its end
+	'''
+	async def read(self, size):
+		if self.finished:
+			return b''
+		if self.chunked and self.remaining == 0:
+			line = await self.readLine()
+			chunkSize = line.split(b';')[0].strip().decode('latin-1')
+			if not CHUNK_SIZE_PATTERN.match(chunkSize):
+				raise HTTPError(400, 'Bad chunk size')
+			self.remaining = int(chunkSize, 16)
+			if self.remaining == 0:
+				# skip the trailer
+				while (await self.readLine()).strip():
+					pass
+				self.finished = True
+				return b''
+
+		data = await asyncio.wait_for(self.reader.read(min(size, self.remaining)), self.timeout)
+		if not data:
+			raise HTTPError(400, 'The upload ended early')
+		self.remaining -= len(data)
+		self.received += len(data)
+		if self.received > self.maxBytes:
+			raise HTTPError(413, 'Uploads are limited to %d bytes' % self.maxBytes)
+		if self.remaining == 0:
+			if self.chunked:
+				await self.readLine()
+			else:
+				self.finished = True
+		return data
+
+	'''
+	@return line (bytes), the next line of the connection
+	'''
+	async def readLine(self):
+		return await asyncio.wait_for(self.reader.readline(), self.timeout)
+
+
+class BodyStream(io.RawIOBase):
+	""" BodyStream class for Text-to-Art Interpreter.
+
+	Binary file over a RequestBody, for a parser on a worker thread. Every read waits
+	for the event loop to read that part of the body from the connection, so an upload
+	is never held in memory whole, and a slow parser slows the client down.
+	"""
+
+	"""
+	Attributes:
+		body: the RequestBody read
+		loop: the event loop the body is read on
+	"""
+
+	'''
+	@param body (RequestBody), body to read
+	@param loop (AbstractEventLoop), event loop running the connection
+	'''
+	def __init__(self, body, loop):
+		io.RawIOBase.__init__(self)
+		self.body = body
+		self.loop = loop
+
+	def readable(self):
+		return True
+
+	'''
+	reads the next part of the body into a buffer; errors reading it are raised here
+
+	@param buffer (memoryview), buffer to fill
+	@return count (int), number of bytes read, 0 at the end of the body
+	'''
+	def readinto(self, buffer):
+		data = asyncio.run_coroutine_threadsafe(self.body.read(len(buffer)), self.loop).result()
+		buffer[:len(data)] = data
+		return len(data)
+
+
+class RenderService:
+	""" RenderService class for Text-to-Art Interpreter.
+
+	Serves one request per connection. A request holds one of maxRequests slots while
+	its upload is sampled (on a thread) and drawn (in a worker process); requests
+	waiting for a slot do not read their uploads, and once maxQueue are waiting new
+	requests get 503 with Retry-After. Every image comes with a Server-Timing header
+	giving the time spent waiting, sampling and drawing.
+	"""
+
+	"""
+	Attributes:
+		workers: number of worker processes drawing
+		maxRequests: number of requests worked on at once
+		maxQueue: number of requests which may wait for a slot
+		maxBody: largest upload accepted, in bytes
+		readTimeout: seconds to wait for the next part of a request
+		processes: pool of worker processes drawing the images
+		threads: pool of threads sampling the uploads
+		slots: semaphore of the requests being worked on, made when the service starts
+		waiting: number of requests waiting for a slot
+		active: number of requests being worked on
+		served: number of images sent
+		rejected: number of requests turned away because too many were waiting
+		failed: number of requests which ended with another error
+	"""
+
+	'''
+	Initializes the RenderService object; call start to begin serving.
+
+	@param workers (int), number of worker processes, defaults to one per core
+	@param maxRequests (int), number of requests worked on at once, defaults to twice workers
+	@param maxQueue (int), number of requests which may wait for a slot
+	@param maxBody (int), largest upload accepted, in bytes
+	@param readTimeout (float), seconds to wait for the next part of a request
+	'''
+	def __init__(self, workers = None, maxRequests = None, maxQueue = MAX_QUEUE, maxBody = MAX_BODY, readTimeout = READ_TIMEOUT):
+		self.workers = workers or multiprocessing.cpu_count()
+		# the uploads of the extra requests are sampled while the workers draw
+		self.maxRequests = maxRequests or 2 * self.workers
+		self.maxQueue = maxQueue
+		self.maxBody = maxBody
+		self.readTimeout = readTimeout
+		# forked workers would inherit the listening socket and keep the port after the service stops
+		context = multiprocessing.get_context('forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn')
+		self.processes = concurrent.futures.ProcessPoolExecutor(self.workers, mp_context = context)
+		self.threads = concurrent.futures.ThreadPoolExecutor(self.maxRequests)
+		self.slots = None
+		self.waiting = 0
+		self.active = 0
+		self.served = 0
+		self.rejected = 0
+		self.failed = 0
+
+	'''
+	starts listening; must be called from a running event loop
+
+	@param host (string), address to listen on
+	@param port (int), port to listen on, 0 for any free port
+	@return server (asyncio.Server), the listening server
+	'''
+	async def start(self, host = '127.0.0.1', port = DEFAULT_PORT):
+		self.slots = asyncio.Semaphore(self.maxRequests)
+		return await asyncio.start_server(self.handleConnection, host, port)
+
+	'''
+	stops the worker processes and threads
+
+	@return None
+	'''
+	def close(self):
+		self.processes.shutdown()
+		self.threads.shutdown()
+
+	'''
+	reads one request from a connection, answers it and closes the connection
+
+	@param reader (StreamReader), the connection's incoming side
+	@param writer (StreamWriter), the connection's outgoing side
+	@return None
+	'''
+	async def handleConnection(self, reader, writer):
+		try:
+			try:
+				method, target, headers = await self.readRequest(reader)
+				status, responseHeaders, content = await self.route(method, target, headers, reader)
+			except HTTPError as error:
+				if error.status == 503:
+					self.rejected += 1
+				else:
+					self.failed += 1
+				status = error.status
+				responseHeaders = dict(error.headers)
+				responseHeaders['Content-Type'] = 'text/plain; charset=utf-8'
+				content = (error.message + '\n').encode('utf-8')
+			except (ConnectionError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+				raise
+			except Exception as error:
+				self.failed += 1
+				status = 500
+				responseHeaders = {'Content-Type': 'text/plain; charset=utf-8'}
+				content = ('%s: %s\n' % (type(error).__name__, error)).encode('utf-8')
+			await self.respond(writer, status, responseHeaders, content)
+			if status != 200:
+				await self.linger(reader)
+		except (ConnectionError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+			pass
+		finally:
+			writer.close()
+
+	'''
+	reads the request line and headers
+
+	@param reader (StreamReader), the connection
+	@return (method, target, headers) (tuple), the headers in a dict with lower case names
+	'''
+	async def readRequest(self, reader):
+		line = await asyncio.wait_for(reader.readline(), self.readTimeout)
+		if not line:
+			raise ConnectionResetError('closed before sending a request')
+		try:
+			method, target, version = line.decode('latin-1').split()
+		except ValueError:
+			raise HTTPError(400, 'Bad request line')
+		headers = {}
+		for i in range(MAX_HEADER_LINES):
+			line = await asyncio.wait_for(reader.readline(), self.readTimeout)
+			if not line.strip():
+				return method, target, headers
+			name, separator, value = line.decode('latin-1').partition(':')
+			if not separator:
+				raise HTTPError(400, 'Bad header line')
+			headers[name.strip().lower()] = value.strip()
+		raise HTTPError(400, 'Too many headers')
+
+	'''
+	answers a request
+
+	@param method (string), request method
+	@param target (string), path and query of the request
+	@param headers (dict), request headers with lower case names
+	@param reader (StreamReader), the connection, at the start of the body
+	@return (status, headers, content) (tuple), the response
+	'''
+	async def route(self, method, target, headers, reader):
+		url = urlsplit(target)
+		if url.path == '/render':
+			if method != 'POST':
+				raise HTTPError(405, 'POST the text to /render', {'Allow': 'POST'})
+			return await self.render(parse_qs(url.query), headers, reader)
+		if url.path == '/health':
+			if method != 'GET':
+				raise HTTPError(405, 'GET /health', {'Allow': 'GET'})
+			counters = {'workers': self.workers, 'maxRequests': self.maxRequests, 'maxQueue': self.maxQueue,
+				'active': self.active, 'waiting': self.waiting, 'served': self.served,
+				'rejected': self.rejected, 'failed': self.failed}
+			return 200, {'Content-Type': 'application/json'}, json.dumps(counters).encode('utf-8')
+		raise HTTPError(404, 'Unknown path %s' % url.path)
+
+	'''
+	Draws the text uploaded with a request. Query parameters: format (svg or png), width
+		and height (image size in pixels, the GUI's canvas by default) and sampleSize.
+		The upload's charset is taken from its Content-Type header.
+
+	@param query (dict), query parameters, as parse_qs gives them
+	@param headers (dict), request headers with lower case names
+	@param reader (StreamReader), the connection, at the start of the body
+	@return (status, headers, content) (tuple), the response
+	'''
+	async def render(self, query, headers, reader):
+		imageFormat = query.get('format', ['svg'])[0]
+		if imageFormat not in IMAGE_TYPES:
+			raise HTTPError(400, 'format must be svg or png')
+		try:
+			width = int(query.get('width', [drawer.CANVAS_WIDTH])[0])
+			height = int(query.get('height', [drawer.CANVAS_HEIGHT])[0])
+			sampleSize = int(query.get('sampleSize', [parser.SAMPLE_THRESHOLD])[0])
+		except ValueError:
+			raise HTTPError(400, 'width, height and sampleSize must be whole numbers')
+		if not (drawer.REDUCED_WIDTH < width <= MAX_IMAGE_SIZE and drawer.REDUCED_HEIGHT < height <= MAX_IMAGE_SIZE and sampleSize > 0):
+			raise HTTPError(400, 'width must be %d to %d, height %d to %d and sampleSize positive'
+				% (drawer.REDUCED_WIDTH + 1, MAX_IMAGE_SIZE, drawer.REDUCED_HEIGHT + 1, MAX_IMAGE_SIZE))
+		if 'content-length' not in headers and 'chunked' not in headers.get('transfer-encoding', '').lower():
+			raise HTTPError(411, 'Send a Content-Length or a chunked upload')
+		encoding = None
+		for parameter in headers.get('content-type', '').split(';')[1:]:
+			name, separator, value = parameter.partition('=')
+			if name.strip().lower() == 'charset':
+				encoding = value.strip().strip('"')
+		if encoding is not None:
+			try:
+				# codecs such as base64 are found too, but do not decode to text
+				if not isinstance(codecs.decode(b'', codecs.lookup(encoding).name), str):
+					raise LookupError(encoding)
+			except LookupError:
+				raise HTTPError(400, 'Unknown charset %s' % encoding)
+
+		# backpressure: a waiting request's upload stays unread, and too many waiting are turned away
+		if self.waiting >= self.maxQueue:
+			raise HTTPError(503, 'Too many requests, try again later', {'Retry-After': '1'})
+		queued = time.time()
+		self.waiting += 1
+		try:
+			await self.slots.acquire()
+		finally:
+			self.waiting -= 1
+
+		loop = asyncio.get_running_loop()
+		started = time.time()
+		self.active += 1
+		try:
+			body = RequestBody(reader, headers, self.maxBody, self.readTimeout)
+			characters, length = await loop.run_in_executor(self.threads, sampleUpload,
+				BodyStream(body, loop), encoding, sampleSize)
+			sampled = time.time()
+			image = await loop.run_in_executor(self.processes, renderImage, characters, imageFormat, width, height)
+			drawn = time.time()
+		finally:
+			self.active -= 1
+			self.slots.release()
+
+		self.served += 1
+		responseHeaders = {'Content-Type': IMAGE_TYPES[imageFormat],
+			'Server-Timing': 'queue;dur=%.1f, parse;dur=%.1f, draw;dur=%.1f, total;dur=%.1f'
+				% tuple(1000 * seconds for seconds in (started - queued, sampled - started, drawn - sampled, drawn - queued)),
+			'X-Characters': str(length), 'X-Sample-Size': str(len(characters))}
+		return 200, responseHeaders, image
+
+	'''
+	writes a response
+
+	@param writer (StreamWriter), the connection
+	@param status (int), HTTP status code
+	@param headers (dict), response headers
+	@param content (bytes), response body
+	@return None
+	'''
+	async def respond(self, writer, status, headers, content):
+		lines = ['HTTP/1.1 %d %s' % (status, STATUS_TEXT.get(status, '')),
+			'Content-Length: %d' % len(content), 'Connection: close']
+		lines.extend('%s: %s' % (name, value) for name, value in sorted(headers.items()))
+		writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + content)
+		await writer.drain()
+
+	'''
+	reads and throws away what the client still sends after an error response for a while,
+		since closing with unread data would reset the connection before the client reads it
+
+	@param reader (StreamReader), the connection
+	@return None
+	'''
+	async def linger(self, reader):
+		deadline = time.time() + LINGER_SECONDS
+		while time.time() < deadline:
+			try:
+				data = await asyncio.wait_for(reader.read(BODY_CHUNK), deadline - time.time())
+			except asyncio.TimeoutError:
+				return
+			if not data:
+				return
+
+
+'''
+Samples an upload as it is read. Runs on a worker thread.
+
+@param stream (BodyStream), the upload
+@param encoding (string), its encoding, or None to go by its byte order mark like a file
+@param sampleSize (int), uploads with more characters than this are sampled
+@return (characters, length) (tuple), the representative characters and the number of
+	non-whitespace characters uploaded
+@raises HTTPError 400 if the upload cannot be decoded in its charset
+'''
+def sampleUpload(stream, encoding, sampleSize):
+	try:
+		streamParser = parser.StreamingParser('-', stream = stream, chunkSize = BODY_CHUNK, sampleSize = sampleSize, encoding = encoding)
+	except UnicodeError as error:
+		raise HTTPError(400, 'Upload is not valid %s: %s' % (encoding, error))
+	return streamParser.get_characters_list(), streamParser.file_length
+
+'''
+Draws representative characters as an image, the way the GUI draws them. Runs in a
+	worker process.
+
+@param characters (list), representative characters
+@param imageFormat (string), 'svg' or 'png'
+@param width (int), image width in pixels
+@param height (int), image height in pixels
+@return image (bytes), the image file
+'''
+def renderImage(characters, imageFormat, width, height):
+	if imageFormat == 'png':
+		sink = thumbnail.RasterSink(width, height, canvasWidth = width)
+	else:
+		output = io.StringIO()
+		sink = exporter.SVGExporter(output, width, height)
+	try:
+		pen = penturtle.PenTurtle(sink)
+		drawer.Drawer(characters, pen, width - drawer.REDUCED_WIDTH, height - drawer.REDUCED_HEIGHT, maxLetters = None).draw()
+	finally:
+		if imageFormat != 'png':
+			sink.close()
+	if imageFormat == 'png':
+		return sink.pngData(6)
+	return output.getvalue().encode('utf-8')
+
+'''
+runs the service until interrupted
+
+@param service (RenderService), the service
+@param host (string), address to listen on
+@param port (int), port to listen on
+@return None
+'''
+async def serve(service, host, port):
+	server = await service.start(host, port)
+	try:
+		# stop like on Ctrl-C when terminated, so the workers are stopped too
+		asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, server.close)
+	except NotImplementedError:
+		# Windows
+		pass
+	print ("Serving on http://%s:%d/render with %d workers" % (host, port, service.workers))
+	sys.stdout.flush()
+	async with server:
+		try:
+			await server.serve_forever()
+		except asyncio.CancelledError:
+			pass
+
+'''
+Command line entry point.
+
+@param argv (list), command line arguments, defaults to sys.argv[1:]
+@return exit status (int)
+'''
+def main(argv = None):
+	argParser = argparse.ArgumentParser(description = 'Serve drawings of text over HTTP.')
+	argParser.add_argument('--host', default = '127.0.0.1', help = 'address to listen on (default: only this computer)')
+	argParser.add_argument('--port', type = int, default = DEFAULT_PORT, help = 'port to listen on')
+	argParser.add_argument('-j', '--workers', type = int, default = None, help = 'number of worker processes (default: all cores)')
+	argParser.add_argument('--max-requests', type = int, default = None, help = 'requests worked on at once (default: twice the workers)')
+	argParser.add_argument('--max-queue', type = int, default = MAX_QUEUE, help = 'requests which may wait before new ones get 503')
+	argParser.add_argument('--max-body', type = int, default = MAX_BODY, help = 'largest upload in bytes')
+	args = argParser.parse_args(argv)
+
+	service = RenderService(args.workers, args.max_requests, args.max_queue, args.max_body)
+	try:
+		asyncio.run(serve(service, args.host, args.port))
+	except KeyboardInterrupt:
+		pass
+	finally:
+		service.close()
+	return 0
+
+if __name__ == '__main__':
+	sys.exit(main())
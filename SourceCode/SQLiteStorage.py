@@ -0,0 +1,280 @@
+##
+# SQLiteStorage class, a DataStorage backend which keeps the application's past drawings
+#	in an SQLite database, for histories too large for the index and data files.
+#
+# Adam Carlson
+# 10/18/2026
+#
+##
+
+# library dependencies
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+# our custom classes
+import DataStorage as storage
+
+""" CONSTANTS """
+
+# statements creating the tables; each blob holds the zlib compressed characters of
+# all the drawings with its content hash
+SCHEMA = (
+	'''CREATE TABLE blobs (
+		digest TEXT PRIMARY KEY,
+		data BLOB NOT NULL
+	)''',
+	'''CREATE TABLE drawings (
+		id INTEGER PRIMARY KEY,
+		filename TEXT NOT NULL,
+		saved REAL NOT NULL,
+		digest TEXT NOT NULL REFERENCES blobs (digest)
+	)''',
+	'CREATE INDEX drawings_filename ON drawings (filename)',
+	'CREATE INDEX drawings_saved ON drawings (saved)',
+	'CREATE INDEX drawings_digest ON drawings (digest)',
+)
+
+# user_version of a database whose tables are made and into which the DataStorage
+# files were imported
+SCHEMA_VERSION = 1
+
+class SQLiteStorage:
+	""" SQLiteStorage class for Text-to-Art Interpreter.
+
+	Has the same interface as DataStorage, plus paged listing, lookups by filename
+	and by save time, and bulk inserts in a single transaction. Drawings are never
+	deleted, so the number of a drawing is its row id minus one, the same as its
+	position in listDrawings().
+	
+	Like DataStorage, the characters are stored compressed with zlib, once per content:
+	each drawing names the blob of its content hash. A blob no drawing names any more
+	is deleted straight away, so its pages are reused.
+	"""
+
+	"""
+	Attributes:
+		databaseName: filename of the SQLite database
+		connection: the open database connection
+		readers: connection of each thread which loads drawings, such as the thumbnail
+			worker's, since an SQLite connection is only used on the thread which opened it
+	"""
+
+	'''
+	Initializes the SQLiteStorage object, creating the database if needed.
+
+	@param databaseName (string), filename of the SQLite database
+	@param fileStorageName (string), old-style storage file whose drawings are imported into a new database
+	'''
+	def __init__(self, databaseName = 'drawings.db', fileStorageName = 'drawings.txt'):
+		self.databaseName = databaseName
+		self.connection = sqlite3.connect(databaseName)
+		self.readers = threading.local()
+		self.readers.connection = self.connection
+		# write-ahead logging lets readers continue while a drawing is saved
+		self.connection.execute('PRAGMA journal_mode=WAL')
+		if self.connection.execute('PRAGMA user_version').fetchone()[0] < SCHEMA_VERSION:
+			self.create(fileStorageName)
+
+	'''
+	Creates the tables of a new database and fills them with the drawings of the
+		DataStorage files next to it, which are only read. It is one transaction which
+		also sets the database's user_version, so if it fails it is tried again the next
+		time.
+	
+	@param fileStorageName (string), old-style storage file the DataStorage files are named after
+	@returns None
+	'''
+	def create(self, fileStorageName):
+		drawings = storage.DataStorage(fileStorageName).readData()
+		with self.connection:
+			# DDL only starts a transaction of its own when asked to
+			self.connection.execute('BEGIN')
+			for statement in SCHEMA:
+				self.connection.execute(statement)
+			self.insertDrawings(drawings, time.time())
+			self.connection.execute('PRAGMA user_version = %d' % SCHEMA_VERSION)
+	
+	'''
+	@returns count (int), number of saved drawings
+	'''
+	def countDrawings(self):
+		return self.connection.execute('SELECT COUNT(*) FROM drawings').fetchone()[0]
+
+	'''
+	Lists the filenames of past drawings, without loading their characters.
+
+	@param offset (int), number of the first drawing listed
+	@param limit (int), maximum number of drawings listed, or None for all
+	@returns a list of filenames; the drawing numbers are offset, offset + 1, ...
+	'''
+	def listDrawings(self, offset = 0, limit = None):
+		rows = self.connection.execute('SELECT filename FROM drawings WHERE id > ? ORDER BY id LIMIT ?',
+			(offset, -1 if limit is None else limit))
+		return [row[0] for row in rows]
+
+	'''
+	Loads the characters of one past drawing. It can be called from any thread; other
+		threads than the one which opened the database read with their own connection,
+		and see the drawings once they are saved.
+
+	@param number (int), number of the drawing, its position in listDrawings()
+	@returns a list of representative chars for the drawing, e.g. ['a', 'e', 'q', ...]
+	'''
+	def loadDrawing(self, number):
+		connection = getattr(self.readers, 'connection', None)
+		if connection is None:
+			connection = self.readers.connection = sqlite3.connect(self.databaseName)
+		row = connection.execute('SELECT data FROM drawings JOIN blobs USING (digest) WHERE id = ?',
+			(number + 1,)).fetchone()
+		if row is None:
+			raise IndexError("No drawing number %d" % number)
+		return list(self.readBlob(row[0]))
+	
+	'''
+	@param data (bytes), a blob, the compressed characters of a drawing
+	@returns characters (string), the characters
+	'''
+	def readBlob(self, data):
+		return zlib.decompress(data).decode('utf-8')
+
+	'''
+	Finds the drawings of a text file.
+
+	@param filename (string), name of the text file
+	@returns a list of drawing numbers, oldest first
+	'''
+	def findByFilename(self, filename):
+		rows = self.connection.execute('SELECT id FROM drawings WHERE filename = ? ORDER BY id', (filename,))
+		return [row[0] - 1 for row in rows]
+
+	'''
+	Finds the drawings saved during a period of time.
+
+	@param start (float), earliest save time, in seconds since the epoch
+	@param end (float), latest save time, or None for up to now
+	@returns a list of drawing numbers, oldest first
+	'''
+	def findBySaveTime(self, start, end = None):
+		if end is None:
+			end = time.time()
+		rows = self.connection.execute('SELECT id FROM drawings WHERE saved BETWEEN ? AND ? ORDER BY id', (start, end))
+		return [row[0] - 1 for row in rows]
+
+	'''
+	Retrieves all past drawings.
+
+	@returns an array of tuples, each with the form (filename, ['a', 'e', 'q', ...])
+	'''
+	def getData(self):
+		rows = self.connection.execute('SELECT filename, data FROM drawings JOIN blobs USING (digest) ORDER BY id')
+		return [(filename, list(self.readBlob(data))) for filename, data in rows]
+
+	'''
+	Saves a drawing to the database, without waiting for the disk (see saveMany).
+
+	@param drawingData (list), list of representative characters for the text we are drawing
+	@param filename (string), name of the text file we were drawing
+	@returns number (int), number of the new drawing
+	'''
+	def saveData(self, drawingData, filename):
+		return self.saveMany([(filename, drawingData)], sync = False)[0]
+
+	'''
+	Saves many drawings in one transaction: either all of them are saved or none.
+
+	@param drawings (iterable), (filename, drawingData) tuples like the ones getData returns
+	@param sync (bool), whether to sync the transaction to disk before returning; without
+		it the transaction survives a crash of the application but not of the system
+	@returns numbers (list), numbers of the new drawings
+	'''
+	def saveMany(self, drawings, sync = True):
+		# with write-ahead logging, NORMAL only syncs at checkpoints
+		self.connection.execute('PRAGMA synchronous = %s' % ('FULL' if sync else 'NORMAL'))
+		with self.connection:
+			return self.insertDrawings(drawings, time.time())
+	
+	'''
+	Inserts drawings in the current transaction, without committing it.
+	
+	@param drawings (iterable), (filename, drawingData) tuples like the ones getData returns
+	@param saved (float), save time of the drawings, in seconds since the epoch
+	@returns numbers (list), numbers of the new drawings
+	'''
+	def insertDrawings(self, drawings, saved):
+		numbers = []
+		for filename, drawingData in drawings:
+			cursor = self.connection.execute('INSERT INTO drawings (filename, saved, digest) VALUES (?, ?, ?)',
+				(filename, saved, self.insertBlob(''.join(drawingData))))
+			numbers.append(cursor.lastrowid - 1)
+		return numbers
+	
+	'''
+	Finds the blob of some characters, compressing and inserting it in the current
+		transaction if it is not stored yet.
+	
+	@param characters (string), representative characters
+	@returns digest (string), their content hash
+	'''
+	def insertBlob(self, characters):
+		data = characters.encode('utf-8')
+		digest = hashlib.sha1(data).hexdigest()
+		if self.connection.execute('SELECT 1 FROM blobs WHERE digest = ?', (digest,)).fetchone() is None:
+			self.connection.execute('INSERT INTO blobs (digest, data) VALUES (?, ?)',
+				(digest, zlib.compress(data, storage.COMPRESSION_LEVEL)))
+		return digest
+
+	'''
+	Adds characters to the end of a saved drawing, for a text file which has grown.
+		Compressed blobs cannot be added to, so the drawing gets a new blob and the old
+		one is deleted if no other drawing has it.
+
+	@param number (int), number of the drawing, its position in listDrawings()
+	@param newCharacters (list), representative characters to add
+	@returns None
+	'''
+	def extendDrawing(self, number, newCharacters):
+		self.replaceDrawing(number, self.loadDrawing(number) + list(newCharacters))
+
+	'''
+	Replaces the characters of a saved drawing.
+
+	@param number (int), number of the drawing, its position in listDrawings()
+	@param drawingData (list), the drawing's new representative characters
+	@returns None
+	'''
+	def replaceDrawing(self, number, drawingData):
+		with self.connection:
+			row = self.connection.execute('SELECT digest FROM drawings WHERE id = ?', (number + 1,)).fetchone()
+			if row is None:
+				raise IndexError("No drawing number %d" % number)
+			self.connection.execute('UPDATE drawings SET digest = ? WHERE id = ?',
+				(self.insertBlob(''.join(drawingData)), number + 1))
+			self.connection.execute('DELETE FROM blobs WHERE digest = ? AND digest NOT IN (SELECT digest FROM drawings)',
+				(row[0],))
+
+	'''
+	Deletes the blobs no drawing has, and rewrites the database file without the space
+		left by replaced drawings. Run it while the application is not running.
+
+	@returns (before, after) (tuple), size of the database file in bytes before and after
+	'''
+	def compact(self):
+		before = os.path.getsize(self.databaseName)
+		with self.connection:
+			self.connection.execute('DELETE FROM blobs WHERE digest NOT IN (SELECT digest FROM drawings)')
+		self.connection.execute('VACUUM')
+		# with write-ahead logging the smaller database is only written back at a checkpoint
+		self.connection.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+		return before, os.path.getsize(self.databaseName)
+
+	'''
+	closes the database connection
+
+	@returns None
+	'''
+	def close(self):
+		self.connection.close()
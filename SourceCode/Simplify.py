@@ -0,0 +1,94 @@
+##
+# Level-of-detail path simplification. Drawings of many letters bounce off the canvas
+#	edges again and again, and most of their lines end up shorter than a pixel or in line
+#	with the one before. These functions drop the points of a polyline which change
+#	nothing at a given tolerance, first the ones in line with their neighbours and then
+#	the ones closer than the tolerance to the simplified line (Douglas-Peucker).
+#
+# Adam Carlson
+# 10/18/2026
+#
+##
+
+""" CONSTANTS """
+
+# largest distance in pixels a simplified line may stray from the pen's path; half a
+# pixel is not visible
+DEFAULT_TOLERANCE = 0.5
+
+# how far from a straight line, relative to the lengths of the lines, two lines still
+# count as one; absorbs the rounding of the pen's position
+COLLINEAR_EPSILON = 1e-9
+
+'''
+Drops the points of a polyline where it goes straight on. A point where the pen turns
+	back along the line it came is kept, since the line it leaves behind is drawn.
+
+@param points (list), x and y coordinates of the corners
+@return points (list), the corners where the polyline turns
+'''
+def mergeCollinear(points):
+	if len(points) < 3:
+		return list(points)
+	merged = [points[0]]
+	last = points[0]
+	for i in range(1, len(points) - 1):
+		point = points[i]
+		nextPoint = points[i + 1]
+		ax, ay = point[0] - last[0], point[1] - last[1]
+		bx, by = nextPoint[0] - point[0], nextPoint[1] - point[1]
+		cross = ax * by - ay * bx
+		dot = ax * bx + ay * by
+		if (ax == 0 and ay == 0) or (bx == 0 and by == 0) or \
+				(dot > 0 and abs(cross) <= COLLINEAR_EPSILON * (ax * ax + ay * ay + bx * bx + by * by)):
+			# a repeated point, or the pen keeps going the same way
+			continue
+		merged.append(point)
+		last = point
+	merged.append(points[-1])
+	return merged
+
+'''
+Simplifies a polyline so it strays at most tolerance from the original, keeping its
+	first and last points.
+
+@param points (list), x and y coordinates of the corners
+@param tolerance (float), largest distance allowed from the original, in its units;
+	0 only merges points in line
+@return points (list), the corners kept, in order
+'''
+def simplify(points, tolerance):
+	points = mergeCollinear(points)
+	count = len(points)
+	if tolerance <= 0 or count < 3:
+		return points
+	keep = [False] * count
+	keep[0] = keep[-1] = True
+	limit = tolerance * tolerance
+	# ranges still to simplify, instead of recursion, so long runs cannot overflow the stack
+	ranges = [(0, count - 1)]
+	while ranges:
+		first, last = ranges.pop()
+		ax, ay = points[first]
+		dx, dy = points[last][0] - ax, points[last][1] - ay
+		length = dx * dx + dy * dy
+		farthest = limit
+		index = None
+		for i in range(first + 1, last):
+			px, py = points[i]
+			# distance to the line segment, not the infinite line, as the pen may turn back
+			t = 0.0
+			if length > 0:
+				t = ((px - ax) * dx + (py - ay) * dy) / length
+				t = 0.0 if t < 0.0 else 1.0 if t > 1.0 else t
+			ex = ax + t * dx - px
+			ey = ay + t * dy - py
+			distance = ex * ex + ey * ey
+			if distance > farthest:
+				farthest = distance
+				index = i
+		if index is not None:
+			keep[index] = True
+			ranges.append((first, index))
+			ranges.append((index, last))
+	return [point for point, kept in zip(points, keep) if kept]
@@ -0,0 +1,184 @@
+##
+# SegmentGrid class, a pen sink which keeps a drawing as pieces in normalized coordinates
+#	with a uniform grid over them, so the pieces inside any rectangle, such as the part
+#	of a drawing in view, are found without looking at the rest
+#
+# Wallis Muraca
+# 10/18/2026
+#
+##
+
+# library dependency
+import time
+
+# our custom classes
+import Drawer as drawer
+import Exporter as exporter
+import PenTurtle as penturtle
+
+""" CONSTANTS """
+
+# longest polyline kept as one piece; short pieces let a zoomed in view skip most of a long line
+PIECE_POINTS = 64
+
+# number of grid cells along each axis, and the normalized coordinates they cover: the
+# drawing area is within -0.5 and 0.5, pieces beyond GRID_EXTENT go in the edge cells
+GRID_CELLS = 64
+GRID_EXTENT = 1.0
+
+# kinds of pieces
+LINE = 0
+CIRCLE = 1
+
+class SegmentGrid(exporter.PolylineSink):
+	""" SegmentGrid class for Text-to-Art Interpreter.
+
+	Used as the sink of a PenTurtle. Lines of one color are joined into polylines like
+	the other sinks do, without their points in line (see Simplify.mergeCollinear), and
+	every polyline of at most maxPoints points and every circle becomes a piece.
+	Coordinates are divided by unit, the larger side of the area the drawing was drawn
+	in, so they do not depend on the canvas or window size; the y-axis points up like
+	turtle's. Every piece is listed in the grid cells its bounding box
+	covers. Pieces are numbered in the order they were drawn.
+	"""
+
+	"""
+	Attributes:
+		unit: drawing units in one normalized unit
+		cells: number of grid cells along each axis
+		pieces: (kind, color, coordinates) of every piece, where coordinates are the
+			x, y pairs of a LINE one after the other, or the center x, y and radius of a CIRCLE
+		boxes: bounding box (left, bottom, right, top) of every piece
+		grid: numbers of the pieces in each cell, by (column, row)
+	"""
+
+	'''
+	Initializes the SegmentGrid object.
+
+	@param unit (float), size of the drawing area in drawing units, such as the width
+		given to the Drawer, which becomes 1 in normalized coordinates
+	@param maxPoints (int), longest polyline kept as one piece
+	@param cells (int), number of grid cells along each axis
+	'''
+	def __init__(self, unit, maxPoints = PIECE_POINTS, cells = GRID_CELLS):
+		# a tolerance of 0 only drops points in line, which changes nothing at any zoom
+		exporter.PolylineSink.__init__(self, maxPoints, 0)
+		self.unit = float(unit)
+		self.cells = cells
+		self.pieces = []
+		self.boxes = []
+		self.grid = {}
+
+	'''
+	@return count (int), number of pieces kept so far
+	'''
+	def pieceCount(self):
+		return len(self.pieces)
+
+	'''
+	keeps a circle as one piece
+
+	@param center (tuple), x and y coordinates of the center
+	@param radius (float), circle radius
+	@param points (list), corners of the polygon turtle would draw, not kept
+	@param color (string), pen color
+	@return None
+	'''
+	def circle(self, center, radius, points, color):
+		self.flush()
+		self.segments += len(points) - 1
+		unit = self.unit
+		x, y, r = center[0] / unit, center[1] / unit, radius / unit
+		self.addPiece(CIRCLE, color, (x, y, r), (x - r, y - r, x + r, y + r))
+
+	def writePolyline(self, color, points):
+		unit = self.unit
+		coordinates = []
+		for x, y in points:
+			coordinates.append(x / unit)
+			coordinates.append(y / unit)
+		xs = coordinates[0::2]
+		ys = coordinates[1::2]
+		self.addPiece(LINE, color, tuple(coordinates), (min(xs), min(ys), max(xs), max(ys)))
+
+	'''
+	keeps a piece and lists it in the cells its bounding box covers
+
+	@param kind (int), LINE or CIRCLE
+	@param color (string), pen color
+	@param coordinates (tuple), normalized coordinates, see pieces
+	@param box (tuple), normalized bounding box (left, bottom, right, top)
+	@return number (int), number of the piece
+	'''
+	def addPiece(self, kind, color, coordinates, box):
+		number = len(self.pieces)
+		self.pieces.append((kind, color, coordinates))
+		self.boxes.append(box)
+		left, bottom, right, top = self.cellRange(box)
+		for column in range(left, right + 1):
+			for row in range(bottom, top + 1):
+				self.grid.setdefault((column, row), []).append(number)
+		return number
+
+	'''
+	@param box (tuple), normalized rectangle (left, bottom, right, top)
+	@return (left, bottom, right, top) (tuple), first and last column and row of the cells it covers
+	'''
+	def cellRange(self, box):
+		cells = self.cells
+		size = 2.0 * GRID_EXTENT / cells
+		def cell(value):
+			return min(cells - 1, max(0, int((value + GRID_EXTENT) // size)))
+		return cell(box[0]), cell(box[1]), cell(box[2]), cell(box[3])
+
+	'''
+	Finds the pieces which may show inside a rectangle: those whose bounding box meets it.
+
+	@param box (tuple), normalized rectangle (left, bottom, right, top)
+	@return numbers (list), numbers of the pieces, in the order they were drawn
+	'''
+	def query(self, box):
+		left, bottom, right, top = self.cellRange(box)
+		found = set()
+		grid = self.grid
+		for column in range(left, right + 1):
+			for row in range(bottom, top + 1):
+				found.update(grid.get((column, row), ()))
+		boxes = self.boxes
+		return sorted(number for number in found if intersects(boxes[number], box))
+
+	'''
+	@return box (tuple), normalized bounding box (left, bottom, right, top) of all pieces,
+		or None if there are none
+	'''
+	def bounds(self):
+		if not self.boxes:
+			return None
+		return (min(box[0] for box in self.boxes), min(box[1] for box in self.boxes),
+			max(box[2] for box in self.boxes), max(box[3] for box in self.boxes))
+
+'''
+@param first (tuple), rectangle (left, bottom, right, top)
+@param second (tuple), another rectangle
+@return overlap (bool), whether the rectangles meet
+'''
+def intersects(first, second):
+	return first[0] <= second[2] and second[0] <= first[2] and first[1] <= second[3] and second[1] <= first[3]
+
+'''
+Draws representative characters into a SegmentGrid, so another process can show the
+	drawing without drawing it again (see CanvasRenderer.addPiece). Runs in a worker process.
+
+@param job (tuple), (characters, drawing width, drawing height, maxLetters), with the
+	characters as one string
+@return (pieces, boxes, seconds) (tuple), the pieces of the drawing and their bounding
+	boxes, see SegmentGrid, and the seconds it took
+'''
+def drawPieces(job):
+	characters, width, height, maxLetters = job
+	start = time.time()
+	grid = SegmentGrid(max(width, height))
+	pen = penturtle.PenTurtle(grid)
+	drawer.Drawer(list(characters), pen, width, height, maxLetters = maxLetters).draw()
+	grid.flush()
+	return grid.pieces, grid.boxes, time.time() - start
@@ -0,0 +1,142 @@
+##
+# StartupBenchmark: measures how quickly the program starts with a long history of
+# Previous Drawings, and checks the times against the startup targets.
+#
+# Usage: python StartupBenchmark.py [-n DRAWINGS] [--runs RUNS]
+#
+# Targets, with 10000 Previous Drawings:
+#	importing the drawing core (Parser, Drawer, DataStorage, PenTurtle, Exporter)
+#		without a display: at most 0.05 s, and Tk/turtle are not imported
+#	from launching main.py until the window is shown: at most 0.5 s
+#	from launching main.py until all Previous Drawings are listed: at most 1.5 s
+# The window times are only measured when a display is available.
+#
+# Wallis Muraca
+# 10/18/2026
+#
+##
+
+# library dependencies
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+# our custom classes
+import DataStorage as storage
+
+""" CONSTANTS """
+
+TARGET_IMPORT_SECONDS = 0.05
+TARGET_WINDOW_SECONDS = 0.5
+TARGET_HISTORY_SECONDS = 1.5
+
+# modules the headless tools import
+CORE_MODULES = ['Parser', 'Drawer', 'DataStorage', 'PenTurtle', 'Exporter']
+
+SOURCE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# run in a fresh interpreter: times the core imports and prints whether Tk came with them
+IMPORT_SCRIPT = '''
+import sys, time
+sys.path.insert(0, %r)
+start = time.time()
+for name in %r:
+	__import__(name)
+print ('%%f %%d' %% (time.time() - start, 'tkinter' in sys.modules or 'Tkinter' in sys.modules or 'turtle' in sys.modules))
+'''
+
+'''
+Saves a history of made-up drawings in a directory.
+
+@param directory (string), directory the storage files are written to
+@param count (int), number of drawings saved
+@return None
+'''
+def makeHistory(directory, count):
+	history = storage.DataStorage(os.path.join(directory, 'drawings.txt'))
+	for number in range(count):
+		history.saveData(list('abcdefghij' * 100), 'drawing%d.txt' % number)
+
+'''
+Times importing the drawing core in a new interpreter.
+
+@return (seconds, usesTk) (tuple), import time and whether Tk or turtle was imported
+'''
+def timeCoreImport():
+	output = subprocess.check_output([sys.executable, '-c', IMPORT_SCRIPT % (SOURCE_DIR, CORE_MODULES)])
+	seconds, usesTk = output.decode().split()
+	return float(seconds), usesTk == '1'
+
+'''
+Launches the GUI with --report-startup and times it.
+
+@param directory (string), directory holding the history, where the GUI is run
+@return (window, history) (tuple), seconds from launch until the window is shown and
+	until all Previous Drawings are listed
+'''
+def timeWindow(directory):
+	start = time.time()
+	output = subprocess.check_output([sys.executable, os.path.join(SOURCE_DIR, 'main.py'), '--report-startup'],
+		cwd = directory)
+	times = dict(line.split() for line in output.decode().splitlines() if line.startswith(('window ', 'history ')))
+	return float(times['window']) - start, float(times['history']) - start
+
+'''
+@return available (bool), whether a window can be opened
+'''
+def hasDisplay():
+	if sys.platform.startswith('linux'):
+		return bool(os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY'))
+	return True
+
+'''
+Command line entry point.
+
+@param argv (list), command line arguments, defaults to sys.argv[1:]
+@return exit status (int), 1 if a target was missed, else 0
+'''
+def main(argv = None):
+	argParser = argparse.ArgumentParser(description = 'Measure startup time against the targets.')
+	argParser.add_argument('-n', '--drawings', type = int, default = 10000, help = 'number of Previous Drawings')
+	argParser.add_argument('--runs', type = int, default = 5, help = 'number of runs; the best time counts')
+	args = argParser.parse_args(argv)
+
+	missed = []
+	imports = [timeCoreImport() for run in range(args.runs)]
+	importSeconds = min(seconds for seconds, usesTk in imports)
+	print ("Core import: %.3f s (target %.3f s)" % (importSeconds, TARGET_IMPORT_SECONDS))
+	if importSeconds > TARGET_IMPORT_SECONDS:
+		missed.append('core import')
+	if any(usesTk for seconds, usesTk in imports):
+		print ("Core import loads Tk or turtle")
+		missed.append('headless core')
+
+	if not hasDisplay():
+		print ("No display, window startup not measured")
+	else:
+		directory = tempfile.mkdtemp()
+		try:
+			makeHistory(directory, args.drawings)
+			times = [timeWindow(directory) for run in range(args.runs)]
+		finally:
+			shutil.rmtree(directory)
+		windowSeconds = min(window for window, history in times)
+		historySeconds = min(history for window, history in times)
+		print ("Window shown: %.3f s (target %.3f s)" % (windowSeconds, TARGET_WINDOW_SECONDS))
+		print ("%d drawings listed: %.3f s (target %.3f s)" % (args.drawings, historySeconds, TARGET_HISTORY_SECONDS))
+		if windowSeconds > TARGET_WINDOW_SECONDS:
+			missed.append('window')
+		if historySeconds > TARGET_HISTORY_SECONDS:
+			missed.append('history')
+
+	if missed:
+		print ("Missed targets: %s" % ', '.join(missed))
+		return 1
+	return 0
+
+if __name__ == '__main__':
+	sys.exit(main())
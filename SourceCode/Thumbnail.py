@@ -0,0 +1,271 @@
+##
+# Thumbnail classes which draw small previews of drawings without a display, and keep
+#	them on disk as PNG images named by the content hash of the drawing's characters.
+#	The GUI has them drawn by a ThumbnailWorker thread, so it never waits for one.
+#
+# Wallis Muraca
+# 10/18/2026
+#
+##
+
+# library dependencies
+import os
+import struct
+import threading
+import zlib
+try:
+	import queue
+except ImportError:
+	import Queue as queue
+
+# our custom classes
+import DataStorage as storage
+import Drawer as drawer
+import Exporter as exporter
+import PenTurtle as penturtle
+
+""" CONSTANTS """
+
+# thumbnail size in pixels, the shape of the GUI's canvas
+THUMBNAIL_WIDTH = 80
+THUMBNAIL_HEIGHT = 45
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+class RasterSink:
+	""" RasterSink class for Text-to-Art Interpreter.
+
+	Pen sink which draws straight into a small RGB pixel buffer, scaled down from the
+	canvas size. Lines are one pixel wide; circles are drawn as the polygons turtle draws.
+	"""
+
+	"""
+	Attributes:
+		width: image width in pixels
+		height: image height in pixels
+		scale: image pixels per canvas pixel
+		pixels: red, green and blue byte of every pixel, row by row from the top
+	"""
+
+	'''
+	Initializes the RasterSink object with a white image.
+
+	@param width (int), image width in pixels
+	@param height (int), image height in pixels
+	@param canvasWidth (int), width of the canvas the drawing is made for
+	'''
+	def __init__(self, width, height, canvasWidth = drawer.CANVAS_WIDTH):
+		self.width = width
+		self.height = height
+		self.scale = float(width) / canvasWidth
+		self.pixels = bytearray(b'\xff' * (width * height * 3))
+
+	'''
+	draws one line drawn by the pen
+
+	@param start (tuple), x and y coordinates where the line starts
+	@param end (tuple), x and y coordinates where the line ends
+	@param color (string), pen color
+	@return None
+	'''
+	def lineTo(self, start, end, color):
+		x0, y0 = self.toPixel(start)
+		x1, y1 = self.toPixel(end)
+		rgb = bytearray(exporter.colorToRGB(color))
+		# Bresenham's line algorithm
+		dx, dy = abs(x1 - x0), -abs(y1 - y0)
+		sx = 1 if x0 < x1 else -1
+		sy = 1 if y0 < y1 else -1
+		error = dx + dy
+		while True:
+			if 0 <= x0 < self.width and 0 <= y0 < self.height:
+				offset = (y0 * self.width + x0) * 3
+				self.pixels[offset:offset + 3] = rgb
+			if x0 == x1 and y0 == y1:
+				return
+			double = 2 * error
+			if double >= dy:
+				error += dy
+				x0 += sx
+			if double <= dx:
+				error += dx
+				y0 += sy
+
+	'''
+	draws a circle drawn by the pen as its polygon
+
+	@param center (tuple), x and y coordinates of the center
+	@param radius (float), circle radius
+	@param points (list), corners of the polygon
+	@param color (string), pen color
+	@return None
+	'''
+	def circle(self, center, radius, points, color):
+		for i in range(1, len(points)):
+			self.lineTo(points[i - 1], points[i], color)
+
+	'''
+	@param point (tuple), turtle coordinates, origin in the middle and y pointing up
+	@return (x, y) (tuple), pixel coordinates, origin at the top left
+	'''
+	def toPixel(self, point):
+		return (int(round(point[0] * self.scale + self.width / 2.0)),
+			int(round(self.height / 2.0 - point[1] * self.scale)))
+
+	'''
+	@param level (int), zlib compression level, 9 for the smallest file
+	@return data (bytes), the image as a PNG file
+	'''
+	def pngData(self, level = 9):
+		rowSize = self.width * 3
+		# every row starts with filter type 0 (none)
+		rows = b''.join(b'\x00' + bytes(self.pixels[row * rowSize:(row + 1) * rowSize]) for row in range(self.height))
+		header = struct.pack('>IIBBBBB', self.width, self.height, 8, 2, 0, 0, 0)
+		return (PNG_SIGNATURE + pngChunk(b'IHDR', header) + pngChunk(b'IDAT', zlib.compress(rows, level))
+			+ pngChunk(b'IEND', b''))
+
+	'''
+	writes the image as a PNG file
+
+	@param filename (string), name of the file
+	@return None
+	'''
+	def writePNG(self, filename):
+		with open(filename, 'wb') as file:
+			file.write(self.pngData())
+
+
+class ThumbnailCache:
+	""" ThumbnailCache class for Text-to-Art Interpreter.
+
+	Keeps a PNG thumbnail of every drawing in a directory, named by the content hash of
+	its characters, so drawings with the same characters share one thumbnail.
+	"""
+
+	"""
+	Attributes:
+		directory: directory the thumbnails are kept in
+		width: thumbnail width in pixels
+		height: thumbnail height in pixels
+	"""
+
+	'''
+	Initializes the ThumbnailCache object.
+
+	@param directory (string), directory the thumbnails are kept in, created when needed
+	@param width (int), thumbnail width in pixels
+	@param height (int), thumbnail height in pixels
+	'''
+	def __init__(self, directory = 'thumbnails', width = THUMBNAIL_WIDTH, height = THUMBNAIL_HEIGHT):
+		self.directory = directory
+		self.width = width
+		self.height = height
+
+	'''
+	@param drawingData (list), representative characters of a drawing
+	@return filename (string), where the drawing's thumbnail is kept
+	'''
+	def path(self, drawingData):
+		digest = storage.contentHash(drawingData)
+		return os.path.join(self.directory, digest[:2], digest + '.png')
+
+	'''
+	Gives the thumbnail of a drawing, drawing it first if it is not on disk yet.
+
+	@param drawingData (list), representative characters of a drawing
+	@return filename (string), the thumbnail's PNG file
+	'''
+	def thumbnail(self, drawingData):
+		filename = self.path(drawingData)
+		if not os.path.exists(filename):
+			self.render(drawingData, filename)
+		return filename
+
+	'''
+	Draws a thumbnail the same way the GUI draws the full picture.
+
+	@param drawingData (list), representative characters of a drawing
+	@param filename (string), PNG file to write
+	@return None
+	'''
+	def render(self, drawingData, filename):
+		sink = RasterSink(self.width, self.height)
+		pen = penturtle.PenTurtle(sink)
+		drawer.Drawer(list(drawingData), pen, drawer.CANVAS_WIDTH - drawer.REDUCED_WIDTH,
+			drawer.CANVAS_HEIGHT - drawer.REDUCED_HEIGHT, maxLetters = None).draw()
+		if not os.path.isdir(os.path.dirname(filename)):
+			os.makedirs(os.path.dirname(filename))
+		# written under another name first, so a thumbnail is never seen half written
+		temporary = '%s.%d.tmp' % (filename, os.getpid())
+		sink.writePNG(temporary)
+		os.rename(temporary, filename)
+
+
+class ThumbnailWorker(threading.Thread):
+	""" ThumbnailWorker class for Text-to-Art Interpreter.
+
+	Draws the thumbnails asked for on its own thread, one at a time in the order asked.
+	Like ParseWorker, it never touches Tk: the GUI puts drawing numbers in requests, and
+	takes (number, filename) from done once the thumbnail's PNG file is on disk, with
+	filename None if it could not be drawn. The worker loads and decompresses the
+	characters itself, so the GUI does not wait for them.
+	"""
+
+	"""
+	Attributes:
+		cache: ThumbnailCache the thumbnails are kept in
+		loadDrawing: function loading the characters of a drawing by number
+		requests: queue of numbers of the drawings whose thumbnails to draw
+		done: queue of (number, filename) tuples of the thumbnails drawn
+	"""
+
+	'''
+	Initializes the ThumbnailWorker object; call start() to begin drawing.
+
+	@param cache (ThumbnailCache), where the thumbnails are kept
+	@param loadDrawing (function), loads the characters of a drawing by number on the
+		worker's thread, such as the loadDrawing of a DataStorage or SQLiteStorage
+	'''
+	def __init__(self, cache, loadDrawing):
+		threading.Thread.__init__(self)
+		# do not keep the program running for a thumbnail
+		self.daemon = True
+		self.cache = cache
+		self.loadDrawing = loadDrawing
+		self.requests = queue.Queue()
+		self.done = queue.Queue()
+
+	'''
+	draws the thumbnails asked for, runs on the worker thread
+
+	@return None
+	'''
+	def run(self):
+		while True:
+			number = self.requests.get()
+			try:
+				filename = self.cache.thumbnail(self.loadDrawing(number))
+			except Exception as error:
+				print ("Could not draw the thumbnail of drawing %d: %s" % (number, error))
+				filename = None
+			self.done.put((number, filename))
+
+	'''
+	asks for the thumbnail of a drawing
+
+	@param number (int), number of the drawing, passed back with the thumbnail
+	@return None
+	'''
+	def request(self, number):
+		self.requests.put(number)
+
+
+'''
+Makes one chunk of a PNG file.
+
+@param tag (bytes), 4-letter chunk type
+@param data (bytes), chunk contents
+@return chunk (bytes), length, type, contents and checksum
+'''
+def pngChunk(tag, data):
+	return struct.pack('>I', len(data)) + tag + data + struct.pack('>I', zlib.crc32(tag + data) & 0xffffffff)
@@ -12,33 +12,78 @@ try:
     import tkinter as tk
     import tkinter.font as tkf
     import tkinter.simpledialog as tks
+    import tkinter.ttk as ttk
     from tkinter import StringVar
+    from tkinter import IntVar
     from tkinter import filedialog
 except ImportError:
     import Tkinter as tk 
     import tkFont as tkf
     import tkFileDialog as tks
+    import ttk
     from Tkinter import StringVar
+    from Tkinter import IntVar
     import tkFileDialog as filedialog
-import turtle as t
-import os
-
-
-import turtle as t
+import argparse
+import math
+import multiprocessing
 import os
+import time
+from collections import OrderedDict
 
 # our custom classes
 import Parser as parser 
 import Drawer as drawer
 import DataStorage as storage
+import Incremental as incremental
+import LayerCache as layercache
+import ParseWorker as parseworker
+import PenTurtle as penturtle
+import CanvasRenderer as canvasrenderer
+import Instrumentation as instrumentation
+import Simplify as simplify
+import SpatialIndex as spatialindex
+import Thumbnail as thumbnail
+
+# seconds of drawing between screen updates, short enough to keep the GUI responsive
+DRAW_SLICE_SECONDS = 0.03
+
+# number of Previous Drawings added to the list at a time while starting up
+HISTORY_PAGE_SIZE = 500
+
+# milliseconds between checks on a file being parsed in the background
+PARSE_POLL_MS = 50
+
+# how much one step of the mouse wheel zooms in
+ZOOM_STEP = 1.25
+
+# most drawings compared side by side at once
+MAX_COMPARE = 16
+
+# pieces of a compared drawing put on its canvas per callback, so the GUI stays responsive
+COMPARE_PIECES = 500
+
+# thumbnails of the Previous Drawings, one on each row of the list: where they are kept,
+# how many rows the list shows and how many thumbnails stay loaded
+THUMBNAIL_DIRECTORY = 'thumbnails'
+THUMBNAIL_ROWS = 7
+THUMBNAIL_CACHE_SIZE = 64
 
 class DisplayApp:
 	""" DisplayApp class for Text-to-Art Interpreter to put everything together. """
 	
 	'''
 	initialize the DisplayApp instance
+
+	@param width (int), window width
+	@param height (int), window height
+	@param sampleSize (int), number of representative characters taken from new text files
+	@param maxLetters (int), longest drawing that will be drawn, or None for no limit
+	@param storageBackend (string), where past drawings are kept, see DataStorage.openStorage
+	@param tolerance (float), largest distance in pixels lines are simplified by when zoomed out, or None
 	'''
-	def __init__(self, width, height):
+	def __init__(self, width, height, sampleSize = parser.SAMPLE_THRESHOLD, maxLetters = None, storageBackend = 'index',
+			tolerance = simplify.DEFAULT_TOLERANCE):
 
 		# create a tk object, which is the root window
 		self.root = tk.Tk()
@@ -57,11 +102,49 @@ class DisplayApp:
 		self.drawer = None
 		
 		# data storage object to record past drawings
-		self.storage = storage.DataStorage()
+		self.storage = storage.openStorage(storageBackend)
+		
+		# state of the growing text files which are followed, drawn like createDrawing draws
+		self.incremental = incremental.IncrementalTracker(self.storage, width = width - drawer.REDUCED_WIDTH,
+			height = height - drawer.REDUCED_HEIGHT, sampleSize = sampleSize)
 		
 		# whether a turtle has been created yet
 		self.createdTurtle = False
 
+		# size limits for new samples and for drawings
+		self.sampleSize = sampleSize
+		self.maxLetters = maxLetters
+
+		# scheduled callback drawing the next slice of the current drawing
+		self.drawJob = None
+
+		# zoom and pan of the canvas, once something is drawn, the scheduled callback
+		# bringing the canvas up to date with it, and where the mouse was while panning
+		self.view = None
+		self.tolerance = tolerance
+		self.cullJob = None
+		self.panFrom = None
+
+		# Previous Drawings index of the drawing on the turtle, once it is finished
+		self.finishedDrawing = None
+
+		# background parse of the file being opened, if any
+		self.parseWorker = None
+
+		# worker processes drawing the drawings being compared, started when first needed
+		self.comparePool = None
+
+		# loaded thumbnail images by drawing number, least recently shown first, and the
+		# scheduled callback showing them. Missing thumbnails are drawn by a worker thread
+		# once their rows are in view, so saving and scrolling never wait for one.
+		self.thumbnails = thumbnail.ThumbnailCache(THUMBNAIL_DIRECTORY)
+		self.thumbnailImages = OrderedDict()
+		self.thumbnailJob = None
+		self.thumbnailWorker = thumbnail.ThumbnailWorker(self.thumbnails, self.storage.loadDrawing)
+		self.thumbnailWorker.start()
+		self.thumbnailsRequested = set()
+		self.thumbnailPollJob = None
+
 		# set the title of the window
 		self.root.title("Text-to-Art Interpreter")
 
@@ -94,6 +177,15 @@ class DisplayApp:
 	def buildCanvas(self):
 		self.canvas = tk.Canvas( self.root, width=self.initDx, height=self.initDy )
 		self.canvas.pack( expand=tk.YES, fill=tk.BOTH )
+		# finished drawings stay on the canvas as hidden layers
+		self.layers = layercache.LayerCache(self.canvas)
+		# zoom with the mouse wheel, pan by dragging, and follow the window's size
+		self.canvas.bind('<MouseWheel>', self.handleWheel)
+		self.canvas.bind('<Button-4>', self.handleWheel)
+		self.canvas.bind('<Button-5>', self.handleWheel)
+		self.canvas.bind('<ButtonPress-1>', self.handlePanStart)
+		self.canvas.bind('<B1-Motion>', self.handlePan)
+		self.canvas.bind('<Configure>', self.handleResize)
 	
 	'''
 	build a frame and create user GUI controls such as buttons 
@@ -115,15 +207,18 @@ class DisplayApp:
 		label = tk.Label( rightcntlframe, text="Previous Drawings:", width=20 )
 		label.pack( side=tk.TOP, pady=10 )
 		
-		# create the GUI list of read in text files
-		self.filesBox = tk.Listbox(rightcntlframe, selectmode=tk.SINGLE, exportselection=0, height=7)
-		self.filesBox.pack(side=tk.TOP)
-		self.filesBox.pack(fill=tk.X)
-		# get previous drawings from storage
-		previousDrawings = self.storage.getData()
-		for drawing in previousDrawings:
-			self.filenameList.append(drawing[1])
-			self.filesBox.insert(len(self.filenameList),drawing[0])
+		# create the GUI list of read in text files, each row with the thumbnail of its drawing,
+		# loaded when it scrolls into view; the item of a drawing is its number
+		ttk.Style().configure('Thumbnails.Treeview', rowheight=self.thumbnails.height + 4)
+		self.filesBox = ttk.Treeview(rightcntlframe, selectmode='extended', show='tree', height=THUMBNAIL_ROWS,
+			style='Thumbnails.Treeview', yscrollcommand=self.handleListScroll)
+		self.filesBox.column('#0', width=self.thumbnails.width + 160)
+		self.filesBox.pack(side=tk.TOP, fill=tk.X)
+		# shown on the rows whose thumbnail is not loaded, so the filenames line up
+		self.blankThumbnail = tk.PhotoImage(width=self.thumbnails.width, height=self.thumbnails.height)
+		# list previous drawings from storage once the window is up; their characters are loaded when drawn
+		self.historyLoaded = False
+		self.historyJob = self.root.after(1, self.loadHistoryPage)
 
 
 		# make a ope file button in the frame.
@@ -131,15 +226,170 @@ class DisplayApp:
 							   command=self.handleOpen )
 		button.pack(side=tk.TOP, pady = 3)  # default side is top
 
+		# growing files which are followed are only parsed from where they were last read
+		self.followFile = IntVar()
+		check = tk.Checkbutton( rightcntlframe, text="Follow Growing File", variable=self.followFile )
+		check.pack(side=tk.TOP)
+		button = tk.Button( rightcntlframe, text="Refresh Followed File", 
+							   command=self.refreshFollowed )
+		button.pack(side=tk.TOP, pady = 3)
+
 		# make the draw button
 		button = tk.Button( rightcntlframe, text="Draw Picture of Text File", 
 							   command=self.createDrawing)
 		button.pack(side=tk.TOP)  # default side is top
 		
+		# draw several selected drawings side by side
+		button = tk.Button( rightcntlframe, text="Compare Selected Drawings", 
+							   command=self.compareDrawings)
+		button.pack(side=tk.TOP, pady = 3)
+		
 		# make erase drawing button
 		button = tk.Button( rightcntlframe, text="Erase Picture", 
 							   command=self.clearCanvas )
 		button.pack(side=tk.TOP, pady = 20)  # default side is top
+		
+		# zoom back out to the whole drawing
+		button = tk.Button( rightcntlframe, text="Reset View", 
+							   command=self.resetView )
+		button.pack(side=tk.TOP)
+
+		# progress of a file being opened, with a button to stop it
+		self.parseStatus = StringVar()
+		label = tk.Label( rightcntlframe, textvariable=self.parseStatus, width=20 )
+		label.pack( side=tk.TOP )
+		self.parseProgress = ttk.Progressbar( rightcntlframe, mode='determinate', maximum=100 )
+		self.parseProgress.pack( side=tk.TOP, fill=tk.X, padx=5 )
+		self.cancelButton = tk.Button( rightcntlframe, text="Cancel Opening", 
+							   command=self.cancelParse, state=tk.DISABLED )
+		self.cancelButton.pack(side=tk.TOP, pady = 3)
+	
+	'''
+	adds the next page of previous drawings to the list and schedules the page after it,
+		so the window shows and responds while a long history is listed
+	
+	@return None
+	'''
+	def loadHistoryPage(self):
+		self.historyJob = None
+		filenames = self.storage.listDrawings(len(self.filenameList), HISTORY_PAGE_SIZE)
+		for filename in filenames:
+			self.addToList(filename)
+		if len(filenames) < HISTORY_PAGE_SIZE:
+			self.historyLoaded = True
+		else:
+			self.historyJob = self.root.after(1, self.loadHistoryPage)
+	
+	'''
+	lists the rest of the previous drawings straight away, so new drawings are added
+		after them
+	
+	@return None
+	'''
+	def finishHistory(self):
+		if self.historyJob is not None:
+			self.root.after_cancel(self.historyJob)
+		while not self.historyLoaded:
+			self.loadHistoryPage()
+			if self.historyJob is not None:
+				self.root.after_cancel(self.historyJob)
+	
+	'''
+	adds a drawing to the end of the Previous Drawings list
+	
+	@param filename (string), name of the drawing's text file
+	@return None
+	'''
+	def addToList(self, filename):
+		self.filenameList.append(filename)
+		self.filesBox.insert('', tk.END, iid=str(len(self.filenameList) - 1), text=filename, image=self.blankThumbnail)
+	
+	'''
+	@return numbers (list), numbers of the drawings selected in the Previous Drawings list, in order
+	'''
+	def selectedDrawings(self):
+		return sorted(int(item) for item in self.filesBox.selection())
+	
+	'''
+	selects only one drawing in the Previous Drawings list, scrolling it into view
+	
+	@param number (int), number of the drawing
+	@return None
+	'''
+	def selectDrawing(self, number):
+		self.filesBox.selection_set(str(number))
+		self.filesBox.see(str(number))
+	
+	'''
+	called when the list scrolls or changes; shows the thumbnails of the rows in view once
+		the list has settled
+	
+	@param first (string), fraction of the list above the rows in view
+	@param last (string), fraction of the list up to the end of the rows in view
+	@return None
+	'''
+	def handleListScroll(self, first, last):
+		if self.thumbnailJob is None:
+			self.thumbnailJob = self.root.after_idle(self.showThumbnails)
+	
+	'''
+	shows the thumbnails of the rows in view of the Previous Drawings list. Those which
+		are not loaded yet are asked of the thumbnail worker, which draws the ones not on
+		disk yet, such as those of new drawings.
+	
+	@return None
+	'''
+	def showThumbnails(self):
+		self.thumbnailJob = None
+		top = self.filesBox.identify_row(2)
+		if not top:
+			return
+		# a partly shown row at the bottom counts as in view
+		for number in range(int(top), min(int(top) + THUMBNAIL_ROWS + 1, len(self.filenameList))):
+			image = self.thumbnailImages.get(number)
+			if image is not None:
+				# mark as most recently shown
+				self.thumbnailImages[number] = self.thumbnailImages.pop(number)
+			elif number not in self.thumbnailsRequested:
+				self.thumbnailsRequested.add(number)
+				self.thumbnailWorker.request(number)
+		if self.thumbnailsRequested and self.thumbnailPollJob is None:
+			self.thumbnailPollJob = self.root.after(PARSE_POLL_MS, self.pollThumbnails)
+	
+	'''
+	puts the thumbnails the worker has drawn on their rows, and checks again later until
+		all asked for are
+	
+	@return None
+	'''
+	def pollThumbnails(self):
+		self.thumbnailPollJob = None
+		try:
+			while True:
+				number, filename = self.thumbnailWorker.done.get_nowait()
+				self.thumbnailsRequested.discard(number)
+				if filename is None:
+					continue
+				self.thumbnailImages[number] = tk.PhotoImage(file=filename)
+				self.filesBox.item(str(number), image=self.thumbnailImages[number])
+				while len(self.thumbnailImages) > THUMBNAIL_CACHE_SIZE:
+					oldest = self.thumbnailImages.popitem(last=False)[0]
+					self.filesBox.item(str(oldest), image=self.blankThumbnail)
+		except thumbnail.queue.Empty:
+			pass
+		if self.thumbnailsRequested:
+			self.thumbnailPollJob = self.root.after(PARSE_POLL_MS, self.pollThumbnails)
+	
+	'''
+	forgets the loaded thumbnail of a drawing which has changed, and shows the new one
+	
+	@param number (int), number of the drawing
+	@return None
+	'''
+	def refreshThumbnail(self, number):
+		if self.thumbnailImages.pop(number, None) is not None:
+			self.filesBox.item(str(number), image=self.blankThumbnail)
+		self.handleListScroll(None, None)
 	
 	'''
 	bind keyboard shortcuts to functionality in the app
@@ -163,17 +413,33 @@ class DisplayApp:
 		self.root.destroy()
 	
 	'''
-	creates an instance of a turtle and place it in the drawing canvas
+	creates the pen which draws on the canvas. The pen computes the same path as a
+		turtle, and the renderer keeps it and puts the part in view on the canvas as line 
+		items of one color and ovals.
 	
+	@param reducedWidth (int), amount of x-axis canvas space the drawings leave free, as in createDrawing
+	@param reducedHeight (int), amount of y-axis canvas space the drawings leave free
 	@return None
 	'''	
+	def makeTurtle(self, reducedWidth = drawer.REDUCED_WIDTH, reducedHeight = drawer.REDUCED_HEIGHT):
+		# drawings are kept in units of the area they are drawn in, see SpatialIndex.py
+		self.view = canvasrenderer.Viewport(self.canvas, max(self.initDx - reducedWidth, self.initDy - reducedHeight),
+			self.tolerance)
+		self.renderer = canvasrenderer.CanvasRenderer(self.canvas, self.view)
+		self.turt = penturtle.PenTurtle(self.renderer)
+		self.createdTurtle = True
+		
+	
+	''' @OldVersion
 	def makeTurtle(self):
+		# turtle is only needed once something is drawn
+		import turtle as t
 		self.turt = t.RawTurtle(self.canvas)
 		self.turt.hideturtle()
 		screen = self.turt.getscreen()
 		screen.bgcolor("white")
 		self.createdTurtle = True
-		
+	'''
 	
 	''' @OldVersion
 	def makeTurtle(self):
@@ -191,24 +457,185 @@ class DisplayApp:
 	'''
 	def createDrawing(self, reducedWidth = 500, reducedHeight = 200):
 		# get list of chars from selected file and store in object field
-		if len(self.filesBox.curselection()) is 0:
+		if len(self.selectedDrawings()) == 0:
 			print("Please upload or select a file first")
 			return
-		selectedFileNumber = self.filesBox.curselection()[0]
-		characters = self.filenameList[selectedFileNumber]
-		self.characterList = characters
+		selectedFileNumber = self.selectedDrawings()[0]
 		
-		# create turtle if needed, else clear canvas
+		# create turtle if needed, else clear canvas (which stops any drawing in progress)
 		if not self.createdTurtle:
 			self.makeTurtle()
 		else:
 			self.clearCanvas()
+		
+		# recently drawn pictures are only hidden, so just show it again
+		if self.layers.show(selectedFileNumber):
+			self.cullView()
+			return
+		with instrumentation.stage('load'):
+			try:
+				self.characterList = self.storage.loadDrawing(selectedFileNumber)
+			except IOError as error:
+				print ("Could not load %s: %s" % (self.filenameList[selectedFileNumber], error))
+				return
 			
-		# draw picture and update canvas	
-		self.turt.getscreen().tracer(0)
-		self.drawer = drawer.Drawer(self.characterList, self.turt, self.initDx - reducedWidth, self.initDy - reducedHeight)
-		self.drawer.draw()
-		self.turt.getscreen().update()
+		# draw picture in slices, updating the canvas in between
+		self.drawer = drawer.Drawer(self.characterList, self.turt, self.initDx - reducedWidth, self.initDy - reducedHeight, maxLetters = self.maxLetters)
+		self.drawingNumber = selectedFileNumber
+		if self.drawer.start():
+			self.drawNextSlice()
+	
+	'''
+	draws the next slice of the current drawing and schedules the one after it, 
+		so the GUI keeps handling events while a large drawing is made
+	
+	@return None
+	'''
+	def drawNextSlice(self):
+		self.drawJob = None
+		finished = self.drawer.drawSlice(DRAW_SLICE_SECONDS)
+		with instrumentation.stage('update'):
+			# put the lines drawn so far on the canvas and redraw it
+			self.renderer.flush()
+			self.canvas.update_idletasks()
+		if finished:
+			self.finishedDrawing = self.drawingNumber
+		else:
+			self.drawJob = self.root.after(1, self.drawNextSlice)
+	
+	'''
+	shows the selected drawings side by side in a new window. They are drawn at the same
+		time in worker processes, so it takes about as long as the slowest of them; each is
+		shown as soon as it is ready.
+	
+	@return None
+	'''
+	def compareDrawings(self):
+		numbers = self.selectedDrawings()[:MAX_COMPARE]
+		if len(numbers) < 2:
+			print("Please select two or more drawings to compare (Shift or Control click)")
+			return
+		if self.comparePool is None:
+			# forked workers would inherit this process' threads' locks, such as the
+			# thumbnail worker's, held; Python 2 can only fork
+			context = multiprocessing.get_context('spawn') if hasattr(multiprocessing, 'get_context') else multiprocessing
+			self.comparePool = context.Pool(min(MAX_COMPARE, multiprocessing.cpu_count()))
+		start = time.time()
+		
+		# the same drawing area and limits as createDrawing
+		drawWidth, drawHeight = self.initDx - drawer.REDUCED_WIDTH, self.initDy - drawer.REDUCED_HEIGHT
+		results = []
+		for number in numbers:
+			with instrumentation.stage('load'):
+				characters = ''.join(self.storage.loadDrawing(number))
+			results.append(self.comparePool.apply_async(spatialindex.drawPieces,
+				((characters, drawWidth, drawHeight, self.maxLetters),)))
+		
+		window = tk.Toplevel(self.root)
+		window.title("Compare Drawings")
+		columns = int(math.ceil(math.sqrt(len(numbers))))
+		rows = int(math.ceil(len(numbers) / float(columns)))
+		cells = []
+		for index, number in enumerate(numbers):
+			row, column = divmod(index, columns)
+			frame = tk.Frame(window, bd=1, relief=tk.SUNKEN)
+			frame.grid(row=row, column=column, sticky=tk.NSEW)
+			label = tk.Label(frame, text="%s (drawing)" % self.filenameList[number])
+			label.pack(side=tk.TOP)
+			canvas = tk.Canvas(frame, width=self.initDx // columns, height=(self.initDy - 30 * rows) // rows,
+				bg='white', highlightthickness=0)
+			canvas.pack(expand=tk.YES, fill=tk.BOTH)
+			cell = {'number': number, 'label': label, 'canvas': canvas, 'renderer': None}
+			canvas.bind('<Configure>', lambda event, cell=cell: self.handleCompareResize(cell, event))
+			cells.append(cell)
+		for row in range(rows):
+			window.grid_rowconfigure(row, weight=1)
+		for column in range(columns):
+			window.grid_columnconfigure(column, weight=1)
+		self.root.after(PARSE_POLL_MS, self.pollCompare, window, cells, results, start)
+	
+	'''
+	shows the compared drawings whose workers are done, and checks again later until all are.
+		Their pieces are put on the canvases a part at a time (see showComparePieces).
+	
+	@param window (tk.Toplevel), the window comparing the drawings
+	@param cells (list), label, canvas and renderer of each drawing compared
+	@param results (list), AsyncResult of each drawing, None once it is shown
+	@param start (float), time the comparison started
+	@return None
+	'''
+	def pollCompare(self, window, cells, results, start):
+		if not window.winfo_exists():
+			return
+		for index, result in enumerate(results):
+			if result is None or not result.ready():
+				continue
+			results[index] = None
+			cell = cells[index]
+			try:
+				pieces, boxes, seconds = result.get()
+			except Exception as error:
+				cell['label'].config(text="%s could not be drawn" % self.filenameList[cell['number']])
+				print ("Could not draw %s: %s" % (self.filenameList[cell['number']], error))
+				continue
+			# scale the drawing as drawn on the main canvas to the smaller canvas
+			canvas = cell['canvas']
+			canvas.update_idletasks()
+			view = canvasrenderer.Viewport(canvas, max(self.initDx - drawer.REDUCED_WIDTH, self.initDy - drawer.REDUCED_HEIGHT), self.tolerance,
+				(self.canvas.winfo_width(), self.canvas.winfo_height()))
+			cell['renderer'] = canvasrenderer.CanvasRenderer(canvas, view)
+			cell['label'].config(text="%s (%.2f s)" % (self.filenameList[cell['number']], seconds))
+			self.showComparePieces(window, cell, pieces, boxes, 0)
+		if any(result is not None for result in results):
+			self.root.after(PARSE_POLL_MS, self.pollCompare, window, cells, results, start)
+		else:
+			print ("Compared %d drawings in %.2f s" % (len(cells), time.time() - start))
+	
+	'''
+	puts the next COMPARE_PIECES pieces of a compared drawing on its canvas, and schedules
+		the rest, so a large drawing does not hold up the GUI
+	
+	@param window (tk.Toplevel), the window comparing the drawings
+	@param cell (dict), the drawing's label, canvas and renderer
+	@param pieces (list), the pieces of the drawing, see SegmentGrid
+	@param boxes (list), the bounding box of each piece
+	@param first (int), index of the first piece not on the canvas yet
+	@return None
+	'''
+	def showComparePieces(self, window, cell, pieces, boxes, first):
+		if not window.winfo_exists():
+			return
+		renderer = cell['renderer']
+		end = min(first + COMPARE_PIECES, len(pieces))
+		with instrumentation.stage('update'):
+			for index in range(first, end):
+				piece = pieces[index]
+				renderer.addPiece(piece[0], piece[1], piece[2], boxes[index])
+		if end < len(pieces):
+			self.root.after(1, self.showComparePieces, window, cell, pieces, boxes, end)
+	
+	'''
+	scales a compared drawing to its canvas' new size, without drawing it again
+	
+	@param cell (dict), the drawing's label, canvas and renderer
+	@param event (tk.Event), configure event of the canvas
+	@return None
+	'''
+	def handleCompareResize(self, cell, event):
+		renderer = cell['renderer']
+		if renderer is not None:
+			renderer.view.resize(event.width, event.height)
+			renderer.cull()
+	
+	'''
+	stops the drawing in progress, if any
+	
+	@return None
+	'''
+	def cancelDrawing(self):
+		if self.drawJob is not None:
+			self.root.after_cancel(self.drawJob)
+			self.drawJob = None
 		
 		
 	''' @OldVersion
@@ -234,22 +661,165 @@ class DisplayApp:
 		fn = filedialog.askopenfilename(parent=self.root,title="Choose file", initialdir='.')
 		
 		# clear all previously highlighted file suggestions
-		self.filesBox.selection_clear(0, tk.END)
-
-		if fn is not '':
-			# parse new file and get representative list of chars
-			self.parser = parser.Parser(fn)
-			self.characterList = self.parser.get_characters_list()
-			
-			# save file into our GUI list of files and our external storage if a text file
-			base = os.path.basename(fn)
-			if base.endswith('.txt'):
+		self.filesBox.selection_remove(self.filesBox.selection())
+
+		if fn:
+			follow = self.followFile.get()
+			if follow and parser.isCompressedTextFile(fn):
+				# only what was added to a plain text file can be read on its own
+				print("Compressed files cannot be followed, opening %s once" % os.path.basename(fn))
+				follow = False
+			self.startParse(fn, self.incremental if follow else None)
+	
+	'''
+	reads what was added to the followed file of the selected drawing
+	
+	@param event (function), event which triggers this method
+	@return None
+	'''
+	def refreshFollowed(self, event=None):
+		if not self.selectedDrawings():
+			print("Please select a drawing first")
+			return
+		fn = self.incremental.findFile(self.selectedDrawings()[0])
+		if fn is None:
+			print("The selected drawing does not follow a file")
+			return
+		if not os.path.exists(fn):
+			print("%s no longer exists" % fn)
+			return
+		self.startParse(fn, self.incremental)
+	
+	'''
+	parses a file in the background; only one file is opened at a time
+	
+	@param fn (string), name of the file
+	@param tracker (IncrementalTracker), tracker to parse a followed file with, or None
+	@return None
+	'''
+	def startParse(self, fn, tracker = None):
+		if self.parseWorker is not None:
+			self.parseWorker.cancel()
+		self.parseWorker = parseworker.ParseWorker(fn, self.sampleSize, tracker)
+		self.parseWorker.start()
+		self.parseStatus.set("Opening " + os.path.basename(fn))
+		self.parseProgress['value'] = 0
+		self.cancelButton.config(state=tk.NORMAL)
+		self.root.after(PARSE_POLL_MS, self.pollParse, self.parseWorker)
+	
+	'''
+	handles the messages of a background parse, and checks again later until it ends
+	
+	@param worker (ParseWorker), the worker to check
+	@return None
+	'''
+	def pollParse(self, worker):
+		try:
+			while True:
+				kind, value = worker.messages.get_nowait()
+				if worker is not self.parseWorker:
+					# replaced by a newer file, just let it finish
+					continue
+				if kind == 'progress':
+					done, total = value
+					self.parseProgress['value'] = 100.0 * done / total
+				else:
+					self.parseWorker = None
+					self.cancelButton.config(state=tk.DISABLED)
+					self.parseProgress['value'] = 0
+					self.parseStatus.set("")
+					if kind == 'done' and worker.incremental is not None:
+						self.finishRefresh(worker.filename, value[0])
+					elif kind == 'done':
+						self.finishOpen(worker.filename, value[0], value[1])
+					elif kind == 'error':
+						print ("Could not open %s: %s" % (worker.filename, value))
+					return
+		except parseworker.queue.Empty:
+			pass
+		if worker.is_alive() or not worker.messages.empty():
+			self.root.after(PARSE_POLL_MS, self.pollParse, worker)
+	
+	'''
+	adds a parsed file to the Previous Drawings list and to storage
+	
+	@param fn (string), name of the opened file
+	@param fileParser (Parser), the parser which read it
+	@param characterList (list), representative characters of the file
+	@return None
+	'''
+	def finishOpen(self, fn, fileParser, characterList):
+		self.parser = fileParser
+		self.characterList = characterList
+		instrumentation.snapshot('after parse')
+		
+		# save file into our GUI list of files and our external storage if a text file
+		base = os.path.basename(fn)
+		if parser.isTextFile(base):
+			self.finishHistory()
+			with instrumentation.stage('save'):
 				self.storage.saveData(self.characterList, base)
-				self.filenameList.append(self.characterList)
-				self.filesBox.insert(len(self.filenameList),base)
-				self.filesBox.pack(fill=tk.X)
-				self.filesBox.select_set(len(self.filenameList) - 1)
+			# its thumbnail is drawn once it is saved and its row is in view
+			self.addToList(base)
+			self.selectDrawing(len(self.filenameList) - 1)
+	
+	'''
+	stores what was parsed of a followed file. A new file is added to the Previous Drawings
+		list; the new part of a followed file is drawn onto its drawing if that is on the
+		canvas, and otherwise when the drawing is next drawn.
+	
+	@param fn (string), name of the followed file
+	@param fileParser (IncrementalParser), the parser which read its new part
+	@return None
+	'''
+	def finishRefresh(self, fn, fileParser):
+		self.finishHistory()
+		number = self.incremental.findDrawing(fn)
+		if number is not None and self.drawJob is not None and self.drawingNumber == number:
+			# the drawing in progress would miss the new part; it is drawn again when asked for
+			self.clearCanvas()
+		onCanvas = number is not None and self.createdTurtle and number in (self.finishedDrawing, self.layers.visibleKey)
 		
+		turt = self.turt if onCanvas else None
+		if onCanvas and self.layers.visibleKey == number:
+			# the new part joins the drawing kept with its layer
+			layerRenderer = self.layers.data(number)
+			firstPiece = layerRenderer.pieceCount()
+			turt = penturtle.PenTurtle(layerRenderer)
+		
+		with instrumentation.stage('save'):
+			number, characters, change = self.incremental.apply(fn, fileParser, turt)
+		if change == 'new':
+			self.addToList(os.path.basename(fn))
+		else:
+			# the thumbnail shows the old drawing
+			self.refreshThumbnail(number)
+		self.selectDrawing(number)
+		
+		if change == 'resampled':
+			# every second character was dropped, so the drawing is drawn again
+			if onCanvas:
+				self.clearCanvas()
+			if number in self.layers:
+				self.layers.remove(number)
+			if onCanvas:
+				self.createDrawing()
+		elif onCanvas:
+			turt.sink.flush()
+			if self.layers.visibleKey == number:
+				self.layers.update(number, layerRenderer.itemsSince(firstPiece))
+		elif number in self.layers:
+			self.layers.remove(number)
+	
+	'''
+	stops opening the file being parsed
+	
+	@return None
+	'''
+	def cancelParse(self, event=None):
+		if self.parseWorker is not None:
+			self.parseWorker.cancel()
+			self.parseStatus.set("Cancelling")
 			
 	''' @OldVersion
 	def handleOpen(self, event=None):
@@ -274,17 +844,153 @@ class DisplayApp:
 	@return None
 	'''
 	def clearCanvas(self, event=None):
+		self.cancelDrawing()
+		
+		# keep a finished drawing as a layer, with its renderer which keeps the whole
+		# drawing; an unfinished one is deleted
+		if self.finishedDrawing is not None:
+			self.layers.add(self.finishedDrawing, list(self.renderer.items.values()), self.renderer)
+			self.finishedDrawing = None
+		elif self.createdTurtle and self.renderer.items:
+			self.canvas.delete(*self.renderer.items.values())
+		self.layers.hide()
+		
 		if self.createdTurtle:
+			self.renderer = canvasrenderer.CanvasRenderer(self.canvas, self.view)
+			self.turt.sink = self.renderer
 			self.turt.reset()
 
+	'''
+	zooms in or out around the mouse
+	
+	@param event (tk.Event), mouse wheel event; Button-4 and Button-5 are the wheel on X11
+	@return None
+	'''
+	def handleWheel(self, event):
+		if self.view is None:
+			return
+		zoomIn = event.num == 4 or (event.num != 5 and event.delta > 0)
+		self.view.zoomAt(ZOOM_STEP if zoomIn else 1.0 / ZOOM_STEP,
+			self.canvas.canvasx(event.x), self.canvas.canvasy(event.y))
+		self.scheduleCull()
+	
+	def handlePanStart(self, event):
+		self.panFrom = (event.x, event.y)
+	
+	'''
+	moves the drawing with the mouse
+	
+	@param event (tk.Event), mouse motion event while the button is down
+	@return None
+	'''
+	def handlePan(self, event):
+		if self.view is None or self.panFrom is None:
+			return
+		self.view.pan(event.x - self.panFrom[0], event.y - self.panFrom[1])
+		self.panFrom = (event.x, event.y)
+		self.scheduleCull()
+	
+	'''
+	scales the drawings to the canvas' new size, without drawing them again
+	
+	@param event (tk.Event), configure event of the canvas
+	@return None
+	'''
+	def handleResize(self, event):
+		if self.view is not None:
+			self.view.resize(event.width, event.height)
+			self.scheduleCull()
+	
+	'''
+	fits the drawing area to the canvas again
+	
+	@return None
+	'''
+	def resetView(self, event=None):
+		if self.view is not None:
+			self.view.reset()
+			self.scheduleCull()
+	
+	'''
+	brings the canvas up to date with the view once the events waiting are handled, so
+		a fast drag or many wheel steps are only culled once
+	
+	@return None
+	'''
+	def scheduleCull(self):
+		if self.cullJob is None:
+			self.cullJob = self.root.after_idle(self.cullView)
+	
+	'''
+	puts the parts of the drawings shown which came into view on the canvas, and takes
+		those which left it off. Hidden layers are brought up to date when shown again.
+	
+	@return None
+	'''
+	def cullView(self):
+		if self.cullJob is not None:
+			self.root.after_cancel(self.cullJob)
+			self.cullJob = None
+		if not self.createdTurtle:
+			return
+		self.renderer.cull()
+		key = self.layers.visibleKey
+		if key is not None:
+			added, removed = self.layers.data(key).cull()
+			self.layers.update(key, added, removed)
+
+	'''
+	prints the time when the window is first shown and when the previous drawings are
+		listed, then quits. Used by StartupBenchmark.py.
+	
+	@return None
+	'''
+	def reportStartup(self):
+		self.windowShown = None
+		def handleMap(event):
+			if self.windowShown is None:
+				self.windowShown = time.time()
+		self.root.bind('<Map>', handleMap, '+')
+		
+		def poll():
+			if self.windowShown is None or not self.historyLoaded:
+				self.root.after(5, poll)
+				return
+			print ('window %f' % self.windowShown)
+			print ('history %f' % time.time())
+			self.root.destroy()
+		self.root.after(1, poll)
+	
 	'''
 	main program
 	'''	
 	def main(self):
 		print ('Entering main loop')
 		self.root.mainloop()
+		if self.comparePool is not None:
+			self.comparePool.terminate()
 
 if __name__ == "__main__":
-	dapp = DisplayApp(1200, 675)
+	argParser = argparse.ArgumentParser(description = 'Text-to-Art Interpreter')
+	argParser.add_argument('sampleSize', nargs = '?', type = int, default = parser.SAMPLE_THRESHOLD,
+		help = 'number of representative characters taken from new text files')
+	argParser.add_argument('--storage', choices = ['index', 'sqlite'], default = 'index',
+		help = 'where past drawings are kept')
+	argParser.add_argument('--tolerance', type = float, default = simplify.DEFAULT_TOLERANCE, metavar = 'PIXELS',
+		help = 'simplify lines by at most this many pixels when zoomed out, 0 to draw every line')
+	argParser.add_argument('--report-startup', action = 'store_true',
+		help = 'print startup times and quit (see StartupBenchmark.py)')
+	argParser.add_argument('--instrument', metavar = 'FILE', default = None,
+		help = 'time every stage and count turtle calls, written to FILE as JSON on exit')
+	argParser.add_argument('--trace-memory', action = 'store_true',
+		help = 'with --instrument, also record peak memory per stage (slower)')
+	args = argParser.parse_args()
+	if args.instrument:
+		instrumentation.enable(memory = args.trace_memory)
+	dapp = DisplayApp(1200, 675, sampleSize = args.sampleSize, storageBackend = args.storage, tolerance = args.tolerance)
+	if args.report_startup:
+		dapp.reportStartup()
 	dapp.main()
+	if args.instrument:
+		instrumentation.dump(args.instrument)
 
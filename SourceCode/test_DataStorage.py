@@ -0,0 +1,97 @@
+##
+# Tests of the index and data files of DataStorage: blobs shared by drawings with the
+#	same characters, group commits with saveMany, compact writing the data file under
+#	the other name each time, and the migration from the old storage file. Run them with
+#	'python -m pytest' or 'python -m unittest test_DataStorage' in the SourceCode directory.
+#
+# Adam Carlson
+# 10/18/2026
+#
+##
+
+# library dependencies
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+# our custom classes
+import DataStorage as storage
+
+class DataStorageTest(unittest.TestCase):
+	""" DataStorageTest class, the index and data files. """
+
+	def setUp(self):
+		self.directory = tempfile.mkdtemp()
+		self.fileStorageName = os.path.join(self.directory, 'drawings.txt')
+		self.storage = storage.DataStorage(self.fileStorageName)
+
+	def tearDown(self):
+		shutil.rmtree(self.directory)
+
+	def reopen(self):
+		return storage.DataStorage(self.fileStorageName)
+
+	def files(self):
+		return sorted(os.listdir(self.directory))
+
+	def test_same_characters_share_a_blob(self):
+		first = self.storage.saveData(list('abcabc'), 'a.txt')
+		size = os.path.getsize(self.storage.dataFileName)
+		second = self.storage.saveData(list('abcabc'), 'copy of a.txt')
+		self.assertEqual(os.path.getsize(self.storage.dataFileName), size)
+		history = self.reopen()
+		history.loadIndex()
+		self.assertEqual(history.index[second][:2], history.index[first][:2])
+		self.assertEqual(history.getData(), [('a.txt', list('abcabc')), ('copy of a.txt', list('abcabc'))])
+
+	def test_save_many(self):
+		numbers = self.storage.saveMany([('a.txt', list('abc')), ('b.txt', list('xyz')), ('c.txt', list('abc'))])
+		self.assertEqual(numbers, [0, 1, 2])
+		self.assertEqual(self.storage.saveMany([]), [])
+		history = self.reopen()
+		self.assertEqual(history.listDrawings(), ['a.txt', 'b.txt', 'c.txt'])
+		self.assertEqual(history.loadDrawing(1), list('xyz'))
+		self.assertEqual(len(history.blobs), 2)
+
+	def test_filenames_are_kept_on_one_line(self):
+		self.storage.saveData(list('abc'), 'tab\tand\nnewline.txt')
+		self.assertEqual(self.reopen().listDrawings(), ['tab and newline.txt'])
+
+	def test_compact_alternates_data_files(self):
+		self.storage.saveData(list('abc'), 'a.txt')
+		self.storage.replaceDrawing(0, list('abcdef'))
+		self.assertEqual(self.files(), ['drawings.dat', 'drawings.idx'])
+		before, after = self.storage.compact()
+		self.assertLess(after, before)
+		self.assertEqual(self.files(), ['drawings-compacted.dat', 'drawings.idx'])
+		self.storage.compact()
+		self.assertEqual(self.files(), ['drawings.dat', 'drawings.idx'])
+		self.assertEqual(self.reopen().getData(), [('a.txt', list('abcdef'))])
+
+	def test_migrates_the_old_storage_file(self):
+		with io.open(self.fileStorageName, 'w', encoding = 'utf-8') as file:
+			file.write(u'a.txt\na b c\nb.txt\nx y\n')
+		self.assertEqual(self.storage.getData(), [('a.txt', list('abc')), ('b.txt', list('xy'))])
+		self.assertTrue(os.path.exists(self.fileStorageName))
+
+	def test_data_file_without_index_is_not_replaced(self):
+		self.storage.saveData(list('abc'), 'a.txt')
+		os.remove(self.storage.indexFileName)
+		size = os.path.getsize(self.storage.dataFileName)
+		self.assertRaises(IOError, self.reopen().listDrawings)
+		self.assertEqual(os.path.getsize(self.storage.dataFileName), size)
+
+	def test_cut_off_blob_is_an_error(self):
+		self.storage.saveData(list('abc' * 100), 'a.txt')
+		self.storage.saveData(list('xyz' * 100), 'b.txt')
+		# as if the index reached the disk before the end of the data file
+		with open(self.storage.dataFileName, 'r+b') as file:
+			file.truncate(os.path.getsize(self.storage.dataFileName) - 5)
+		history = self.reopen()
+		self.assertEqual(history.loadDrawing(0), list('abc' * 100))
+		self.assertRaises(IOError, history.loadDrawing, 1)
+
+if __name__ == '__main__':
+	unittest.main()
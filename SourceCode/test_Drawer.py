@@ -0,0 +1,53 @@
+##
+# Regression tests of the Drawer: its test cases are drawn on a RecordingTurtle and
+#	compared with their golden recordings in the golden directory. Run them with
+#	'python -m pytest' or 'python -m unittest test_Drawer' in the SourceCode directory;
+#	'python Drawer.py --record' writes the golden recordings again.
+#
+# Adam Carlson
+# 10/18/2026
+#
+##
+
+# library dependencies
+import unittest
+
+# our custom classes
+import Drawer as drawer
+import RecordingTurtle as recordingturtle
+
+""" CONSTANTS """
+
+# a drawing long enough to be compiled and drawn in several slices
+SLICED_LETTERS = list('the quick brown fox jumps over the lazy dog ' * 200)
+
+'''
+@param lettersList (list), the test case's input
+@return drawer (Drawer), a test Drawer on a new RecordingTurtle
+'''
+def newDrawer(lettersList):
+	return drawer.testDrawer(lettersList, recordingturtle.RecordingTurtle())
+
+class DrawerTest(unittest.TestCase):
+	""" DrawerTest class, the Drawer test cases TC12 to TC21. """
+
+	def test_golden_recordings(self):
+		for name, description, lettersList in drawer.testCases(newDrawer):
+			with self.subTest(name):
+				d = newDrawer(lettersList)
+				d.draw()
+				self.assertIsNone(d.turt.compare(drawer.goldenFile(name)), description)
+
+	def test_slices_draw_the_same(self):
+		whole = newDrawer(SLICED_LETTERS)
+		whole.draw()
+		sliced = newDrawer(SLICED_LETTERS)
+		self.assertTrue(sliced.start())
+		slices = 1
+		while not sliced.drawSlice(0):
+			slices += 1
+		self.assertGreater(slices, 1)
+		self.assertEqual(sliced.turt.digest(), whole.turt.digest())
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,67 @@
+##
+# Tests of the Parser classes which read files in parts: StreamingParser and
+#	IncrementalParser. Run them with 'python -m pytest' or 'python -m unittest
+#	test_Parser' in the SourceCode directory.
+#
+# Lawrence Dickey
+# 10/18/2026
+#
+##
+
+# library dependencies
+import codecs
+import os
+import shutil
+import tempfile
+import unittest
+
+# our custom classes
+import Parser as parser
+
+class StreamingParserTest(unittest.TestCase):
+	""" StreamingParserTest class, decoding of files in a given encoding. """
+
+	def setUp(self):
+		self.directory = tempfile.mkdtemp()
+
+	def tearDown(self):
+		shutil.rmtree(self.directory)
+
+	def writeFile(self, name, data):
+		filename = os.path.join(self.directory, name)
+		with open(filename, 'wb') as file:
+			file.write(data)
+		return filename
+
+	def test_utf16_without_bom_is_big_endian(self):
+		filename = self.writeFile('be.txt', u'hi there'.encode('utf-16-be'))
+		self.assertEqual(parser.StreamingParser(filename, encoding = 'utf-16').get_characters_list(), list('hithere'))
+
+	def test_utf16_with_bom(self):
+		filename = self.writeFile('le.txt', codecs.BOM_UTF16_LE + u'hi there'.encode('utf-16-le'))
+		self.assertEqual(parser.StreamingParser(filename, encoding = 'utf-16').get_characters_list(), list('hithere'))
+
+	def test_utf32_without_bom_does_not_fail(self):
+		filename = self.writeFile('plain.txt', b'hello world')
+		self.assertEqual(parser.StreamingParser(filename, encoding = 'utf-32').get_characters_list(), list('helloworld'))
+
+class IncrementalParserTest(unittest.TestCase):
+	""" IncrementalParserTest class, the sample of a file parsed in parts. """
+
+	def setUp(self):
+		self.directory = tempfile.mkdtemp()
+		self.filename = os.path.join(self.directory, 'followed.txt')
+
+	def tearDown(self):
+		shutil.rmtree(self.directory)
+
+	def test_first_parse_samples_like_parser(self):
+		# between one and two sample sizes, where the stride is still 1
+		with open(self.filename, 'w') as file:
+			file.write('abcdefghij' * 1500)
+		first = parser.IncrementalParser(self.filename, sampleSize = 10000)
+		self.assertEqual(first.get_characters_list(), parser.MappedParser(self.filename, sampleSize = 10000).get_characters_list())
+		self.assertEqual(len(first.get_characters_list()), 9999)
+
+if __name__ == '__main__':
+	unittest.main()
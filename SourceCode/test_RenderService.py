@@ -0,0 +1,57 @@
+##
+# Tests of how RenderService answers uploads in a given charset. A service is started
+#	for the tests with LoadTest.startService and sent requests with LoadTest.sendRequest.
+#	Run them with 'python -m pytest' or 'python -m unittest test_RenderService' in the
+#	SourceCode directory. Needs Python 3.
+#
+# Adam Carlson
+# 10/18/2026
+#
+##
+
+# library dependencies
+import asyncio
+import socket
+import unittest
+
+# our custom classes
+import LoadTest as loadtest
+
+""" CONSTANTS """
+
+# text uploaded by the tests
+TEXT = u'The quick brown fox jumps over the lazy dog. ' * 20
+
+class CharsetTest(unittest.TestCase):
+	""" CharsetTest class, the charset of the upload's Content-Type. """
+
+	@classmethod
+	def setUpClass(cls):
+		# a port nothing else listens on
+		with socket.socket() as probe:
+			probe.bind(('127.0.0.1', 0))
+			cls.port = probe.getsockname()[1]
+		cls.process = loadtest.startService(cls.port, workers = 1)
+
+	@classmethod
+	def tearDownClass(cls):
+		cls.process.terminate()
+		cls.process.wait()
+
+	def render(self, content, charset):
+		return asyncio.run(loadtest.sendRequest('127.0.0.1', self.port, '/render?format=svg', content, charset = charset))[0]
+
+	def test_unknown_charset_is_a_bad_request(self):
+		self.assertEqual(self.render(TEXT.encode('utf-8'), 'bogus'), 400)
+
+	def test_non_text_codec_is_a_bad_request(self):
+		self.assertEqual(self.render(TEXT.encode('utf-8'), 'base64'), 400)
+
+	def test_utf16_without_bom(self):
+		self.assertEqual(self.render(TEXT.encode('utf-16-be'), 'utf-16'), 200)
+
+	def test_utf8(self):
+		self.assertEqual(self.render(TEXT.encode('utf-8'), 'utf-8'), 200)
+
+if __name__ == '__main__':
+	unittest.main()